@@ -0,0 +1,181 @@
+import os
+import shutil
+import socket
+import subprocess
+import time
+
+from eth_account import Account
+from web3 import Web3
+
+from tea_assam.multicall import MULTICALL3_ADDRESS
+from tea_assam.providers import DEFAULT_CHAIN_ID
+from tea_assam.quote import DEFAULT_FACTORY_ADDRESS
+
+ROUTER_ADDRESS = "0xACBc89FF219232C058428D166860df4eA0114999"
+FACTORY_ADDRESS = DEFAULT_FACTORY_ADDRESS
+BATCH_TRANSFER_ADDRESS = "0xAB60Db6Bc74B6A5869A874F32d57Dc1CB6234766"
+
+SOLC_VERSION = "0.8.24"
+CONTRACTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "contracts", "Mocks.sol")
+
+
+def compile_mocks(solc_version: str = SOLC_VERSION) -> dict:
+    """Mengompilasi kontrak tiruan dan mengembalikan `{nama: {"abi", "bin", "bin_runtime"}}`."""
+    import solcx
+
+    if solc_version not in [str(version) for version in solcx.get_installed_solc_versions()]:
+        solcx.install_solc(solc_version)
+    compiled = solcx.compile_files(
+        [CONTRACTS_PATH],
+        output_values=["abi", "bin", "bin-runtime"],
+        solc_version=solc_version,
+        evm_version="paris",
+        optimize=True,
+    )
+    return {
+        key.split(":")[-1]: {"abi": value["abi"], "bin": value["bin"], "bin_runtime": value["bin-runtime"]}
+        for key, value in compiled.items()
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalChain:
+    """Node anvil lokal dengan kontrak tiruan di alamat yang dipakai entry point.
+
+    Factory, router, kontrak batch transfer dan Multicall3 dipasang dengan
+    `anvil_setCode` tepat di alamat hard-coded Tea Assam, sehingga kelas-kelas
+    repo bisa dijalankan tanpa perubahan. Chain id disamakan (93384).
+    """
+
+    def __init__(self, rpc_url: str = None, chain_id: int = DEFAULT_CHAIN_ID):
+        """
+        Inisialisasi kelas LocalChain.
+
+        Args:
+            rpc_url (str): URL node anvil yang sudah berjalan; None untuk menjalankan
+                anvil baru di port acak.
+            chain_id (int): Chain id node.
+        """
+        self.chain_id = chain_id
+        self.rpc_url = rpc_url
+        self.process = None
+        self.web3 = None
+        self.contracts = {}
+        self.token = None
+        self.weth = None
+
+    def start(self):
+        if self.rpc_url is None:
+            if shutil.which("anvil") is None:
+                raise RuntimeError("anvil tidak ditemukan; pasang Foundry atau berikan --rpc-url")
+            port = _free_port()
+            self.rpc_url = "http://127.0.0.1:{}".format(port)
+            self.process = subprocess.Popen(
+                ["anvil", "--port", str(port), "--chain-id", str(self.chain_id), "--silent"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+        self.web3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        deadline = time.time() + 30
+        while True:
+            try:
+                if self.web3.eth.chain_id == self.chain_id:
+                    break
+                raise RuntimeError("Chain id node bukan {}".format(self.chain_id))
+            except RuntimeError:
+                raise
+            except Exception:
+                if time.time() > deadline:
+                    raise RuntimeError("Node di {} tidak merespons".format(self.rpc_url))
+                time.sleep(0.2)
+        return self
+
+    def stop(self):
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait(timeout=10)
+            self.process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def deployer(self) -> str:
+        return self.web3.eth.accounts[0]
+
+    def _transact(self, contract_function, **params):
+        tx_hash = contract_function.transact({"from": self.deployer, **params})
+        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        if receipt["status"] != 1:
+            raise RuntimeError("Transaksi setup gagal: {}".format(self.web3.to_hex(tx_hash)))
+        return receipt
+
+    def _deploy(self, name: str, *args):
+        artifact = self.compiled[name]
+        contract = self.web3.eth.contract(abi=artifact["abi"], bytecode=artifact["bin"])
+        receipt = self._transact(contract.constructor(*args))
+        return self.web3.eth.contract(address=receipt["contractAddress"], abi=artifact["abi"])
+
+    def _set_code(self, name: str, address: str):
+        artifact = self.compiled[name]
+        self.web3.provider.make_request("anvil_setCode", [address, "0x" + artifact["bin_runtime"]])
+        return self.web3.eth.contract(address=address, abi=artifact["abi"])
+
+    def deploy(self, liquidity: int = 1000):
+        """
+        Memasang semua kontrak tiruan dan menambahkan likuiditas awal token/WTEA.
+
+        Args:
+            liquidity (int): Jumlah token (dan WTEA) dalam satuan ether di pair awal.
+        """
+        self.compiled = compile_mocks()
+        self.token = self._deploy("MockERC20", "Bench Token", "BATH", 18, Web3.to_wei(10**9, "ether"))
+        self.weth = self._deploy("MockWETH")
+        self.contracts = {
+            "factory": self._set_code("MockFactory", FACTORY_ADDRESS),
+            "router": self._set_code("MockRouter", ROUTER_ADDRESS),
+            "batch_transfer": self._set_code("MockBatchTransfer", BATCH_TRANSFER_ADDRESS),
+            "multicall": self._set_code("MockMulticall3", MULTICALL3_ADDRESS),
+        }
+        router = self.contracts["router"]
+        self._transact(router.functions.initialize(FACTORY_ADDRESS, self.weth.address))
+
+        amount = Web3.to_wei(liquidity, "ether")
+        self._transact(self.weth.functions.deposit(), value=amount)
+        self._transact(self.token.functions.approve(ROUTER_ADDRESS, amount))
+        self._transact(self.weth.functions.approve(ROUTER_ADDRESS, amount))
+        self._transact(router.functions.addLiquidity(
+            self.token.address, self.weth.address, amount, amount, 0, 0, self.deployer,
+            self.web3.eth.get_block("latest")["timestamp"] + 600
+        ))
+        return self
+
+    def new_account(self, tea: int = 1000, tokens: int = 0, wtea: int = 0):
+        """
+        Membuat akun baru yang diisi TEA (lewat `anvil_setBalance`), token dan WTEA.
+
+        Returns:
+            LocalAccount: Akun dengan atribut `address` dan `key`.
+        """
+        account = Account.create()
+        self.web3.provider.make_request("anvil_setBalance", [account.address, hex(Web3.to_wei(tea, "ether"))])
+        if tokens:
+            self._transact(self.token.functions.transfer(account.address, Web3.to_wei(tokens, "ether")))
+        if wtea:
+            self._transact(self.weth.functions.deposit(), value=Web3.to_wei(wtea, "ether"))
+            self._transact(self.weth.functions.transfer(account.address, Web3.to_wei(wtea, "ether")))
+        return account
+
+    def tx_count(self, from_block: int, to_block: int) -> int:
+        """Jumlah transaksi di blok `from_block`..`to_block`."""
+        return sum(
+            len(self.web3.eth.get_block(number)["transactions"])
+            for number in range(from_block, to_block + 1)
+        )
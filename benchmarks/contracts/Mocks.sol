@@ -0,0 +1,322 @@
+// SPDX-License-Identifier: MIT
+// Kontrak tiruan untuk benchmark lokal. Perilakunya mengikuti Uniswap V2 dan
+// ERC-20 secukupnya untuk entry point repo ini; bukan untuk dipakai di jaringan nyata.
+// Kontrak yang dipasang di alamat tetap (anvil_setCode) tidak memakai constructor,
+// sehingga state awalnya diisi lewat `initialize`.
+pragma solidity ^0.8.20;
+
+interface IERC20 {
+    function balanceOf(address owner) external view returns (uint256);
+    function transfer(address to, uint256 value) external returns (bool);
+    function transferFrom(address from, address to, uint256 value) external returns (bool);
+}
+
+contract MockERC20 {
+    string public name;
+    string public symbol;
+    uint8 public decimals;
+    uint256 public totalSupply;
+    mapping(address => uint256) public balanceOf;
+    mapping(address => mapping(address => uint256)) public allowance;
+
+    event Transfer(address indexed from, address indexed to, uint256 value);
+    event Approval(address indexed owner, address indexed spender, uint256 value);
+
+    constructor(string memory name_, string memory symbol_, uint8 decimals_, uint256 supply) {
+        name = name_;
+        symbol = symbol_;
+        decimals = decimals_;
+        _mint(msg.sender, supply);
+    }
+
+    function _mint(address to, uint256 value) internal {
+        totalSupply += value;
+        balanceOf[to] += value;
+        emit Transfer(address(0), to, value);
+    }
+
+    function approve(address spender, uint256 value) external returns (bool) {
+        allowance[msg.sender][spender] = value;
+        emit Approval(msg.sender, spender, value);
+        return true;
+    }
+
+    function transfer(address to, uint256 value) external returns (bool) {
+        _transfer(msg.sender, to, value);
+        return true;
+    }
+
+    function transferFrom(address from, address to, uint256 value) external returns (bool) {
+        uint256 allowed = allowance[from][msg.sender];
+        if (allowed != type(uint256).max) {
+            require(allowed >= value, "allowance");
+            allowance[from][msg.sender] = allowed - value;
+        }
+        _transfer(from, to, value);
+        return true;
+    }
+
+    function _transfer(address from, address to, uint256 value) internal {
+        require(balanceOf[from] >= value, "balance");
+        balanceOf[from] -= value;
+        balanceOf[to] += value;
+        emit Transfer(from, to, value);
+    }
+}
+
+contract MockWETH is MockERC20 {
+    constructor() MockERC20("Wrapped TEA", "WTEA", 18, 0) {}
+
+    receive() external payable {
+        deposit();
+    }
+
+    function deposit() public payable {
+        _mint(msg.sender, msg.value);
+    }
+
+    function withdraw(uint256 value) external {
+        require(balanceOf[msg.sender] >= value, "balance");
+        balanceOf[msg.sender] -= value;
+        totalSupply -= value;
+        emit Transfer(msg.sender, address(0), value);
+        payable(msg.sender).transfer(value);
+    }
+}
+
+contract MockPair {
+    uint8 public constant decimals = 18;
+    address public factory;
+    address public token0;
+    address public token1;
+    uint112 private reserve0;
+    uint112 private reserve1;
+    uint32 private blockTimestampLast;
+    uint256 public totalSupply;
+    mapping(address => uint256) public balanceOf;
+
+    event Sync(uint112 reserve0, uint112 reserve1);
+
+    constructor() {
+        factory = msg.sender;
+    }
+
+    function initialize(address token0_, address token1_) external {
+        require(msg.sender == factory, "factory");
+        token0 = token0_;
+        token1 = token1_;
+    }
+
+    function getReserves() external view returns (uint112, uint112, uint32) {
+        return (reserve0, reserve1, blockTimestampLast);
+    }
+
+    function _update(uint256 balance0, uint256 balance1) private {
+        reserve0 = uint112(balance0);
+        reserve1 = uint112(balance1);
+        blockTimestampLast = uint32(block.timestamp);
+        emit Sync(reserve0, reserve1);
+    }
+
+    function _sqrt(uint256 y) private pure returns (uint256 z) {
+        if (y > 3) {
+            z = y;
+            uint256 x = y / 2 + 1;
+            while (x < z) {
+                z = x;
+                x = (y / x + x) / 2;
+            }
+        } else if (y != 0) {
+            z = 1;
+        }
+    }
+
+    function mint(address to) external returns (uint256 liquidity) {
+        uint256 balance0 = IERC20(token0).balanceOf(address(this));
+        uint256 balance1 = IERC20(token1).balanceOf(address(this));
+        uint256 amount0 = balance0 - reserve0;
+        uint256 amount1 = balance1 - reserve1;
+        if (totalSupply == 0) {
+            liquidity = _sqrt(amount0 * amount1);
+        } else {
+            uint256 liquidity0 = amount0 * totalSupply / reserve0;
+            uint256 liquidity1 = amount1 * totalSupply / reserve1;
+            liquidity = liquidity0 < liquidity1 ? liquidity0 : liquidity1;
+        }
+        require(liquidity > 0, "liquidity");
+        totalSupply += liquidity;
+        balanceOf[to] += liquidity;
+        _update(balance0, balance1);
+    }
+
+    function swap(uint256 amount0Out, uint256 amount1Out, address to) external {
+        require(amount0Out > 0 || amount1Out > 0, "output");
+        if (amount0Out > 0) IERC20(token0).transfer(to, amount0Out);
+        if (amount1Out > 0) IERC20(token1).transfer(to, amount1Out);
+        uint256 balance0 = IERC20(token0).balanceOf(address(this));
+        uint256 balance1 = IERC20(token1).balanceOf(address(this));
+        uint256 amount0In = balance0 > reserve0 - amount0Out ? balance0 - (reserve0 - amount0Out) : 0;
+        uint256 amount1In = balance1 > reserve1 - amount1Out ? balance1 - (reserve1 - amount1Out) : 0;
+        require(amount0In > 0 || amount1In > 0, "input");
+        uint256 adjusted0 = balance0 * 1000 - amount0In * 3;
+        uint256 adjusted1 = balance1 * 1000 - amount1In * 3;
+        require(adjusted0 * adjusted1 >= uint256(reserve0) * reserve1 * 1000**2, "K");
+        _update(balance0, balance1);
+    }
+}
+
+contract MockFactory {
+    mapping(address => mapping(address => address)) public getPair;
+    address[] public allPairs;
+
+    event PairCreated(address indexed token0, address indexed token1, address pair, uint256);
+
+    function allPairsLength() external view returns (uint256) {
+        return allPairs.length;
+    }
+
+    function createPair(address tokenA, address tokenB) external returns (address pair) {
+        require(tokenA != tokenB, "identical");
+        (address token0, address token1) = tokenA < tokenB ? (tokenA, tokenB) : (tokenB, tokenA);
+        require(getPair[token0][token1] == address(0), "exists");
+        MockPair created = new MockPair();
+        created.initialize(token0, token1);
+        pair = address(created);
+        getPair[token0][token1] = pair;
+        getPair[token1][token0] = pair;
+        allPairs.push(pair);
+        emit PairCreated(token0, token1, pair, allPairs.length);
+    }
+}
+
+contract MockRouter {
+    address public factory;
+    address public WETH;
+
+    receive() external payable {}
+
+    function initialize(address factory_, address weth_) external {
+        require(factory == address(0), "initialized");
+        factory = factory_;
+        WETH = weth_;
+    }
+
+    function _pairFor(address tokenA, address tokenB) internal view returns (address pair) {
+        pair = MockFactory(factory).getPair(tokenA, tokenB);
+        require(pair != address(0), "pair");
+    }
+
+    function _reserves(address tokenA, address tokenB) internal view returns (uint256 reserveA, uint256 reserveB) {
+        MockPair pair = MockPair(_pairFor(tokenA, tokenB));
+        (uint112 reserve0, uint112 reserve1,) = pair.getReserves();
+        (reserveA, reserveB) = tokenA == pair.token0() ? (reserve0, reserve1) : (reserve1, reserve0);
+    }
+
+    function getAmountOut(uint256 amountIn, uint256 reserveIn, uint256 reserveOut) public pure returns (uint256) {
+        require(amountIn > 0 && reserveIn > 0 && reserveOut > 0, "amount");
+        uint256 amountInWithFee = amountIn * 997;
+        return amountInWithFee * reserveOut / (reserveIn * 1000 + amountInWithFee);
+    }
+
+    function getAmountsOut(uint256 amountIn, address[] memory path) public view returns (uint256[] memory amounts) {
+        require(path.length >= 2, "path");
+        amounts = new uint256[](path.length);
+        amounts[0] = amountIn;
+        for (uint256 i; i < path.length - 1; i++) {
+            (uint256 reserveIn, uint256 reserveOut) = _reserves(path[i], path[i + 1]);
+            amounts[i + 1] = getAmountOut(amounts[i], reserveIn, reserveOut);
+        }
+    }
+
+    function addLiquidity(
+        address tokenA, address tokenB, uint256 amountADesired, uint256 amountBDesired,
+        uint256 amountAMin, uint256 amountBMin, address to, uint256 deadline
+    ) external returns (uint256 amountA, uint256 amountB, uint256 liquidity) {
+        require(deadline >= block.timestamp, "expired");
+        if (MockFactory(factory).getPair(tokenA, tokenB) == address(0)) {
+            MockFactory(factory).createPair(tokenA, tokenB);
+        }
+        (uint256 reserveA, uint256 reserveB) = _reserves(tokenA, tokenB);
+        if (reserveA == 0 && reserveB == 0) {
+            (amountA, amountB) = (amountADesired, amountBDesired);
+        } else {
+            uint256 amountBOptimal = amountADesired * reserveB / reserveA;
+            if (amountBOptimal <= amountBDesired) {
+                require(amountBOptimal >= amountBMin, "amountB");
+                (amountA, amountB) = (amountADesired, amountBOptimal);
+            } else {
+                uint256 amountAOptimal = amountBDesired * reserveA / reserveB;
+                require(amountAOptimal >= amountAMin, "amountA");
+                (amountA, amountB) = (amountAOptimal, amountBDesired);
+            }
+        }
+        address pair = _pairFor(tokenA, tokenB);
+        IERC20(tokenA).transferFrom(msg.sender, pair, amountA);
+        IERC20(tokenB).transferFrom(msg.sender, pair, amountB);
+        liquidity = MockPair(pair).mint(to);
+    }
+
+    function _swap(uint256[] memory amounts, address[] memory path, address to) internal {
+        for (uint256 i; i < path.length - 1; i++) {
+            MockPair pair = MockPair(_pairFor(path[i], path[i + 1]));
+            address recipient = i < path.length - 2 ? _pairFor(path[i + 1], path[i + 2]) : to;
+            (uint256 amount0Out, uint256 amount1Out) = path[i] == pair.token0()
+                ? (uint256(0), amounts[i + 1])
+                : (amounts[i + 1], uint256(0));
+            pair.swap(amount0Out, amount1Out, recipient);
+        }
+    }
+
+    function swapExactTokensForTokens(
+        uint256 amountIn, uint256 amountOutMin, address[] calldata path, address to, uint256 deadline
+    ) external returns (uint256[] memory amounts) {
+        require(deadline >= block.timestamp, "expired");
+        amounts = getAmountsOut(amountIn, path);
+        require(amounts[amounts.length - 1] >= amountOutMin, "slippage");
+        IERC20(path[0]).transferFrom(msg.sender, _pairFor(path[0], path[1]), amounts[0]);
+        _swap(amounts, path, to);
+    }
+
+    function swapExactTokensForETH(
+        uint256 amountIn, uint256 amountOutMin, address[] calldata path, address to, uint256 deadline
+    ) external returns (uint256[] memory amounts) {
+        require(deadline >= block.timestamp, "expired");
+        require(path[path.length - 1] == WETH, "path");
+        amounts = getAmountsOut(amountIn, path);
+        require(amounts[amounts.length - 1] >= amountOutMin, "slippage");
+        IERC20(path[0]).transferFrom(msg.sender, _pairFor(path[0], path[1]), amounts[0]);
+        _swap(amounts, path, address(this));
+        MockWETH(payable(WETH)).withdraw(amounts[amounts.length - 1]);
+        payable(to).transfer(amounts[amounts.length - 1]);
+    }
+}
+
+contract MockBatchTransfer {
+    function batchTransfer(address token, address[] calldata recipients, uint256 amount) external {
+        for (uint256 i; i < recipients.length; i++) {
+            require(IERC20(token).transferFrom(msg.sender, recipients[i], amount), "transfer");
+        }
+    }
+}
+
+contract MockMulticall3 {
+    struct Call3 {
+        address target;
+        bool allowFailure;
+        bytes callData;
+    }
+
+    struct Result {
+        bool success;
+        bytes returnData;
+    }
+
+    function aggregate3(Call3[] calldata calls) external payable returns (Result[] memory returnData) {
+        returnData = new Result[](calls.length);
+        for (uint256 i; i < calls.length; i++) {
+            (bool success, bytes memory data) = calls[i].target.call(calls[i].callData);
+            require(success || calls[i].allowFailure, "call");
+            returnData[i] = Result(success, data);
+        }
+    }
+}
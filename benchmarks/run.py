@@ -0,0 +1,316 @@
+"""Benchmark entry point repo terhadap node anvil lokal.
+
+Contoh:
+    python -m benchmarks.run --sizes 1 10 100
+    python -m benchmarks.run --scenarios transfer batch_transfer --save-baseline
+    python -m benchmarks.run --compare --tolerance 0.25
+
+Memerlukan `anvil` (Foundry) dan `py-solc-x`.
+"""
+import argparse
+import collections
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from benchmarks.chain import LocalChain
+from tea_assam.jobs import has_failed
+from tea_assam.providers import ProviderRegistry, RegistryHTTPProvider
+from tea_assam.receipts import ReceiptTracker
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_SIZES = [1, 10, 100]
+
+
+class RpcCounter:
+    """Menghitung request HTTP dan panggilan JSON-RPC yang dikirim lewat RegistryHTTPProvider."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.http_requests = 0
+        self.methods = collections.Counter()
+
+    @property
+    def rpc_calls(self) -> int:
+        return sum(self.methods.values())
+
+    def _record(self, methods):
+        with self._lock:
+            self.http_requests += 1
+            self.methods.update(methods)
+
+    @contextmanager
+    def install(self):
+        make_request = RegistryHTTPProvider.make_request
+        make_batch_request = RegistryHTTPProvider.make_batch_request
+        counter = self
+
+        def counted_make_request(provider, method, params):
+            counter._record([method])
+            return make_request(provider, method, params)
+
+        def counted_make_batch_request(provider, batch_requests):
+            counter._record([method for method, _ in batch_requests])
+            return make_batch_request(provider, batch_requests)
+
+        RegistryHTTPProvider.make_request = counted_make_request
+        RegistryHTTPProvider.make_batch_request = counted_make_batch_request
+        try:
+            yield self
+        finally:
+            RegistryHTTPProvider.make_request = make_request
+            RegistryHTTPProvider.make_batch_request = make_batch_request
+
+
+def _key(account) -> str:
+    return "0x" + bytes(account.key).hex()
+
+
+def _recipients(size: int) -> list:
+    from eth_account import Account
+    return [Account.create().address for _ in range(size)]
+
+
+# --- skenario ---
+# Setiap skenario menerima (chain, size), menyiapkan akun di luar pengukuran, lalu
+# mengembalikan fungsi tanpa argumen yang dijalankan dan diukur. Skenario `cli_*`
+# menjalankan CLI `size` kali di proses baru; RPC-nya tidak ikut terhitung.
+
+def scenario_transfer(chain, size):
+    from transfer_token.transfer import TransferToken
+    account = chain.new_account(tokens=size)
+    transfer = TransferToken(_key(account), account.address, chain.token.address, 2, _recipients(size))
+    return lambda: transfer.transfer(1)
+
+
+def scenario_transfer_pipeline(chain, size):
+    from transfer_token.transfer import TransferToken
+    account = chain.new_account(tokens=size)
+    transfer = TransferToken(_key(account), account.address, chain.token.address, 2, _recipients(size))
+    return lambda: transfer.transfer(1, pipeline=True)
+
+
+def scenario_transfer_presign(chain, size):
+    from transfer_token.transfer import TransferToken
+    account = chain.new_account(tokens=size)
+    transfer = TransferToken(_key(account), account.address, chain.token.address, 2, _recipients(size))
+    return lambda: transfer.transfer(1, presign=True)
+
+
+def scenario_batch_transfer(chain, size):
+    from transfer_token.batch_transfer import TeaAssamBatchTransfer
+    account = chain.new_account(tokens=size)
+    batch = TeaAssamBatchTransfer(_key(account), account.address, _recipients(size), 1, chain.token.address)
+    return batch.run
+
+
+def scenario_dex_details(chain, size):
+    from swaps_tokens.DexChecker import DexChecker
+    checkers = [DexChecker(chain.weth.address, chain.token.address) for _ in range(size)]
+    return lambda: [checker.details() for checker in checkers]
+
+
+def scenario_add_liquidity(chain, size):
+    from swaps_tokens.add_liquidity import LiquidityManager
+    account = chain.new_account(tokens=size, wtea=size)
+    managers = [
+        LiquidityManager(account.address, _key(account), 2, chain.token.address, 1)
+        for _ in range(size)
+    ]
+    return lambda: [manager.main_add_liquidity() for manager in managers]
+
+
+def scenario_swap_tea_to_contract(chain, size):
+    from swaps_tokens.tea_to_contract import TeaToContract
+    account = chain.new_account(tea=size * 2 + 100)
+    swaps = [
+        TeaToContract(_key(account), account.address, 0.1, chain.token.address, 2)
+        for _ in range(size)
+    ]
+    return lambda: [swap.eksekusi() for swap in swaps]
+
+
+def scenario_swap_contract_to_tea(chain, size):
+    from swaps_tokens.contract_to_tea import ContractToTea
+    account = chain.new_account(tokens=size)
+    swaps = [
+        ContractToTea(_key(account), account.address, 2, chain.token.address, 0.1)
+        for _ in range(size)
+    ]
+    return lambda: [swap.eksekusi_swap() for swap in swaps]
+
+
+def _cli(args: list):
+    """Menjalankan `tea-assam` di interpreter baru (cold start), seperti dari cron."""
+    command = [sys.executable, "-m", "tea_assam.cli"] + args
+    return lambda: subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+
+
+def scenario_cli_help(chain, size):
+    run = _cli(["--help"])
+    return lambda: [run() for _ in range(size)]
+
+
+def scenario_cli_dex_check(chain, size):
+    run = _cli(["--rpc-url", chain.rpc_url, "dex-check", "--token-default", chain.weth.address, "--token", chain.token.address])
+    return lambda: [run() for _ in range(size)]
+
+
+SCENARIOS = {
+    "transfer": scenario_transfer,
+    "transfer_pipeline": scenario_transfer_pipeline,
+    "transfer_presign": scenario_transfer_presign,
+    "batch_transfer": scenario_batch_transfer,
+    "dex_details": scenario_dex_details,
+    "add_liquidity": scenario_add_liquidity,
+    "swap_tea_to_contract": scenario_swap_tea_to_contract,
+    "swap_contract_to_tea": scenario_swap_contract_to_tea,
+    "cli_help": scenario_cli_help,
+    "cli_dex_check": scenario_cli_dex_check,
+}
+
+
+def run_scenario(chain, name: str, size: int) -> dict:
+    """
+    Menjalankan satu skenario dan mengembalikan waktu, jumlah RPC dan tx/s.
+
+    Hasil flow diperiksa dengan `has_failed`; run yang gagal (atau melempar
+    exception) ditandai `failed` karena waktunya tidak mewakili flow yang berhasil.
+    """
+    run = SCENARIOS[name](chain, size)
+    counter = RpcCounter()
+    start_block = chain.web3.eth.block_number
+    error = None
+    with counter.install():
+        start = time.perf_counter()
+        try:
+            outcome = run()
+        except Exception as e:
+            outcome, error = None, str(e)
+        wall_time = time.perf_counter() - start
+    txs = chain.tx_count(start_block + 1, chain.web3.eth.block_number)
+    result = {
+        "scenario": name,
+        "size": size,
+        "failed": error is not None or has_failed(outcome),
+        "wall_s": round(wall_time, 4),
+        "rpc_calls": counter.rpc_calls,
+        "http_requests": counter.http_requests,
+        "txs": txs,
+        "tx_per_s": round(txs / wall_time, 2) if wall_time > 0 else None,
+        "methods": dict(counter.methods),
+    }
+    if error is not None:
+        result["error"] = error
+    return result
+
+
+def compare(results: list, baselines: dict, tolerance: float) -> list:
+    """
+    Membandingkan hasil dengan baseline.
+
+    Waktu, jumlah panggilan RPC dan jumlah request HTTP dianggap regresi jika
+    melebihi baseline lebih dari `tolerance` (rasio). Jumlah RPC ikut bervariasi
+    karena polling receipt bergantung pada waktu mining. Run yang gagal tidak
+    dibandingkan angkanya dan selalu dilaporkan sebagai regresi.
+
+    Returns:
+        list: Pesan regresi; kosong jika tidak ada.
+    """
+    regressions = []
+    for result in results:
+        label = "{} (n={})".format(result["scenario"], result["size"])
+        if result.get("failed"):
+            regressions.append("{}: flow gagal".format(label))
+            continue
+        baseline = baselines.get("{}:{}".format(result["scenario"], result["size"]))
+        if baseline is None:
+            continue
+        for field in ("wall_s", "rpc_calls", "http_requests"):
+            if result[field] > baseline[field] * (1 + tolerance):
+                regressions.append("{}: {} {} > baseline {}".format(label, field, result[field], baseline[field]))
+    return regressions
+
+
+def _print_header():
+    header = "{:<22} {:>6} {:>10} {:>10} {:>8} {:>6} {:>10}".format(
+        "skenario", "n", "waktu(s)", "rpc", "http", "tx", "tx/s"
+    )
+    print(header)
+    print("-" * len(header))
+
+
+def _print_row(result: dict):
+    print("{:<22} {:>6} {:>10.3f} {:>10} {:>8} {:>6} {:>10}{}".format(
+        result["scenario"], result["size"], result["wall_s"], result["rpc_calls"],
+        result["http_requests"], result["txs"], result["tx_per_s"] if result["tx_per_s"] is not None else "-",
+        "  GAGAL" if result["failed"] else ""
+    ))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark entry point tea-assam di node anvil lokal.")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--rpc-url", help="Node anvil yang sudah berjalan (default: jalankan anvil baru)")
+    parser.add_argument("--poll-interval", type=float, default=0.1, help="Interval polling ReceiptTracker (detik)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Lokasi file baseline JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="Simpan hasil sebagai baseline baru")
+    parser.add_argument("--compare", action="store_true", help="Bandingkan dengan baseline; exit 1 jika regresi")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Toleransi terhadap baseline (rasio)")
+    parser.add_argument("--json", help="Simpan hasil lengkap ke file JSON")
+    args = parser.parse_args(argv)
+
+    with LocalChain(args.rpc_url) as chain:
+        chain.deploy()
+        ProviderRegistry.default().configure(chain.chain_id, chain.rpc_url)
+        ReceiptTracker.for_web3(ProviderRegistry.default().get_web3(chain.chain_id)).poll_interval = args.poll_interval
+
+        results = []
+        _print_header()
+        for name in args.scenarios:
+            for size in args.sizes:
+                results.append(run_scenario(chain, name, size))
+                _print_row(results[-1])
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failed = [result for result in results if result["failed"]]
+    exit_code = 1 if failed else 0
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print("Baseline {} belum ada; jalankan dengan --save-baseline".format(args.baseline))
+        else:
+            with open(args.baseline) as f:
+                regressions = compare(results, json.load(f), args.tolerance)
+            for message in regressions:
+                print("REGRESI: " + message)
+            exit_code = 1 if regressions else exit_code
+
+    if args.save_baseline:
+        baselines = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baselines = json.load(f)
+        for result in results:
+            if result["failed"]:
+                # Angka dari flow yang gagal tidak boleh menjadi pembanding.
+                print("Baseline {} (n={}) tidak disimpan: flow gagal".format(result["scenario"], result["size"]))
+                continue
+            baselines["{}:{}".format(result["scenario"], result["size"])] = {
+                field: result[field] for field in ("wall_s", "rpc_calls", "http_requests", "txs", "tx_per_s")
+            }
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print("Baseline disimpan ke {}".format(args.baseline))
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,14 @@
-from web3 import Web3
+import asyncio
+
+from tea_assam.async_engine import get_async_web3
+from tea_assam.indexer import ReserveIndexer
+from tea_assam.metadata_cache import MetadataCache, is_zero_address, pair_key
+from tea_assam.multicall import Multicall
+from tea_assam.providers import ProviderRegistry, get_web3
 
 class DexChecker:
-    RPC_URL = "https://assam-rpc.tea.xyz"
+    CHAIN_ID = 93384
+    RPC_URL = None  # None: memakai URL yang terdaftar di ProviderRegistry untuk CHAIN_ID; boleh list beberapa URL
     FACTORY_ADDRESS = "0x384d179F3f499E876fAd943d270AD38bb414aC24"
     Router_ADDRESS = "0xACBc89FF219232C058428D166860df4eA0114999" 
     DEX_FACTORY_ABI = [
@@ -14,7 +21,9 @@ class DexChecker:
             "outputs": [{"internalType": "address", "name": "", "type": "address"}],
             "stateMutability": "view",
             "type": "function"
-        }
+        },
+        {"inputs": [], "name": "allPairsLength", "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+        {"inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}], "name": "allPairs", "outputs": [{"internalType": "address", "name": "", "type": "address"}], "stateMutability": "view", "type": "function"}
     ]
 
     LP_TOKEN_ABI = [
@@ -22,7 +31,8 @@ class DexChecker:
         {"constant": True, "inputs": [], "name": "token1", "outputs": [{"name": "", "type": "address"}], "payable": False, "stateMutability": "view", "type": "function"},
         {"constant": True, "inputs": [], "name": "totalSupply", "outputs": [{"name": "", "type": "uint256"}], "payable": False, "stateMutability": "view", "type": "function"},
         {"constant": True, "inputs": [{"name": "", "type": "address"}], "name": "balanceOf", "outputs": [{"name": "", "type": "uint256"}], "payable": False, "stateMutability": "view", "type": "function"},
-        {"constant": True, "inputs": [], "name": "decimals", "outputs": [{"name": "", "type": "uint8"}], "payable": False, "stateMutability": "view", "type": "function"}
+        {"constant": True, "inputs": [], "name": "decimals", "outputs": [{"name": "", "type": "uint8"}], "payable": False, "stateMutability": "view", "type": "function"},
+        {"constant": True, "inputs": [], "name": "getReserves", "outputs": [{"name": "reserve0", "type": "uint112"}, {"name": "reserve1", "type": "uint112"}, {"name": "blockTimestampLast", "type": "uint32"}], "payable": False, "stateMutability": "view", "type": "function"}
     ]
 
     ERC20_ABI = [
@@ -30,36 +40,109 @@ class DexChecker:
         {"constant": True, "inputs": [{"name": "account", "type": "address"}], "name": "balanceOf", "outputs": [{"name": "", "type": "uint256"}], "payable": False, "stateMutability": "view", "type": "function"}
     ]
 
-    def __init__(self, token_default: str, token_contract: str):
+    ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+    _shared_web3 = None
+    _shared_multicall = None
+
+    def __init__(self, token_default: str = None, token_contract: str = None, rpc_urls: list = None, reserve_indexer: ReserveIndexer = None):
         self.TOKEN_A =  token_default
         self.TOKEN_B =  token_contract
+        self.reserve_indexer = reserve_indexer  # Jika diisi, reserve dibaca dari database lokal
         
-        self.web3 = Web3(Web3.HTTPProvider(self.RPC_URL))
-        self.check_connection()
+        self.rpc_urls = rpc_urls or self._class_rpc_urls()
+        if rpc_urls:
+            # Daftar endpoint sendiri (failover/load balancing); default koneksi bersama kelas.
+            self.web3 = get_web3(self.CHAIN_ID, rpc_urls)
+            self.multicall = Multicall(self.web3)
+        else:
+            self.web3, self.multicall = self._shared_connection()
         self.factory_contract = self.web3.eth.contract(address=self.FACTORY_ADDRESS, abi=self.DEX_FACTORY_ABI)
+        self.metadata_cache = MetadataCache.default()
+
+    @classmethod
+    def _class_rpc_urls(cls) -> list:
+        if cls.RPC_URL is None:
+            return ProviderRegistry.default().rpc_urls(cls.CHAIN_ID)
+        return [cls.RPC_URL] if isinstance(cls.RPC_URL, str) else list(cls.RPC_URL)
+
+    @classmethod
+    def _shared_connection(cls):
+        """Satu koneksi Web3 (dan Multicall) dipakai bersama oleh semua instance DexChecker."""
+        if cls._shared_web3 is None:
+            web3 = get_web3(cls.CHAIN_ID, cls._class_rpc_urls())
+            cls._shared_web3 = web3
+            cls._shared_multicall = Multicall(web3)
+        return cls._shared_web3, cls._shared_multicall
 
     def check_connection(self):
         if not self.web3.is_connected():
             raise Exception("Gagal terhubung ke blockchain!")
 
     def get_pair_address(self):
-        return self.factory_contract.functions.getPair(self.TOKEN_A, self.TOKEN_B).call()
+        return self.metadata_cache.get_or_fetch(
+            self.CHAIN_ID, "pair", pair_key(self.FACTORY_ADDRESS, self.TOKEN_A, self.TOKEN_B),
+            self.factory_contract.functions.getPair(self.TOKEN_A, self.TOKEN_B).call,
+            is_negative=is_zero_address
+        )
+
+    @classmethod
+    def _token_decimals(cls, web3, multicall, tokens, block_identifier, extra_calls=()):
+        """Mengambil decimals dari cache; yang belum ada dibaca sekaligus bersama `extra_calls`.
 
-    def get_lp_token_details(self, pair_address):
+        Pembacaan memakai `web3`/`multicall` milik pemanggil, yaitu node yang sama
+        dengan tempat `block_identifier` ditentukan.
+
+        Returns:
+            tuple: (dict decimals per token, hasil `extra_calls`).
+        """
+        cache = MetadataCache.default()
+        decimals = {token: cache.get(cls.CHAIN_ID, "decimals", token) for token in set(tokens)}
+        missing = sorted(token for token, value in decimals.items() if value is None)
+        erc20_contract = web3.eth.contract(abi=cls.ERC20_ABI)
+        values = multicall.call(list(extra_calls) + [
+            (token, erc20_contract.encode_abi("decimals"), ["uint8"]) for token in missing
+        ], block_identifier)
+        fetched = dict(zip(missing, values[len(extra_calls):]))
+        decimals.update(fetched)
+        cache.set_many(cls.CHAIN_ID, "decimals", {token: value for token, value in fetched.items() if value is not None})
+        return decimals, values[:len(extra_calls)]
+
+    @staticmethod
+    def _indexed_reserves(reserve_indexer, pair_address, block_identifier):
+        """
+        Reserve pair pada `block_identifier` dari ReserveIndexer, atau None.
+
+        Hanya dipakai jika indexer tidak tertinggal dari blok snapshot; selain itu
+        (atau jika pair belum punya event `Sync`) reserve dibaca langsung dari chain.
+        """
+        if reserve_indexer is None or not reserve_indexer.is_synced(block_identifier):
+            return None
+        indexed = reserve_indexer.get_reserves(pair_address, block_identifier)
+        return indexed[:2] if indexed is not None else None
+
+    def get_lp_token_details(self, pair_address, block_identifier=None):
+        # Semua pembacaan digabung lewat multicall dan dipatok ke blok yang sama
+        # agar cadangan dan total supply konsisten satu sama lain.
+        block_identifier = self.multicall.resolve_block(block_identifier)
+        indexed = self._indexed_reserves(self.reserve_indexer, pair_address, block_identifier)
         lp_contract = self.web3.eth.contract(address=pair_address, abi=self.LP_TOKEN_ABI)
-        token0 = lp_contract.functions.token0().call()
-        token1 = lp_contract.functions.token1().call()
-        total_supply = lp_contract.functions.totalSupply().call()
-        
-        decimals_lp = lp_contract.functions.decimals().call()
+        token0, token1, total_supply, decimals_lp = self.multicall.call([
+            (pair_address, lp_contract.encode_abi("token0"), ["address"]),
+            (pair_address, lp_contract.encode_abi("token1"), ["address"]),
+            (pair_address, lp_contract.encode_abi("totalSupply"), ["uint256"]),
+            (pair_address, lp_contract.encode_abi("decimals"), ["uint8"]),
+        ], block_identifier)
         
-        token0_contract = self.web3.eth.contract(address=token0, abi=self.ERC20_ABI)
-        token1_contract = self.web3.eth.contract(address=token1, abi=self.ERC20_ABI)
-        reserve_token0 = token0_contract.functions.balanceOf(pair_address).call()
-        reserve_token1 = token1_contract.functions.balanceOf(pair_address).call()
-        
-        decimals_token0 = token0_contract.functions.decimals().call()
-        decimals_token1 = token1_contract.functions.decimals().call()
+        erc20_contract = self.web3.eth.contract(abi=self.ERC20_ABI)
+        balance_calls = [] if indexed is not None else [
+            (token0, erc20_contract.encode_abi("balanceOf", args=[pair_address]), ["uint256"]),
+            (token1, erc20_contract.encode_abi("balanceOf", args=[pair_address]), ["uint256"]),
+        ]
+        token_decimals, balances = self._token_decimals(self.web3, self.multicall, [token0, token1], block_identifier, balance_calls)
+        reserve_token0, reserve_token1 = indexed if indexed is not None else balances
+        decimals_token0 = token_decimals[token0]
+        decimals_token1 = token_decimals[token1]
         
         total_supply_normal = total_supply / 10**decimals_lp
         reserve_token0_normal = reserve_token0 / 10**decimals_token0
@@ -75,7 +158,8 @@ class DexChecker:
             "total_supply": total_supply_normal,
             "reserve_token0": reserve_token0_normal,
             "reserve_token1": reserve_token1_normal,
-            "price_ratio": price_ratio
+            "price_ratio": price_ratio,
+            "block_number": block_identifier
         }
 
     def info(self):
@@ -86,7 +170,7 @@ class DexChecker:
 
     def details(self):
         pair_address = self.get_pair_address()
-        if pair_address != "0x0000000000000000000000000000000000000000":
+        if pair_address != self.ZERO_ADDRESS:
             detail = self.get_lp_token_details(pair_address)
             return {
                     "pair_found": "{}".format(pair_address),
@@ -100,4 +184,146 @@ class DexChecker:
         else:
             return "❌ pair belum ada di DEX Factory"
 
+    @classmethod
+    def scan(cls, pairs, block_identifier=None, reserve_indexer: ReserveIndexer = None):
+        """
+        Mengambil snapshot banyak pair sekaligus lewat multicall pada satu blok.
+        
+        Args:
+            pairs (list): Alamat pair, atau tuple `(token_a, token_b)` yang akan dicari
+                lewat `getPair` di factory.
+            block_identifier: Nomor blok snapshot; default blok terbaru.
+            reserve_indexer (ReserveIndexer): Jika diisi dan tidak tertinggal dari blok
+                snapshot, `getReserves` pair yang sudah terindeks tidak dibaca dari chain.
+        
+        Returns:
+            list: Satu baris dictionary per pair.
+        """
+        web3, multicall = cls._shared_connection()
+        block_identifier = multicall.resolve_block(block_identifier)
+        factory_contract = web3.eth.contract(address=cls.FACTORY_ADDRESS, abi=cls.DEX_FACTORY_ABI)
+        
+        lookups = [pair for pair in pairs if not isinstance(pair, str)]
+        found = multicall.call([
+            (cls.FACTORY_ADDRESS, factory_contract.encode_abi("getPair", args=[token_a, token_b]), ["address"])
+            for token_a, token_b in lookups
+        ], block_identifier)
+        found = iter(found)
+        pair_addresses = [pair if isinstance(pair, str) else next(found) for pair in pairs]
+        
+        lp_contract = web3.eth.contract(abi=cls.LP_TOKEN_ABI)
+        existing = [pair for pair in pair_addresses if pair and pair != cls.ZERO_ADDRESS]
+        indexed = {pair_address: cls._indexed_reserves(reserve_indexer, pair_address, block_identifier) for pair_address in existing}
+        calls = []
+        for pair_address in existing:
+            calls.extend([
+                (pair_address, lp_contract.encode_abi("token0"), ["address"]),
+                (pair_address, lp_contract.encode_abi("token1"), ["address"]),
+                (pair_address, lp_contract.encode_abi("totalSupply"), ["uint256"]),
+                (pair_address, lp_contract.encode_abi("decimals"), ["uint8"]),
+            ])
+            if indexed[pair_address] is None:
+                calls.append((pair_address, lp_contract.encode_abi("getReserves"), ["uint112", "uint112", "uint32"]))
+        values = iter(multicall.call(calls, block_identifier))
+        pair_data = {}
+        for pair_address in existing:
+            data = [next(values) for _ in range(4)]
+            pair_data[pair_address] = data + [indexed[pair_address] if indexed[pair_address] is not None else next(values)]
+        
+        tokens = [token for data in pair_data.values() for token in data[:2] if token]
+        token_decimals, _ = cls._token_decimals(web3, multicall, tokens, block_identifier)
+        
+        rows = []
+        for pair, pair_address in zip(pairs, pair_addresses):
+            row = {"pair": pair_address, "block_number": block_identifier}
+            if not isinstance(pair, str):
+                row["token_a"], row["token_b"] = pair
+            data = pair_data.get(pair_address)
+            if data is None:
+                row["error"] = "pair belum ada di DEX Factory"
+                rows.append(row)
+                continue
+            token0, token1, total_supply, decimals_lp, reserves = data
+            decimals_token0 = token_decimals.get(token0)
+            decimals_token1 = token_decimals.get(token1)
+            if None in (token0, token1, total_supply, decimals_lp, reserves, decimals_token0, decimals_token1):
+                row["error"] = "gagal membaca data pair"
+                rows.append(row)
+                continue
+            reserve_token0 = reserves[0] / 10**decimals_token0
+            reserve_token1 = reserves[1] / 10**decimals_token1
+            row.update({
+                "token0": token0,
+                "token1": token1,
+                "total_supply": total_supply / 10**decimals_lp,
+                "reserve_token0": reserve_token0,
+                "reserve_token1": reserve_token1,
+                "price_ratio": reserve_token0 / reserve_token1 if reserve_token1 > 0 else None
+            })
+            rows.append(row)
+        return rows
+
+    @classmethod
+    def list_factory_pairs(cls, start: int = 0, limit: int = None, block_identifier=None):
+        """Mengambil daftar alamat pair dari factory (`allPairsLength`/`allPairs`) secara batch."""
+        web3, multicall = cls._shared_connection()
+        block_identifier = multicall.resolve_block(block_identifier)
+        factory_contract = web3.eth.contract(address=cls.FACTORY_ADDRESS, abi=cls.DEX_FACTORY_ABI)
+        total = factory_contract.functions.allPairsLength().call(block_identifier=block_identifier)
+        end = total if limit is None else min(total, start + limit)
+        pair_addresses = multicall.call([
+            (cls.FACTORY_ADDRESS, factory_contract.encode_abi("allPairs", args=[i]), ["address"])
+            for i in range(start, end)
+        ], block_identifier)
+        return [pair for pair in pair_addresses if pair]
+
+    @classmethod
+    def scan_factory(cls, start: int = 0, limit: int = None, block_identifier=None, reserve_indexer: ReserveIndexer = None):
+        """Snapshot seluruh (atau sebagian) pair yang terdaftar di factory pada satu blok."""
+        _, multicall = cls._shared_connection()
+        block_identifier = multicall.resolve_block(block_identifier)
+        pair_addresses = cls.list_factory_pairs(start, limit, block_identifier)
+        return cls.scan(pair_addresses, block_identifier, reserve_indexer)
+
+    async def details_async(self):
+        """Versi async dari `details`; pembacaan yang saling lepas dijalankan bersamaan."""
+        web3 = await get_async_web3(self.rpc_urls[0])
+        factory_contract = web3.eth.contract(address=self.FACTORY_ADDRESS, abi=self.DEX_FACTORY_ABI)
+        pair_address = await factory_contract.functions.getPair(self.TOKEN_A, self.TOKEN_B).call()
+        if pair_address == self.ZERO_ADDRESS:
+            return "❌ pair belum ada di DEX Factory"
+
+        lp_contract = web3.eth.contract(address=pair_address, abi=self.LP_TOKEN_ABI)
+        token0, token1, total_supply, decimals_lp = await asyncio.gather(
+            lp_contract.functions.token0().call(),
+            lp_contract.functions.token1().call(),
+            lp_contract.functions.totalSupply().call(),
+            lp_contract.functions.decimals().call(),
+        )
+
+        token0_contract = web3.eth.contract(address=token0, abi=self.ERC20_ABI)
+        token1_contract = web3.eth.contract(address=token1, abi=self.ERC20_ABI)
+        reserve_token0, reserve_token1, decimals_token0, decimals_token1 = await asyncio.gather(
+            token0_contract.functions.balanceOf(pair_address).call(),
+            token1_contract.functions.balanceOf(pair_address).call(),
+            token0_contract.functions.decimals().call(),
+            token1_contract.functions.decimals().call(),
+        )
 
+        total_supply_normal = total_supply / 10**decimals_lp
+        reserve_token0_normal = reserve_token0 / 10**decimals_token0
+        reserve_token1_normal = reserve_token1 / 10**decimals_token1
+
+        if reserve_token1_normal > 0:
+            price_ratio = reserve_token0_normal / reserve_token1_normal
+        else:
+            price_ratio = "Tidak dapat dihitung (saldo nol)"
+        return {
+                "pair_found": "{}".format(pair_address),
+                "default_token": "{}".format(token0),
+                "contract_token": "{}".format(token1),
+                "total_supply": "{:.6f}".format(total_supply_normal),
+                "reserve_default_token": "{:.6f}".format(reserve_token0_normal),
+                "reserve_contract_token": "{:.6f}".format(reserve_token1_normal),
+                "price_ratio": "{}".format(price_ratio),
+                }
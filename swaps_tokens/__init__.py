@@ -0,0 +1,22 @@
+"""Entry point DEX: swap TEA/token, add liquidity dan pengecekan pair.
+
+Kelas dimuat saat pertama kali diakses agar import paket tetap ringan.
+"""
+import importlib
+
+_EXPORTS = {
+    "ContractToTea": "contract_to_tea",
+    "DexChecker": "DexChecker",
+    "LiquidityManager": "add_liquidity",
+    "TeaToContract": "tea_to_contract",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module("{}.{}".format(__name__, _EXPORTS[name])), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
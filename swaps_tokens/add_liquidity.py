@@ -1,21 +1,36 @@
-from web3 import Web3
+from functools import cached_property
+
+from tea_assam.abi import ERC20_ABI, FACTORY_ABI, PAIR_ABI, encode_approve, get_contract
+from tea_assam.allowance import AllowanceManager
+from tea_assam.async_engine import run_in_thread
+from tea_assam.gas import GasOracle
+from tea_assam.indexer import ReserveIndexer
+from tea_assam.journal import Journal
+from tea_assam.metadata_cache import MetadataCache, is_zero_address, pair_key
+from tea_assam.providers import ProviderRegistry, call_concurrently, get_web3
 
 class LiquidityManager:
-    def __init__(self, user_address: str, private_key: str, gasprice: int, contract_token: str, amount: int):
+    def __init__(self, user_address: str, private_key: str, gasprice: int, contract_token: str, amount: int, approve_amount: int = None, gas_oracle: GasOracle = None, rpc_urls: list = None, reserve_indexer: ReserveIndexer = None, batch_rpc: bool = False):
         """Inisialisasi LiquidityManager dengan parameter pengguna dan koneksi blockchain."""
         
-        self.rpc_url = "https://assam-rpc.tea.xyz"
         self.chain_id = 93384
+        # Beberapa URL di `rpc_urls` memakai failover dan load balancing.
+        self.rpc_urls = rpc_urls or ProviderRegistry.default().rpc_urls(self.chain_id)
+        self.rpc_url = self.rpc_urls[0]
         self.contract_token = contract_token
         self.private_key = private_key
         self.user_address = user_address
         self.gasprice = gasprice
         self.amount = amount 
+        self.approve_amount = approve_amount  # Allowance lebih besar (wei) yang diberikan sekali, opsional
+        self.allowance_manager = AllowanceManager.default()
+        self.reserve_indexer = reserve_indexer  # Jika diisi, reserve dibaca dari database lokal
         
         
-        self.web3 = Web3(Web3.HTTPProvider(self.rpc_url))
-        if not self.web3.is_connected():
-            raise Exception("Gagal terhubung ke blockchain.")
+        # `batch_rpc`: request bersamaan dari beberapa thread digabung menjadi JSON-RPC batch.
+        self.web3 = get_web3(self.chain_id, self.rpc_urls, batching=batch_rpc)
+        # Default memakai harga legacy tetap `gasprice`; berikan GasOracle sendiri untuk biaya adaptif.
+        self.gas_oracle = gas_oracle or GasOracle(self.web3, gas_price=self.web3.to_wei(self.gasprice, 'gwei'))
         
         
         self.router_address = "0xACBc89FF219232C058428D166860df4eA0114999"
@@ -51,155 +66,112 @@ class LiquidityManager:
         ]
         
         self.router_contract = self.web3.eth.contract(address=self.router_address, abi=self.router_abi)
-        self.wtea_address = self.router_contract.functions.WETH().call()  # Alamat WTEA
-        
-        self.token_a_decimals = self.get_token_decimals(self.contract_token)
-        self.token_b_decimals = self.get_token_decimals(self.wtea_address)
-        
-        self.amount_a_desired = int(self.amount * 10**self.token_a_decimals)  # Token A (kontrak)
-        self.amount_b_desired = int(self.amount * 10**self.token_b_decimals)  # Token B (WTEA)
-        
-        self.amount_a_min = int(self.amount_a_desired * 0.90)
-        self.amount_b_min = int(self.amount_b_desired * 0.90)
+        self.metadata_cache = MetadataCache.default()
         
         self.to = self.user_address
-        
-        self.deadline = self.web3.eth.get_block('latest')['timestamp'] + 600
+
+    # Nilai di bawah dibaca dari jaringan saat pertama kali dipakai, bukan saat objek dibuat.
+
+    @cached_property
+    def wtea_address(self):
+        """Alamat WTEA."""
+        return self.metadata_cache.get_or_fetch(
+            self.chain_id, "weth", self.router_address, self.router_contract.functions.WETH().call
+        )
+
+    @cached_property
+    def token_a_decimals(self):
+        return self.get_token_decimals(self.contract_token)
+
+    @cached_property
+    def token_b_decimals(self):
+        return self.get_token_decimals(self.wtea_address)
+
+    @cached_property
+    def amount_a_desired(self):
+        return int(self.amount * 10**self.token_a_decimals)  # Token A (kontrak)
+
+    @cached_property
+    def amount_b_desired(self):
+        return int(self.amount * 10**self.token_b_decimals)  # Token B (WTEA)
+
+    @cached_property
+    def amount_a_min(self):
+        return int(self.amount_a_desired * 0.90)
+
+    @cached_property
+    def amount_b_min(self):
+        return int(self.amount_b_desired * 0.90)
+
+    @cached_property
+    def deadline(self):
+        return self.web3.eth.get_block('latest')['timestamp'] + 600
 
     def get_token_decimals(self, token_address):
-        token_abi = [
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "decimals",
-                "outputs": [{"name": "", "type": "uint8"}],
-                "payable": False,
-                "stateMutability": "view",
-                "type": "function"
-            }
-        ]
-        token_contract = self.web3.eth.contract(address=token_address, abi=token_abi)
-        return token_contract.functions.decimals().call()
+        token_contract = get_contract(self.web3, token_address, ERC20_ABI)
+        return self.metadata_cache.get_or_fetch(
+            self.chain_id, "decimals", token_address, token_contract.functions.decimals().call
+        )
 
     def check_token_balance(self, token_address):
-        token_abi = [
-            {
-                "constant": True,
-                "inputs": [{"name": "_owner", "type": "address"}],
-                "name": "balanceOf",
-                "outputs": [{"name": "balance", "type": "uint256"}],
-                "payable": False,
-                "stateMutability": "view",
-                "type": "function"
-            }
-        ]
-        token_contract = self.web3.eth.contract(address=token_address, abi=token_abi)
+        token_contract = get_contract(self.web3, token_address, ERC20_ABI)
         token_balance = token_contract.functions.balanceOf(self.user_address).call()
         decimals = self.get_token_decimals(token_address)
         return token_balance / 10**decimals
 
     def check_allowance(self, token_address, spender_address):
-        token_abi = [
-            {
-                "constant": True,
-                "inputs": [
-                    {"name": "_owner", "type": "address"},
-                    {"name": "_spender", "type": "address"}
-                ],
-                "name": "allowance",
-                "outputs": [{"name": "", "type": "uint256"}],
-                "payable": False,
-                "stateMutability": "view",
-                "type": "function"
-            }
-        ]
-        token_contract = self.web3.eth.contract(address=token_address, abi=token_abi)
-        allowance = token_contract.functions.allowance(self.user_address, spender_address).call()
+        allowance = self.allowance_manager.get(self.web3, self.chain_id, token_address, self.user_address, spender_address)
         decimals = self.get_token_decimals(token_address)
         return allowance / 10**decimals
 
-    def approve_token(self, token_address, spender_address, amount):
-        token_abi = [
-            {
-                "constant": False,
-                "inputs": [
-                    {"name": "spender", "type": "address"},
-                    {"name": "value", "type": "uint256"}
-                ],
-                "name": "approve",
-                "outputs": [{"name": "", "type": "bool"}],
-                "payable": False,
-                "stateMutability": "nonpayable",
-                "type": "function"
-            }
-        ]
-        token_contract = self.web3.eth.contract(address=token_address, abi=token_abi)
-        
+    def _build_approve_tx(self, token_address, spender_address, amount):
         nonce = self.web3.eth.get_transaction_count(self.user_address, 'pending')
-        approve_tx = token_contract.functions.approve(spender_address, amount).build_transaction({
+        return self.gas_oracle.complete({
             'from': self.user_address,
+            'to': self.web3.to_checksum_address(token_address),
+            'data': encode_approve(spender_address, amount),
             'nonce': nonce,
-            'gas': 100000,
-            'gasPrice': self.web3.to_wei(self.gasprice + 10, 'gwei'),
             'chainId': self.chain_id
         })
+
+    def approve_token(self, token_address, spender_address, amount):
+        approve_tx = self._build_approve_tx(token_address, spender_address, amount)
         signed_approve_tx = self.web3.eth.account.sign_transaction(approve_tx, self.private_key)
         approve_tx_hash = self.web3.eth.send_raw_transaction(signed_approve_tx.raw_transaction)
         return self.web3.to_hex(approve_tx_hash)
 
     def check_pair_address(self, token_a_address, token_b_address):
         factory_address = "0x384d179F3f499E876fAd943d270AD38bb414aC24"
-        factory_abi = [
-            {
-                "inputs": [
-                    {"internalType": "address", "name": "tokenA", "type": "address"},
-                    {"internalType": "address", "name": "tokenB", "type": "address"}
-                ],
-                "name": "getPair",
-                "outputs": [{"internalType": "address", "name": "pair", "type": "address"}],
-                "stateMutability": "view",
-                "type": "function"
-            }
-        ]
-        factory_contract = self.web3.eth.contract(address=factory_address, abi=factory_abi)
-        pair_address = factory_contract.functions.getPair(token_a_address, token_b_address).call()
+        factory_contract = get_contract(self.web3, factory_address, FACTORY_ABI)
+        pair_address = self.metadata_cache.get_or_fetch(
+            self.chain_id, "pair", pair_key(factory_address, token_a_address, token_b_address),
+            factory_contract.functions.getPair(token_a_address, token_b_address).call,
+            is_negative=is_zero_address
+        )
         pair_exists = pair_address != "0x0000000000000000000000000000000000000000"
         return {"pair_exists": pair_exists, "pair_address": pair_address}
 
     def calculate_required_amount(self, token_address, amount, pair_address):
-        pair_abi = [
-            {
-                "inputs": [],
-                "name": "getReserves",
-                "outputs": [
-                    {"internalType": "uint112", "name": "reserve0", "type": "uint112"},
-                    {"internalType": "uint112", "name": "reserve1", "type": "uint112"},
-                    {"internalType": "uint32", "name": "blockTimestampLast", "type": "uint32"}
-                ],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [],
-                "name": "token0",
-                "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [],
-                "name": "token1",
-                "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-                "stateMutability": "view",
-                "type": "function"
-            }
-        ]
-        pair_contract = self.web3.eth.contract(address=pair_address, abi=pair_abi)
+        indexed = None
+        # Reserve lokal hanya dipakai jika indexer tidak tertinggal dari blok terbaru;
+        # selain itu dibaca langsung dari pair agar jumlah token B tidak memakai harga lama.
+        if self.reserve_indexer is not None and self.reserve_indexer.is_synced(self.web3.eth.block_number):
+            indexed = self.reserve_indexer.get_reserves(pair_address)
+        if indexed is not None:
+            reserve0, reserve1, _ = indexed
+            # Pair di sini selalu token kontrak/WTEA; pada Uniswap V2 token0 adalah alamat yang lebih kecil.
+            other_token = self.contract_token if token_address.lower() == self.wtea_address.lower() else self.wtea_address
+            token0 = min(token_address, other_token, key=lambda address: int(address, 16))
+            return self._required_from_reserves(token_address, token0, amount, reserve0, reserve1)
+
+        pair_contract = get_contract(self.web3, pair_address, PAIR_ABI)
         token0 = pair_contract.functions.token0().call()
-        token1 = pair_contract.functions.token1().call()
         reserve0, reserve1, _ = pair_contract.functions.getReserves().call()
-        
-        if token_address == token0:
+        return self._required_from_reserves(token_address, token0, amount, reserve0, reserve1)
+
+    @staticmethod
+    def _required_from_reserves(token_address, token0, amount, reserve0, reserve1):
+        if token_address.lower() == token0.lower():
             if reserve0 == 0:
                 return amount
             return (amount * reserve1) // reserve0
@@ -208,13 +180,10 @@ class LiquidityManager:
                 return amount
             return (amount * reserve0) // reserve1
 
-    def add_liquidity(self, token_a_address, token_b_address, amount_a_desired, amount_b_desired, amount_a_min, amount_b_min, to, deadline):
-        """Menambahkan likuiditas dan mengembalikan hash transaksi."""
+    def _build_add_liquidity_tx(self, token_a_address, token_b_address, amount_a_desired, amount_b_desired, amount_a_min, amount_b_min, to, deadline):
+        """Membangun transaksi addLiquidity tanpa menandatangani."""
         nonce = self.web3.eth.get_transaction_count(self.user_address, 'pending')
-        current_gas_price = self.web3.eth.gas_price
-        gas_price = int(current_gas_price * 1.5)
-        
-        tx = self.router_contract.functions.addLiquidity(
+        return self.gas_oracle.build(self.router_contract.functions.addLiquidity(
             token_a_address,
             token_b_address,
             amount_a_desired,
@@ -223,44 +192,84 @@ class LiquidityManager:
             amount_b_min,
             to,
             deadline
-        ).build_transaction({
+        ), {
             'from': self.user_address,
             'nonce': nonce,
-            'gas': 300000,
-            'gasPrice': gas_price,
             'chainId': self.chain_id
         })
-        
+
+    def add_liquidity(self, token_a_address, token_b_address, amount_a_desired, amount_b_desired, amount_a_min, amount_b_min, to, deadline):
+        """Menambahkan likuiditas dan mengembalikan hash transaksi."""
+        tx = self._build_add_liquidity_tx(token_a_address, token_b_address, amount_a_desired, amount_b_desired, amount_a_min, amount_b_min, to, deadline)
         signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
         tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
         return self.web3.to_hex(tx_hash)
 
-    def main_add_liquidity(self):
-        """Metode utama untuk menambahkan likuiditas dan mengembalikan semua informasi dalam dictionary."""
+    def main_add_liquidity(self, journal_path: str = None):
+        """Metode utama untuk menambahkan likuiditas dan mengembalikan semua informasi dalam dictionary.
+
+        Jika `journal_path` diisi, setiap transaksi dicatat ke jurnal JSONL sehingga
+        flow yang terhenti dilanjutkan dari langkah terakhir tanpa mengirim ulang.
+        """
         result = {}
+        journal = Journal(journal_path, "LiquidityManager:{}:{}:{}".format(self.user_address, self.contract_token, self.amount))
+        if journal.is_resumed():
+            result["resumed"] = True
         
-        result["token_a_balance_tokens"] = self.check_token_balance(self.contract_token)
-        result["token_b_balance_tokens"] = self.check_token_balance(self.wtea_address)
+        timings = journal.timings
+        # Saldo dan allowance kedua token saling independen: dibaca bersamaan (satu batch jika `batch_rpc`).
+        with timings.step("check_state"):
+            (
+                result["token_a_balance_tokens"],
+                result["token_b_balance_tokens"],
+                result["allowance_token_a_tokens"],
+                result["allowance_token_b_tokens"],
+            ) = call_concurrently(
+                lambda: self.check_token_balance(self.contract_token),
+                lambda: self.check_token_balance(self.wtea_address),
+                lambda: self.check_allowance(self.contract_token, self.router_address),
+                lambda: self.check_allowance(self.wtea_address, self.router_address),
+            )
         
-        result["allowance_token_a_tokens"] = self.check_allowance(self.contract_token, self.router_address)
-        result["allowance_token_b_tokens"] = self.check_allowance(self.wtea_address, self.router_address)
+        approvals = {}
+        for suffix, token_address, amount in (
+            ("token_a", self.contract_token, self.amount_a_desired),
+            ("token_b", self.wtea_address, self.amount_b_desired),
+        ):
+            approve_value = self.allowance_manager.required_approval(
+                self.web3, self.chain_id, token_address, self.user_address, self.router_address, amount, self.approve_amount
+            )
+            if approve_value is None:
+                result[f"approval_tx_hash_{suffix}"] = None
+                result[f"approval_skipped_{suffix}"] = True
+                continue
+            result[f"approval_tx_hash_{suffix}"] = journal.send(
+                f"approve_{suffix}", self.web3, self.private_key,
+                lambda token_address=token_address, approve_value=approve_value: self._build_approve_tx(
+                    token_address, self.router_address, approve_value
+                )
+            )
+            approvals[suffix] = (token_address, approve_value)
         
-        result["approval_tx_hash_token_a"] = self.approve_token(self.contract_token, self.router_address, self.amount_a_desired)
-        result["approval_tx_hash_token_b"] = self.approve_token(self.wtea_address, self.router_address, self.amount_b_desired)
-        
-        try:
-            receipt_a = self.web3.eth.wait_for_transaction_receipt(result["approval_tx_hash_token_a"], timeout=300)
-            result["approval_status_token_a"] = "sukses" if receipt_a.status == 1 else "gagal"
-        except Exception as e:
-            result["approval_status_token_a"] = f"error: {str(e)}"
+        for suffix in ("token_a", "token_b"):
+            if suffix not in approvals:
+                result[f"approval_status_{suffix}"] = "sukses"
+                continue
+            token_address, approve_value = approvals[suffix]
+            try:
+                status = journal.wait(f"approve_{suffix}", self.web3, timeout=300)
+                result[f"approval_tx_hash_{suffix}"] = journal.tx_hash(f"approve_{suffix}")
+                result[f"approval_status_{suffix}"] = "sukses" if status == 1 else "gagal"
+                if status == 1:
+                    self.allowance_manager.record_approval(self.chain_id, token_address, self.user_address, self.router_address, approve_value)
+                else:
+                    self.allowance_manager.invalidate(self.chain_id, token_address, self.user_address, self.router_address)
+            except Exception as e:
+                self.allowance_manager.invalidate(self.chain_id, token_address, self.user_address, self.router_address)
+                result[f"approval_status_{suffix}"] = f"error: {str(e)}"
         
-        try:
-            receipt_b = self.web3.eth.wait_for_transaction_receipt(result["approval_tx_hash_token_b"], timeout=300)
-            result["approval_status_token_b"] = "sukses" if receipt_b.status == 1 else "gagal"
-        except Exception as e:
-            result["approval_status_token_b"] = f"error: {str(e)}"
-        
-        pair_info = self.check_pair_address(self.contract_token, self.wtea_address)
+        with timings.step("check_pair"):
+            pair_info = self.check_pair_address(self.contract_token, self.wtea_address)
         result["pair_exists"] = pair_info["pair_exists"]
         result["pair_address"] = pair_info["pair_address"]
         
@@ -270,7 +279,8 @@ class LiquidityManager:
         result["initial_amount_b_desired_wei"] = self.amount_b_desired
         
         if pair_info["pair_exists"]:
-            required_amount_b = self.calculate_required_amount(self.contract_token, self.amount_a_desired, pair_info["pair_address"])
+            with timings.step("calculate_required_amount"):
+                required_amount_b = self.calculate_required_amount(self.contract_token, self.amount_a_desired, pair_info["pair_address"])
             if required_amount_b != self.amount_b_desired:
                 result["warning"] = f"Jumlah token B disesuaikan dari {self.amount_b_desired} ke {required_amount_b} berdasarkan cadangan."
                 self.amount_b_desired = required_amount_b
@@ -279,7 +289,7 @@ class LiquidityManager:
         result["final_amount_b_desired_tokens"] = self.amount_b_desired / 10**self.token_b_decimals
         result["final_amount_b_desired_wei"] = self.amount_b_desired
         
-        result["add_liquidity_tx_hash"] = self.add_liquidity(
+        result["add_liquidity_tx_hash"] = journal.send("add_liquidity", self.web3, self.private_key, lambda: self._build_add_liquidity_tx(
             self.contract_token,
             self.wtea_address,
             self.amount_a_desired,
@@ -288,14 +298,23 @@ class LiquidityManager:
             self.amount_b_min,
             self.to,
             self.deadline
-        )
+        ))
         
         try:
-            receipt = self.web3.eth.wait_for_transaction_receipt(result["add_liquidity_tx_hash"], timeout=300)
-            result["add_liquidity_status"] = "sukses" if receipt.status == 1 else "gagal"
+            status = journal.wait("add_liquidity", self.web3, timeout=300)
+            result["add_liquidity_tx_hash"] = journal.tx_hash("add_liquidity")
+            result["add_liquidity_status"] = "sukses" if status == 1 else "gagal"
+            journal.finish()
         except Exception as e:
             result["add_liquidity_status"] = f"error: {str(e)}"
+        finally:
+            # Jumlah yang terpakai ditentukan router, dan transaksi bisa gagal; allowance dibaca ulang nanti.
+            self.allowance_manager.invalidate(self.chain_id, self.contract_token, self.user_address, self.router_address)
+            self.allowance_manager.invalidate(self.chain_id, self.wtea_address, self.user_address, self.router_address)
         
+        result["timings"] = timings.as_dict()
         return result
 
-
+    async def main_add_liquidity_async(self, journal_path: str = None):
+        """Versi async dari `main_add_liquidity`; flow sinkron yang sama dijalankan di thread pool."""
+        return await run_in_thread(self.main_add_liquidity, journal_path)
@@ -1,13 +1,24 @@
-from web3 import Web3
+from functools import cached_property
+
+from tea_assam.abi import ERC20_ABI, encode_approve, get_contract
+from tea_assam.allowance import AllowanceManager
+from tea_assam.async_engine import run_in_thread
+from tea_assam.gas import GasOracle
+from tea_assam.journal import Journal
+from tea_assam.metadata_cache import MetadataCache
+from tea_assam.providers import ProviderRegistry, call_concurrently, get_web3
+from tea_assam.quote import QuoteEngine
+from tea_assam.routing import PairGraph
 
 class ContractToTea:
-    def __init__(self, private_key: str, user_address: str, gasprice: int, contract_address: str, amount_in: int):
-        self.rpc_url = "https://assam-rpc.tea.xyz"
+    def __init__(self, private_key: str, user_address: str, gasprice: int, contract_address: str, amount_in: int, approve_amount: int = None, gas_oracle: GasOracle = None, rpc_urls: list = None, slippage: float = 0.005, route_graph: PairGraph = None, max_hops: int = 3, batch_rpc: bool = False):
         self.chain_id = 93384
+        # Beberapa URL di `rpc_urls` memakai failover dan load balancing.
+        self.rpc_urls = rpc_urls or ProviderRegistry.default().rpc_urls(self.chain_id)
+        self.rpc_url = self.rpc_urls[0]
 
-        self.web3 = Web3(Web3.HTTPProvider(self.rpc_url))
-        if not self.web3.is_connected():
-            raise Exception("Failed to connect to blockchain...")
+        # `batch_rpc`: request bersamaan dari beberapa thread digabung menjadi JSON-RPC batch.
+        self.web3 = get_web3(self.chain_id, self.rpc_urls, batching=batch_rpc)
 
         self.router_address = "0xACBc89FF219232C058428D166860df4eA0114999"
         self.private_key = private_key
@@ -15,6 +26,10 @@ class ContractToTea:
         self.contract_address = contract_address
         self.gasprice = gasprice
         self.amount_in = amount_in
+        self.approve_amount = approve_amount  # Allowance lebih besar (wei) yang diberikan sekali, opsional
+        self.allowance_manager = AllowanceManager.default()
+        # Default memakai harga legacy tetap `gasprice`; berikan GasOracle sendiri untuk biaya adaptif.
+        self.gas_oracle = gas_oracle or GasOracle(self.web3, gas_price=self.web3.to_wei(str(self.gasprice), 'gwei'))
 
         self.router_abi = [
             {
@@ -40,97 +55,151 @@ class ContractToTea:
         ]
 
         self.router_contract = self.web3.eth.contract(address=self.router_address, abi=self.router_abi)
-        self.wtea_address = self.router_contract.functions.WETH().call()
+        self.metadata_cache = MetadataCache.default()
         self.amount_in = self.web3.to_wei(self.amount_in, 'ether')
-        self.amount_out_min = 0
+        self.amount_out_min = None  # None: dihitung dari quote lokal dan `slippage`
+        self.slippage = slippage
+        self.quote_engine = QuoteEngine(self.web3, chain_id=self.chain_id)
+        self.route_graph = route_graph  # PairGraph opsional untuk mencari rute multi-hop terbaik
+        self.max_hops = max_hops
         self.to = self.user_address
-        self.deadline = self.web3.eth.get_block('latest')['timestamp'] + 600
+
+    @cached_property
+    def wtea_address(self):
+        """Alamat WTEA, dibaca saat pertama kali dipakai."""
+        return self.metadata_cache.get_or_fetch(
+            self.chain_id, "weth", self.router_address, self.router_contract.functions.WETH().call
+        )
+
+    @cached_property
+    def deadline(self):
+        """Deadline swap (10 menit dari blok terbaru), dibaca saat pertama kali dipakai."""
+        return self.web3.eth.get_block('latest')['timestamp'] + 600
 
     def check_token_balance(self, token_address):
-        token_abi = [
-            {
-                "constant": True,
-                "inputs": [{"name": "_owner", "type": "address"}],
-                "name": "balanceOf",
-                "outputs": [{"name": "balance", "type": "uint256"}],
-                "payable": False,
-                "stateMutability": "view",
-                "type": "function"
-            }
-        ]
-        token_contract = self.web3.eth.contract(address=token_address, abi=token_abi)
+        token_contract = get_contract(self.web3, token_address, ERC20_ABI)
         token_balance = token_contract.functions.balanceOf(self.user_address).call()
         return self.web3.from_wei(token_balance, 'ether')
 
-    def approve_token(self, token_address, spender_address, amount):
-        token_abi = [
-            {
-                "constant": False,
-                "inputs": [
-                    {"name": "spender", "type": "address"},
-                    {"name": "value", "type": "uint256"}
-                ],
-                "name": "approve",
-                "outputs": [{"name": "", "type": "bool"}],
-                "payable": False,
-                "stateMutability": "nonpayable",
-                "type": "function"
-            }
-        ]
-        token_contract = self.web3.eth.contract(address=token_address, abi=token_abi)
+    def _build_approve_tx(self, token_address, spender_address, amount):
         nonce = self.web3.eth.get_transaction_count(self.user_address)
-        approve_tx = token_contract.functions.approve(spender_address, amount).build_transaction({
+        return self.gas_oracle.complete({
             'from': self.user_address,
+            'to': self.web3.to_checksum_address(token_address),
+            'data': encode_approve(spender_address, amount),
             'nonce': nonce,
-            'gas': 100000,
-            'gasPrice': self.web3.to_wei('{}'.format(self.gasprice), 'gwei'),
             'chainId': self.chain_id
         })
+
+    def approve_token(self, token_address, spender_address, amount):
+        approve_tx = self._build_approve_tx(token_address, spender_address, amount)
         signed_approve_tx = self.web3.eth.account.sign_transaction(approve_tx, self.private_key)
         approve_tx_hash = self.web3.eth.send_raw_transaction(signed_approve_tx.raw_transaction)
         return self.web3.to_hex(approve_tx_hash)
 
-    def swap_contract_to_tea(self, amount_in, amount_out_min, path, to, deadline):
+    def get_swap_path(self, token_in, token_out):
+        """Rute swap terbaik dari `route_graph` jika diberikan, selain itu langsung `[token_in, token_out]`."""
+        if self.route_graph is not None:
+            route = self.route_graph.best_route(self.amount_in, token_in, token_out, self.max_hops)
+            if route is not None:
+                return route["path"]
+        return [token_in, token_out]
+
+    def get_amount_out_min(self, path):
+        """
+        Menghitung `amountOutMin` dari quote lokal Uniswap V2 dan toleransi `slippage`.
+
+        Nilai `amount_out_min` yang diisi manual dipakai apa adanya; `slippage=None`
+        berarti tanpa batas (0).
+        """
+        if self.amount_out_min is not None:
+            return self.amount_out_min
+        if self.slippage is None:
+            return 0
+        return self.quote_engine.amount_out_min(self.amount_in, path, self.slippage)
+
+    def _build_swap_tx(self, amount_in, amount_out_min, path, to, deadline):
         nonce = self.web3.eth.get_transaction_count(self.user_address)
-        tx = self.router_contract.functions.swapExactTokensForETH(
+        return self.gas_oracle.build(self.router_contract.functions.swapExactTokensForETH(
             amount_in,
             amount_out_min,
             path,
             to,
             deadline
-        ).build_transaction({
+        ), {
             'from': self.user_address,
             'nonce': nonce,
-            'gas': 200000,
-            'gasPrice': self.web3.to_wei('{}'.format(self.gasprice), 'gwei'),
             'chainId': self.chain_id
         })
+
+    def swap_contract_to_tea(self, amount_in, amount_out_min, path, to, deadline):
+        tx = self._build_swap_tx(amount_in, amount_out_min, path, to, deadline)
         signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
         tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
         return self.web3.to_hex(tx_hash)
 
-    def eksekusi_swap(self):
+    def eksekusi_swap(self, journal_path: str = None):
+        """
+        Menjalankan approve lalu swap token ke TEA.
+
+        Args:
+            journal_path (str): File jurnal JSONL; jika diisi, flow yang terhenti
+                dilanjutkan dari langkah terakhir tanpa mengirim ulang transaksi.
+        """
         result = {}
+        journal = Journal(journal_path, "ContractToTea:{}:{}:{}".format(self.user_address, self.contract_address, self.amount_in))
+        if journal.is_resumed():
+            result['resumed'] = True
         
-        # Memeriksa saldo token
-        result['token_balance_tokens'] = self.check_token_balance(self.contract_address)
+        timings = journal.timings
         
-        # Menentukan jalur swap
-        path = [self.contract_address, self.wtea_address]
+        # Saldo token, jalur swap, dan allowance saling independen: dibaca bersamaan
+        with timings.step('check_state'):
+            result['token_balance_tokens'], path, approve_value = call_concurrently(
+                lambda: self.check_token_balance(self.contract_address),
+                lambda: self.get_swap_path(self.contract_address, self.wtea_address),
+                lambda: self.allowance_manager.required_approval(
+                    self.web3, self.chain_id, self.contract_address, self.user_address, self.router_address, self.amount_in, self.approve_amount
+                ),
+            )
         result['swap_path'] = path
         
-        # Melakukan approval
-        approval_tx_hash = self.approve_token(self.contract_address, self.router_address, self.amount_in)
-        result['approval_tx_hash'] = approval_tx_hash
-        approval_receipt = self.web3.eth.wait_for_transaction_receipt(approval_tx_hash)
-        result['approval_status'] = 'sukses' if approval_receipt.status == 1 else 'gagal'
+        # Melakukan approval, dilewati jika allowance sudah cukup
+        if approve_value is None:
+            result['approval_tx_hash'] = None
+            result['approval_status'] = 'sukses'
+            result['approval_skipped'] = True
+        else:
+            approval_tx_hash = journal.send("approve", self.web3, self.private_key, lambda: self._build_approve_tx(
+                self.contract_address, self.router_address, approve_value
+            ))
+            result['approval_tx_hash'] = approval_tx_hash
+            result['approval_status'] = 'sukses' if journal.wait("approve", self.web3) == 1 else 'gagal'
+            result['approval_tx_hash'] = journal.tx_hash("approve")
+            if result['approval_status'] == 'sukses':
+                self.allowance_manager.record_approval(self.chain_id, self.contract_address, self.user_address, self.router_address, approve_value)
+            else:
+                self.allowance_manager.invalidate(self.chain_id, self.contract_address, self.user_address, self.router_address)
         
-        # Melakukan swap
-        swap_tx_hash = self.swap_contract_to_tea(self.amount_in, self.amount_out_min, path, self.to, self.deadline)
+        # Melakukan swap dengan amountOutMin dari quote lokal
+        with timings.step('quote'):
+            amount_out_min = self.get_amount_out_min(path)
+        result['amount_out_min'] = amount_out_min
+        swap_tx_hash = journal.send("swap", self.web3, self.private_key, lambda: self._build_swap_tx(
+            self.amount_in, amount_out_min, path, self.to, self.deadline
+        ))
         result['swap_tx_hash'] = swap_tx_hash
-        swap_receipt = self.web3.eth.wait_for_transaction_receipt(swap_tx_hash)
-        result['swap_status'] = 'sukses' if swap_receipt.status == 1 else 'gagal'
+        result['swap_status'] = 'sukses' if journal.wait("swap", self.web3) == 1 else 'gagal'
+        result['swap_tx_hash'] = journal.tx_hash("swap")
+        if result['swap_status'] == 'sukses':
+            self.allowance_manager.consume(self.chain_id, self.contract_address, self.user_address, self.router_address, self.amount_in)
+        else:
+            self.allowance_manager.invalidate(self.chain_id, self.contract_address, self.user_address, self.router_address)
+        journal.finish()
+        result['timings'] = timings.as_dict()
         
         return result
 
-
+    async def eksekusi_swap_async(self, journal_path: str = None):
+        """Versi async dari `eksekusi_swap`; flow sinkron yang sama dijalankan di thread pool."""
+        return await run_in_thread(self.eksekusi_swap, journal_path)
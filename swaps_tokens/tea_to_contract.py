@@ -1,19 +1,34 @@
-from web3 import Web3
 import locale
+from functools import cached_property
+
+from tea_assam.abi import WETH_ABI, encode_approve, get_contract
+from tea_assam.allowance import AllowanceManager
+from tea_assam.async_engine import run_in_thread
+from tea_assam.gas import GasOracle
+from tea_assam.journal import Journal
+from tea_assam.metadata_cache import MetadataCache
+from tea_assam.providers import ProviderRegistry, call_concurrently, get_web3
+from tea_assam.quote import QuoteEngine
+from tea_assam.routing import PairGraph
 
 class TeaToContract:
-    def __init__(self, private_key: str, user_address: str, amount: int, contract_address: str, gasprice: int):
-        self.rpc_url = "https://assam-rpc.tea.xyz"
+    def __init__(self, private_key: str, user_address: str, amount: int, contract_address: str, gasprice: int, approve_amount: int = None, gas_oracle: GasOracle = None, rpc_urls: list = None, slippage: float = 0.005, route_graph: PairGraph = None, max_hops: int = 3, batch_rpc: bool = False):
         self.chain_id = 93384
+        # Beberapa URL di `rpc_urls` memakai failover dan load balancing.
+        self.rpc_urls = rpc_urls or ProviderRegistry.default().rpc_urls(self.chain_id)
+        self.rpc_url = self.rpc_urls[0]
         self.private_key = private_key
         self.user_address = user_address
         self.amount = amount
         self.contract_address = contract_address
         self.gasprice = gasprice
+        self.approve_amount = approve_amount  # Allowance lebih besar (wei) yang diberikan sekali, opsional
+        self.allowance_manager = AllowanceManager.default()
         
-        self.web3 = Web3(Web3.HTTPProvider(self.rpc_url))
-        if not self.web3.is_connected():
-            raise Exception("Gagal terhubung ke blockchain.")
+        # `batch_rpc`: request bersamaan dari beberapa thread digabung menjadi JSON-RPC batch.
+        self.web3 = get_web3(self.chain_id, self.rpc_urls, batching=batch_rpc)
+        # Default memakai harga legacy tetap `gasprice`; berikan GasOracle sendiri untuk biaya adaptif.
+        self.gas_oracle = gas_oracle or GasOracle(self.web3, gas_price=self.web3.to_wei(str(self.gasprice), 'gwei'))
         
         self.router_address = "0xACBc89FF219232C058428D166860df4eA0114999"
         self.router_abi = [
@@ -47,132 +62,177 @@ class TeaToContract:
             }
         ]
         self.router_contract = self.web3.eth.contract(address=self.router_address, abi=self.router_abi)
+        self.metadata_cache = MetadataCache.default()
         
         self.amount_in = self.web3.to_wei(self.amount, 'ether')
-        self.amount_out_min = 0
-        self.deadline = self.web3.eth.get_block('latest')['timestamp'] + 600  # Deadline 10 menit
+        self.amount_out_min = None  # None: dihitung dari quote lokal dan `slippage`
+        self.slippage = slippage
+        self.quote_engine = QuoteEngine(self.web3, chain_id=self.chain_id)
+        self.route_graph = route_graph  # PairGraph opsional untuk mencari rute multi-hop terbaik
+        self.max_hops = max_hops
+
+    @cached_property
+    def deadline(self):
+        """Deadline swap (10 menit dari blok terbaru), dibaca saat pertama kali dipakai."""
+        return self.web3.eth.get_block('latest')['timestamp'] + 600
 
     def get_wtea_address(self):
-        return self.router_contract.functions.WETH().call()
+        return self.metadata_cache.get_or_fetch(
+            self.chain_id, "weth", self.router_address, self.router_contract.functions.WETH().call
+        )
 
     def check_tea_balance(self):
         tea_balance = self.web3.eth.get_balance(self.user_address)
         return self.web3.from_wei(tea_balance, 'ether')
 
-    def wrap_tea(self, amount):
+    def _build_wrap_tx(self, amount):
         wtea_address = self.get_wtea_address()
-        wtea_abi = [
-            {
-                "constant": False,
-                "inputs": [],
-                "name": "deposit",
-                "outputs": [],
-                "payable": True,
-                "stateMutability": "payable",
-                "type": "function"
-            }
-        ]
-        wtea_contract = self.web3.eth.contract(address=wtea_address, abi=wtea_abi)
+        wtea_contract = get_contract(self.web3, wtea_address, WETH_ABI)
         nonce = self.web3.eth.get_transaction_count(self.user_address)
-        wrap_tx = wtea_contract.functions.deposit().build_transaction({
+        return self.gas_oracle.build(wtea_contract.functions.deposit(), {
             'from': self.user_address,
             'nonce': nonce,
             'value': amount,
-            'gas': 100000,
-            'gasPrice': self.web3.to_wei(str(self.gasprice), 'gwei'),
             'chainId': self.chain_id
         })
+
+    def wrap_tea(self, amount):
+        wrap_tx = self._build_wrap_tx(amount)
         signed_wrap_tx = self.web3.eth.account.sign_transaction(wrap_tx, self.private_key)
         wrap_tx_hash = self.web3.eth.send_raw_transaction(signed_wrap_tx.raw_transaction)
         return self.web3.to_hex(wrap_tx_hash)
 
     def check_wtea_balance(self):
         wtea_address = self.get_wtea_address()
-        wtea_abi = [
-            {
-                "constant": True,
-                "inputs": [{"name": "_owner", "type": "address"}],
-                "name": "balanceOf",
-                "outputs": [{"name": "balance", "type": "uint256"}],
-                "payable": False,
-                "stateMutability": "view",
-                "type": "function"
-            }
-        ]
-        wtea_contract = self.web3.eth.contract(address=wtea_address, abi=wtea_abi)
+        wtea_contract = get_contract(self.web3, wtea_address, WETH_ABI)
         wtea_balance = wtea_contract.functions.balanceOf(self.user_address).call()
         return self.web3.from_wei(wtea_balance, 'ether')
 
-    def approve_token(self, token_address, spender_address, amount):
-        token_abi = [
-            {
-                "constant": False,
-                "inputs": [
-                    {"name": "spender", "type": "address"},
-                    {"name": "value", "type": "uint256"}
-                ],
-                "name": "approve",
-                "outputs": [{"name": "", "type": "bool"}],
-                "payable": False,
-                "stateMutability": "nonpayable",
-                "type": "function"
-            }
-        ]
-        token_contract = self.web3.eth.contract(address=token_address, abi=token_abi)
+    def _build_approve_tx(self, token_address, spender_address, amount):
         nonce = self.web3.eth.get_transaction_count(self.user_address)
-        approve_tx = token_contract.functions.approve(spender_address, amount).build_transaction({
+        return self.gas_oracle.complete({
             'from': self.user_address,
+            'to': self.web3.to_checksum_address(token_address),
+            'data': encode_approve(spender_address, amount),
             'nonce': nonce,
-            'gas': 100000,
-            'gasPrice': self.web3.to_wei(str(self.gasprice), 'gwei'),
             'chainId': self.chain_id
         })
+
+    def approve_token(self, token_address, spender_address, amount):
+        approve_tx = self._build_approve_tx(token_address, spender_address, amount)
         signed_approve_tx = self.web3.eth.account.sign_transaction(approve_tx, self.private_key)
         approve_tx_hash = self.web3.eth.send_raw_transaction(signed_approve_tx.raw_transaction)
         return self.web3.to_hex(approve_tx_hash)
 
-    def swap_tokens(self, amount_in, amount_out_min, path, to, deadline):
+    def get_swap_path(self, token_in, token_out):
+        """Rute swap terbaik dari `route_graph` jika diberikan, selain itu langsung `[token_in, token_out]`."""
+        if self.route_graph is not None:
+            route = self.route_graph.best_route(self.amount_in, token_in, token_out, self.max_hops)
+            if route is not None:
+                return route["path"]
+        return [token_in, token_out]
+
+    def get_amount_out_min(self, path):
+        """
+        Menghitung `amountOutMin` dari quote lokal Uniswap V2 dan toleransi `slippage`.
+
+        Nilai `amount_out_min` yang diisi manual dipakai apa adanya; `slippage=None`
+        berarti tanpa batas (0).
+        """
+        if self.amount_out_min is not None:
+            return self.amount_out_min
+        if self.slippage is None:
+            return 0
+        return self.quote_engine.amount_out_min(self.amount_in, path, self.slippage)
+
+    def _build_swap_tx(self, amount_in, amount_out_min, path, to, deadline):
         nonce = self.web3.eth.get_transaction_count(self.user_address)
-        tx = self.router_contract.functions.swapExactTokensForTokens(
+        return self.gas_oracle.build(self.router_contract.functions.swapExactTokensForTokens(
             amount_in, amount_out_min, path, to, deadline
-        ).build_transaction({
+        ), {
             'from': self.user_address,
             'nonce': nonce,
-            'gas': 200000,
-            'gasPrice': self.web3.to_wei(str(self.gasprice), 'gwei'),
             'chainId': self.chain_id
         })
+
+    def swap_tokens(self, amount_in, amount_out_min, path, to, deadline):
+        tx = self._build_swap_tx(amount_in, amount_out_min, path, to, deadline)
         signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
         tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
         return self.web3.to_hex(tx_hash)
 
-    def eksekusi(self):
+    def eksekusi(self, journal_path: str = None):
+        """
+        Menjalankan wrap TEA, approve WTEA, lalu swap ke token kontrak.
+
+        Args:
+            journal_path (str): File jurnal JSONL; jika diisi, flow yang terhenti
+                dilanjutkan dari langkah terakhir tanpa mengirim ulang transaksi.
+        """
         result = {}
         system_locale = locale.getlocale()[0]
         is_indonesian = "id" in system_locale.lower() if system_locale else False
+        journal = Journal(journal_path, "TeaToContract:{}:{}:{}".format(self.user_address, self.contract_address, self.amount_in))
+        if journal.is_resumed():
+            result["resumed"] = True
 
-        result["tea_balance_tokens"] = self.check_tea_balance()
+        timings = journal.timings
+        with timings.step("check_balance"):
+            result["tea_balance_tokens"] = self.check_tea_balance()
 
         amount_to_wrap = self.web3.to_wei(1, 'ether')
-        result["wrap_tx_hash"] = self.wrap_tea(amount_to_wrap)
-        self.web3.eth.wait_for_transaction_receipt(result["wrap_tx_hash"])
-
-        result["wtea_balance_tokens"] = self.check_wtea_balance()
+        result["wrap_tx_hash"] = journal.send("wrap", self.web3, self.private_key, lambda: self._build_wrap_tx(amount_to_wrap))
+        journal.wait("wrap", self.web3)
+        result["wrap_tx_hash"] = journal.tx_hash("wrap")
 
         wtea_address = self.get_wtea_address()
-        result["approval_tx_hash"] = self.approve_token(wtea_address, self.router_address, self.amount_in)
-        self.web3.eth.wait_for_transaction_receipt(result["approval_tx_hash"])
+        # Saldo WTEA dan allowance saling independen: dibaca bersamaan (satu batch jika `batch_rpc`).
+        with timings.step("check_state"):
+            result["wtea_balance_tokens"], approve_value = call_concurrently(
+                self.check_wtea_balance,
+                lambda: self.allowance_manager.required_approval(
+                    self.web3, self.chain_id, wtea_address, self.user_address, self.router_address, self.amount_in, self.approve_amount
+                ),
+            )
+        if approve_value is None:
+            result["approval_tx_hash"] = None
+            result["approval_skipped"] = True
+        else:
+            result["approval_tx_hash"] = journal.send("approve", self.web3, self.private_key, lambda: self._build_approve_tx(
+                wtea_address, self.router_address, approve_value
+            ))
+            approve_status = journal.wait("approve", self.web3)
+            result["approval_tx_hash"] = journal.tx_hash("approve")
+            if approve_status == 1:
+                self.allowance_manager.record_approval(self.chain_id, wtea_address, self.user_address, self.router_address, approve_value)
+            else:
+                self.allowance_manager.invalidate(self.chain_id, wtea_address, self.user_address, self.router_address)
 
-        path = [wtea_address, self.contract_address]
-        result["swap_tx_hash"] = self.swap_tokens(self.amount_in, self.amount_out_min, path, self.user_address, self.deadline)
-        swap_receipt = self.web3.eth.wait_for_transaction_receipt(result["swap_tx_hash"])
+        with timings.step("quote"):
+            path = self.get_swap_path(wtea_address, self.contract_address)
+            amount_out_min = self.get_amount_out_min(path)
+        result["amount_out_min"] = amount_out_min
+        result["swap_tx_hash"] = journal.send("swap", self.web3, self.private_key, lambda: self._build_swap_tx(
+            self.amount_in, amount_out_min, path, self.user_address, self.deadline
+        ))
+        swap_status = journal.wait("swap", self.web3)
+        result["swap_tx_hash"] = journal.tx_hash("swap")
+        if swap_status == 1:
+            self.allowance_manager.consume(self.chain_id, wtea_address, self.user_address, self.router_address, self.amount_in)
+        else:
+            self.allowance_manager.invalidate(self.chain_id, wtea_address, self.user_address, self.router_address)
+        journal.finish()
 
-        result["swap_status"] = "sukses" if swap_receipt.status == 1 else "gagal"
+        result["swap_status"] = "sukses" if swap_status == 1 else "gagal"
         result["message"] = (
             "Transaksi swap berhasil" if is_indonesian else "Swap transaction successful"
-        ) if swap_receipt.status == 1 else (
+        ) if swap_status == 1 else (
             "Transaksi swap gagal" if is_indonesian else "Swap transaction failed"
         )
+        result["timings"] = timings.as_dict()
         
         return result
 
+    async def eksekusi_async(self, journal_path: str = None):
+        """Versi async dari `eksekusi`; flow sinkron yang sama dijalankan di thread pool."""
+        return await run_in_thread(self.eksekusi, journal_path)
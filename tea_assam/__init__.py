@@ -0,0 +1,49 @@
+"""Komponen bersama Tea Assam (provider, gas, nonce, receipt, multicall, dan lainnya).
+
+Submodule dan nama publiknya dimuat saat pertama kali diakses, sehingga
+`import tea_assam` (misalnya dari CLI) tidak ikut memuat web3.
+"""
+import importlib
+
+_SUBMODULES = (
+    "abi", "allowance", "async_engine", "cli", "gas", "indexer", "instrumentation", "journal",
+    "metadata_cache", "multicall", "nonce_manager", "presign", "providers", "quote", "rate_limit",
+    "receipts", "replacement", "routing", "snapshot",
+)
+
+_EXPORTS = {
+    "AllowanceManager": "allowance",
+    "GasOracle": "gas",
+    "Journal": "journal",
+    "MetadataCache": "metadata_cache",
+    "Multicall": "multicall",
+    "NonceManager": "nonce_manager",
+    "PairGraph": "routing",
+    "PresignPipeline": "presign",
+    "ProviderRegistry": "providers",
+    "QuoteEngine": "quote",
+    "ReceiptTracker": "receipts",
+    "ReserveIndexer": "indexer",
+    "RpcRecorder": "instrumentation",
+    "Snapshot": "snapshot",
+    "TxLifecycleManager": "replacement",
+    "get_contract": "abi",
+    "get_web3": "providers",
+    "take_snapshot": "snapshot",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module("{}.{}".format(__name__, name))
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module("{}.{}".format(__name__, _EXPORTS[name])), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES) | set(_EXPORTS))
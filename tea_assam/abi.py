@@ -0,0 +1,134 @@
+import json
+import threading
+import weakref
+
+from web3 import Web3
+
+ERC20_ABI = [
+    {"constant": True, "inputs": [], "name": "name", "outputs": [{"name": "", "type": "string"}], "payable": False, "stateMutability": "view", "type": "function"},
+    {"constant": True, "inputs": [], "name": "symbol", "outputs": [{"name": "", "type": "string"}], "payable": False, "stateMutability": "view", "type": "function"},
+    {"constant": True, "inputs": [], "name": "decimals", "outputs": [{"name": "", "type": "uint8"}], "payable": False, "stateMutability": "view", "type": "function"},
+    {"constant": True, "inputs": [], "name": "totalSupply", "outputs": [{"name": "", "type": "uint256"}], "payable": False, "stateMutability": "view", "type": "function"},
+    {"constant": True, "inputs": [{"name": "_owner", "type": "address"}], "name": "balanceOf", "outputs": [{"name": "balance", "type": "uint256"}], "payable": False, "stateMutability": "view", "type": "function"},
+    {"constant": True, "inputs": [{"name": "_owner", "type": "address"}, {"name": "_spender", "type": "address"}], "name": "allowance", "outputs": [{"name": "", "type": "uint256"}], "payable": False, "stateMutability": "view", "type": "function"},
+    {"constant": False, "inputs": [{"name": "spender", "type": "address"}, {"name": "value", "type": "uint256"}], "name": "approve", "outputs": [{"name": "", "type": "bool"}], "payable": False, "stateMutability": "nonpayable", "type": "function"},
+    {"constant": False, "inputs": [{"name": "_to", "type": "address"}, {"name": "_value", "type": "uint256"}], "name": "transfer", "outputs": [{"name": "", "type": "bool"}], "payable": False, "stateMutability": "nonpayable", "type": "function"},
+    {"constant": False, "inputs": [{"name": "_from", "type": "address"}, {"name": "_to", "type": "address"}, {"name": "_value", "type": "uint256"}], "name": "transferFrom", "outputs": [{"name": "", "type": "bool"}], "payable": False, "stateMutability": "nonpayable", "type": "function"}
+]
+
+WETH_ABI = ERC20_ABI + [
+    {"constant": False, "inputs": [], "name": "deposit", "outputs": [], "payable": True, "stateMutability": "payable", "type": "function"},
+    {"constant": False, "inputs": [{"name": "wad", "type": "uint256"}], "name": "withdraw", "outputs": [], "payable": False, "stateMutability": "nonpayable", "type": "function"}
+]
+
+FACTORY_ABI = [
+    {"inputs": [{"internalType": "address", "name": "tokenA", "type": "address"}, {"internalType": "address", "name": "tokenB", "type": "address"}], "name": "getPair", "outputs": [{"internalType": "address", "name": "pair", "type": "address"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "allPairsLength", "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}], "name": "allPairs", "outputs": [{"internalType": "address", "name": "", "type": "address"}], "stateMutability": "view", "type": "function"}
+]
+
+PAIR_ABI = ERC20_ABI + [
+    {"inputs": [], "name": "getReserves", "outputs": [{"internalType": "uint112", "name": "reserve0", "type": "uint112"}, {"internalType": "uint112", "name": "reserve1", "type": "uint112"}, {"internalType": "uint32", "name": "blockTimestampLast", "type": "uint32"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "token0", "outputs": [{"internalType": "address", "name": "", "type": "address"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "token1", "outputs": [{"internalType": "address", "name": "", "type": "address"}], "stateMutability": "view", "type": "function"}
+]
+
+BATCH_TRANSFER_ABI = [
+    {"inputs": [{"internalType": "address", "name": "token", "type": "address"}, {"internalType": "address[]", "name": "recipients", "type": "address[]"}, {"internalType": "uint256", "name": "amount", "type": "uint256"}], "name": "batchTransfer", "outputs": [], "stateMutability": "nonpayable", "type": "function"}
+]
+
+# Selector dihitung sekali saat modul dimuat.
+SELECTORS = {
+    name: bytes(Web3.keccak(text=signature)[:4])
+    for name, signature in (
+        ("transfer", "transfer(address,uint256)"),
+        ("approve", "approve(address,uint256)"),
+        ("balanceOf", "balanceOf(address)"),
+        ("allowance", "allowance(address,address)"),
+        ("batchTransfer", "batchTransfer(address,address[],uint256)"),
+    )
+}
+
+_contracts = weakref.WeakKeyDictionary()
+_contracts_lock = threading.Lock()
+
+
+def _canonical_abi(abi: list) -> str:
+    return json.dumps(abi, sort_keys=True, separators=(",", ":"))
+
+
+# Konstanta modul hidup selama proses, sehingga identitasnya tidak pernah dipakai ulang
+# objek lain; JSON kanoniknya cukup dihitung sekali.
+_CONSTANT_ABI_KEYS = {
+    id(abi): _canonical_abi(abi) for abi in (ERC20_ABI, WETH_ABI, FACTORY_ABI, PAIR_ABI, BATCH_TRANSFER_ABI)
+}
+
+
+def _abi_key(abi: list) -> str:
+    """Kunci cache ABI berdasarkan isinya (JSON kanonik), bukan `id()` yang bisa dipakai ulang setelah GC."""
+    key = _CONSTANT_ABI_KEYS.get(id(abi))
+    return key if key is not None else _canonical_abi(abi)
+
+
+def get_contract(web3, address: str = None, abi: list = ERC20_ABI):
+    """
+    Mengembalikan objek kontrak yang di-cache per (instance Web3, alamat, ABI).
+
+    ABI dikenali dari isinya, sehingga list yang dibuat ulang tetap memakai kontrak
+    yang sama; kunci konstanta ABI modul ini sudah dihitung sebelumnya.
+    """
+    key = (_abi_key(abi), address.lower() if address else None)
+    with _contracts_lock:
+        cache = _contracts.setdefault(web3, {})
+        contract = cache.get(key)
+        if contract is None:
+            if address is None:
+                contract = web3.eth.contract(abi=abi)
+            else:
+                contract = web3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
+            cache[key] = contract
+        return contract
+
+
+def _address_word(address: str) -> bytes:
+    value = bytes.fromhex(address[2:] if address[:2] in ("0x", "0X") else address)
+    if len(value) != 20:
+        raise ValueError("Alamat tidak valid: {}".format(address))
+    return b"\x00" * 12 + value
+
+
+def _uint_word(value: int) -> bytes:
+    if not 0 <= value < 2**256:
+        raise ValueError("Nilai di luar jangkauan uint256: {}".format(value))
+    return int(value).to_bytes(32, "big")
+
+
+def _hex(data: bytes) -> str:
+    return "0x" + data.hex()
+
+
+def encode_transfer(to: str, amount: int) -> str:
+    """Calldata `transfer(address,uint256)` tanpa melewati encoder ABI web3."""
+    return _hex(SELECTORS["transfer"] + _address_word(to) + _uint_word(amount))
+
+
+def encode_approve(spender: str, amount: int) -> str:
+    """Calldata `approve(address,uint256)`."""
+    return _hex(SELECTORS["approve"] + _address_word(spender) + _uint_word(amount))
+
+
+def encode_balance_of(owner: str) -> str:
+    """Calldata `balanceOf(address)`."""
+    return _hex(SELECTORS["balanceOf"] + _address_word(owner))
+
+
+def encode_allowance(owner: str, spender: str) -> str:
+    """Calldata `allowance(address,address)`."""
+    return _hex(SELECTORS["allowance"] + _address_word(owner) + _address_word(spender))
+
+
+def encode_batch_transfer(token: str, recipients: list, amount: int) -> str:
+    """Calldata `batchTransfer(address,address[],uint256)`; array dinamis ditaruh di bagian ekor."""
+    head = _address_word(token) + _uint_word(96) + _uint_word(amount)
+    tail = _uint_word(len(recipients)) + b"".join(_address_word(recipient) for recipient in recipients)
+    return _hex(SELECTORS["batchTransfer"] + head + tail)
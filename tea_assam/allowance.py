@@ -0,0 +1,91 @@
+import threading
+import time
+
+from tea_assam.abi import ERC20_ABI, get_contract
+
+MAX_UINT256 = 2**256 - 1
+
+
+class AllowanceManager:
+    """Cache allowance ERC-20 per (chain, owner, token, spender) untuk melewati approve yang tidak perlu.
+
+    Allowance dibaca dari jaringan, lalu diperbarui secara lokal setiap kali approve
+    terkonfirmasi atau allowance terpakai oleh swap/transfer. Nilai di cache hanya
+    dipercaya selama `ttl` detik karena allowance bisa berubah di luar proses ini
+    (approve/revoke dari dompet lain); setelah itu dibaca ulang dari jaringan.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, ttl: float = 60):
+        """
+        Args:
+            ttl (float): Lama (detik) allowance di cache dipakai sebelum dibaca ulang.
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._allowances = {}
+
+    @classmethod
+    def default(cls):
+        """Mengembalikan AllowanceManager bersama untuk seluruh proses."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @staticmethod
+    def _key(chain_id: int, token: str, owner: str, spender: str) -> tuple:
+        return (chain_id, owner.lower(), token.lower(), spender.lower())
+
+    def _store(self, key: tuple, allowance: int):
+        self._allowances[key] = (allowance, time.monotonic())
+
+    def get(self, web3, chain_id: int, token: str, owner: str, spender: str, refresh: bool = False) -> int:
+        """Mengembalikan allowance (wei) dari cache selama belum kedaluwarsa, atau membacanya dari jaringan."""
+        key = self._key(chain_id, token, owner, spender)
+        with self._lock:
+            entry = self._allowances.get(key)
+            if not refresh and entry is not None and time.monotonic() - entry[1] < self.ttl:
+                return entry[0]
+        token_contract = get_contract(web3, token, ERC20_ABI)
+        allowance = token_contract.functions.allowance(owner, spender).call()
+        with self._lock:
+            self._store(key, allowance)
+        return allowance
+
+    def required_approval(self, web3, chain_id: int, token: str, owner: str, spender: str, amount: int, approve_amount: int = None):
+        """
+        Menentukan apakah approve perlu dikirim.
+
+        Args:
+            amount (int): Jumlah (wei) yang akan dipakai spender.
+            approve_amount (int): Allowance lebih besar yang diberikan sekali saja,
+                misalnya `MAX_UINT256`; default sama dengan `amount`.
+
+        Returns:
+            int atau None: Nilai yang perlu di-approve, atau None jika allowance sudah cukup.
+        """
+        if self.get(web3, chain_id, token, owner, spender) >= amount:
+            return None
+        return max(amount, approve_amount or 0)
+
+    def record_approval(self, chain_id: int, token: str, owner: str, spender: str, amount: int):
+        """Mencatat allowance baru setelah approve terkonfirmasi."""
+        with self._lock:
+            self._store(self._key(chain_id, token, owner, spender), amount)
+
+    def consume(self, chain_id: int, token: str, owner: str, spender: str, amount: int):
+        """Mengurangi allowance di cache setelah dipakai oleh spender."""
+        key = self._key(chain_id, token, owner, spender)
+        with self._lock:
+            entry = self._allowances.get(key)
+            if entry is not None and entry[0] != MAX_UINT256:
+                # Umur entri tidak diperbarui: pengurangan lokal bukan pembacaan baru.
+                self._allowances[key] = (max(0, entry[0] - amount), entry[1])
+
+    def invalidate(self, chain_id: int, token: str, owner: str, spender: str):
+        """Menghapus allowance dari cache agar dibaca ulang dari jaringan, misalnya setelah transaksi gagal."""
+        with self._lock:
+            self._allowances.pop(self._key(chain_id, token, owner, spender), None)
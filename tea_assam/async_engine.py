@@ -0,0 +1,154 @@
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from web3 import AsyncWeb3
+
+from tea_assam.instrumentation import RpcRecorder
+from tea_assam.providers import DEFAULT_POOL_SIZE, DEFAULT_RPC_URL, rpc_error
+
+DEFAULT_MAX_WORKERS = 8
+
+_session = None
+_session_loop = None
+_web3_instances = {}
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class RecordingAsyncHTTPProvider(AsyncWeb3.AsyncHTTPProvider):
+    """AsyncHTTPProvider yang mencatat latensi dan error setiap request ke RpcRecorder.
+
+    Ukuran payload tidak dicatat karena encoding request/response aiohttp tidak lewat
+    provider ini.
+    """
+
+    def _record(self, method, start, response=None, error=None, batch_size=None):
+        RpcRecorder.default().record(
+            method, time.perf_counter() - start,
+            error=error if error is not None else rpc_error(response),
+            endpoint=self.endpoint_uri, batch_size=batch_size,
+        )
+
+    async def make_request(self, method, params):
+        start = time.perf_counter()
+        try:
+            response = await super().make_request(method, params)
+        except Exception as e:
+            self._record(method, start, error=e)
+            raise
+        self._record(method, start, response)
+        return response
+
+    async def make_batch_request(self, batch_requests):
+        start = time.perf_counter()
+        try:
+            response = await super().make_batch_request(batch_requests)
+        except Exception as e:
+            self._record("batch", start, error=e, batch_size=len(batch_requests))
+            raise
+        self._record("batch", start, response, batch_size=len(batch_requests))
+        return response
+
+
+async def get_session(pool_size: int = DEFAULT_POOL_SIZE):
+    """Mengembalikan satu `aiohttp.ClientSession` bersama untuk event loop yang sedang berjalan."""
+    global _session, _session_loop
+    # aiohttp hanya dimuat saat jalur async benar-benar dipakai.
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=pool_size))
+        _session_loop = loop
+        _web3_instances.clear()
+    return _session
+
+
+async def get_async_web3(rpc_url: str = DEFAULT_RPC_URL):
+    """
+    Mengembalikan instance AsyncWeb3 untuk `rpc_url` yang memakai session bersama.
+
+    Instance dibuat sekali per URL dan dicek koneksinya saat pertama kali dibuat.
+    """
+    session = await get_session()
+    web3 = _web3_instances.get(rpc_url)
+    if web3 is None:
+        provider = RecordingAsyncHTTPProvider(rpc_url)
+        await provider.cache_async_session(session)
+        web3 = AsyncWeb3(provider)
+        if not await web3.is_connected():
+            raise Exception("Gagal terhubung ke jaringan")
+        _web3_instances[rpc_url] = web3
+    return web3
+
+
+async def close_session():
+    """Menutup session bersama beserta semua koneksinya."""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+    _web3_instances.clear()
+
+
+async def gather_limited(coros, limit: int = 10):
+    """Menjalankan banyak coroutine sekaligus dengan jumlah konkuren maksimal `limit`."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _bounded(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(_bounded(coro) for coro in coros), return_exceptions=True)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Thread pool khusus entry point async, dibuat sekali untuk seluruh proses.
+
+    Ukurannya membatasi jumlah flow yang berjalan bersamaan: TEA_ASSAM_ASYNC_WORKERS
+    atau `DEFAULT_MAX_WORKERS`, dan bisa diubah dengan `set_max_workers`.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = int(os.environ.get("TEA_ASSAM_ASYNC_WORKERS", DEFAULT_MAX_WORKERS))
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tea-assam-async")
+        return _executor
+
+
+def set_max_workers(max_workers: int):
+    """Mengganti thread pool entry point async; flow yang sedang berjalan tetap diselesaikan."""
+    global _executor
+    with _executor_lock:
+        old, _executor = _executor, ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tea-assam-async")
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+async def run_in_thread(fn, *args, **kwargs):
+    """
+    Menjalankan fungsi sinkron di thread pool `get_executor()` tanpa memblokir event loop.
+
+    Entry point async pada flow pengiriman memakai ini agar nonce, gas, allowance,
+    jurnal, receipt, dan penggantian transaksi tetap lewat jalur sinkron yang sama.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(fn, *args, **kwargs))
+
+
+def run_sync(coro):
+    """Menjalankan coroutine dari kode sinkron dan menutup session setelah selesai."""
+
+    async def _main():
+        try:
+            return await coro
+        finally:
+            await close_session()
+
+    return asyncio.run(_main())
@@ -0,0 +1,219 @@
+"""Entry point `tea-assam` untuk semua flow.
+
+Modul ini sengaja hanya memuat pustaka standar; web3 dan kelas flow diimpor di
+dalam handler subcommand, sehingga `--help` dan subcommand ringan tidak
+membayar biaya import yang tidak dipakai.
+
+Contoh:
+    tea-assam dex-check --token-default 0x... --token 0x...
+    TEA_ASSAM_PRIVATE_KEY=0x... tea-assam transfer --token 0x... --amount 1 --recipients-file addresses.txt
+"""
+import argparse
+import json
+import os
+import sys
+
+from tea_assam.jobs import DEFAULT_KEY_ENV, JobRunner, JsonlSink, has_failed
+
+
+def _configure_rpc(args):
+    if args.rpc_url:
+        from tea_assam.providers import DEFAULT_CHAIN_ID, ProviderRegistry
+        ProviderRegistry.default().configure(DEFAULT_CHAIN_ID, args.rpc_url)
+
+
+def _configure_replacement(args):
+    if args.replace_stuck:
+        # Dibaca oleh Journal dan flow transfer saat `replace_stuck` tidak diisi.
+        os.environ["TEA_ASSAM_REPLACE_STUCK"] = "1"
+
+
+def _credentials(args) -> tuple:
+    """Mengembalikan (private key, alamat); kunci dibaca dari environment, bukan argumen."""
+    private_key = os.environ.get(args.key_env)
+    if not private_key:
+        raise SystemExit("Private key tidak ditemukan di environment {}".format(args.key_env))
+    address = args.address
+    if address is None:
+        from eth_account import Account
+        address = Account.from_key(private_key).address
+    return private_key, address
+
+
+def _recipients(args) -> list:
+    from transfer_token.batch_transfer import iter_recipients
+
+    recipients = list(iter_recipients(args.recipients))
+    if args.recipients_file:
+        recipients.extend(iter_recipients(args.recipients_file))
+    if not recipients:
+        raise SystemExit("Tidak ada penerima; berikan alamat atau --recipients-file")
+    return recipients
+
+
+def cmd_transfer(args):
+    from transfer_token.transfer import TransferToken
+
+    private_key, address = _credentials(args)
+    transfer = TransferToken(private_key, address, args.token, args.gas_price, _recipients(args), batch_rpc=args.batch_rpc)
+    return transfer.transfer(args.amount, pipeline=args.pipeline, presign=args.presign, workers=args.workers)
+
+
+def cmd_batch_transfer(args):
+    from transfer_token.batch_transfer import TeaAssamBatchTransfer
+
+    private_key, address = _credentials(args)
+    if args.recipients_file and not args.recipients:
+        # Daftar dari file dibaca secara streaming dan dipecah per chunk.
+        batch = TeaAssamBatchTransfer(
+            private_key, address, [], args.amount, args.token, args.priority_fee, args.max_fee,
+            approve_amount=args.approve_amount, batch_rpc=args.batch_rpc
+        )
+        return batch.run_stream(args.recipients_file, checkpoint_path=args.checkpoint, max_chunk_size=args.max_chunk_size)
+    batch = TeaAssamBatchTransfer(
+        private_key, address, _recipients(args), args.amount, args.token, args.priority_fee, args.max_fee,
+        approve_amount=args.approve_amount, batch_rpc=args.batch_rpc
+    )
+    return batch.run()
+
+
+def cmd_swap_in(args):
+    from swaps_tokens.tea_to_contract import TeaToContract
+
+    private_key, address = _credentials(args)
+    swap = TeaToContract(
+        private_key, address, args.amount, args.token, args.gas_price, approve_amount=args.approve_amount,
+        slippage=args.slippage, max_hops=args.max_hops, batch_rpc=args.batch_rpc
+    )
+    return swap.eksekusi(journal_path=args.journal)
+
+
+def cmd_swap_out(args):
+    from swaps_tokens.contract_to_tea import ContractToTea
+
+    private_key, address = _credentials(args)
+    swap = ContractToTea(
+        private_key, address, args.gas_price, args.token, args.amount, approve_amount=args.approve_amount,
+        slippage=args.slippage, max_hops=args.max_hops, batch_rpc=args.batch_rpc
+    )
+    return swap.eksekusi_swap(journal_path=args.journal)
+
+
+def cmd_add_liquidity(args):
+    from swaps_tokens.add_liquidity import LiquidityManager
+
+    private_key, address = _credentials(args)
+    manager = LiquidityManager(
+        address, private_key, args.gas_price, args.token, args.amount, approve_amount=args.approve_amount,
+        batch_rpc=args.batch_rpc
+    )
+    return manager.main_add_liquidity(journal_path=args.journal)
+
+
+def cmd_dex_check(args):
+    from swaps_tokens.DexChecker import DexChecker
+
+    if args.scan:
+        return DexChecker.scan_factory(args.start, args.limit)
+    if not (args.token_default and args.token):
+        raise SystemExit("dex-check membutuhkan --token-default dan --token (atau --scan)")
+    return DexChecker(args.token_default, args.token).details()
+
+
+def cmd_run(args):
+    sink = JsonlSink(args.output)
+    try:
+        records = JobRunner.from_file(args.plan, sink, args.max_workers).run()
+    finally:
+        sink.close()
+    return {job_id: {"status": record["status"]} for job_id, record in records.items()}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="tea-assam", description="Tool transfer, swap dan likuiditas Tea Assam.")
+    parser.add_argument("--rpc-url", action="append",
+                        help="URL RPC; bisa diulang untuk failover (default: TEA_ASSAM_RPC_URL atau RPC publik)")
+    parser.add_argument("--replace-stuck", action="store_true",
+                        help="Kirim ulang transaksi yang tertahan dengan nonce sama dan fee lebih tinggi")
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+
+    account = argparse.ArgumentParser(add_help=False)
+    account.add_argument("--address", help="Alamat pengirim (default: diturunkan dari private key)")
+    account.add_argument("--key-env", default=DEFAULT_KEY_ENV,
+                         help="Nama environment variable berisi private key (default: %(default)s)")
+    account.add_argument("--batch-rpc", action="store_true", help="Gabungkan request bersamaan menjadi JSON-RPC batch")
+
+    gas = argparse.ArgumentParser(add_help=False)
+    gas.add_argument("--gas-price", type=float, default=2, help="Harga gas dalam Gwei (default: %(default)s)")
+
+    recipients = argparse.ArgumentParser(add_help=False)
+    recipients.add_argument("recipients", nargs="*", help="Alamat penerima")
+    recipients.add_argument("--recipients-file", help="File penerima (.txt, .csv atau .jsonl)")
+
+    swap = argparse.ArgumentParser(add_help=False)
+    swap.add_argument("--token", required=True, help="Alamat token kontrak")
+    swap.add_argument("--amount", type=float, required=True)
+    swap.add_argument("--approve-amount", type=int, help="Allowance (wei) yang diberikan sekali, opsional")
+    swap.add_argument("--journal", help="File jurnal JSONL untuk melanjutkan flow yang terhenti")
+
+    sub = subparsers.add_parser("transfer", parents=[account, gas, recipients], help="Transfer token ke setiap penerima")
+    sub.add_argument("--token", required=True, help="Alamat token kontrak")
+    sub.add_argument("--amount", type=float, required=True, help="Jumlah token per penerima")
+    sub.add_argument("--pipeline", action="store_true", help="Kirim semua transaksi dulu, lalu tunggu receipt")
+    sub.add_argument("--presign", action="store_true", help="Tandatangani semua transaksi di muka secara paralel")
+    sub.add_argument("--workers", type=int, help="Jumlah proses penandatangan untuk --presign")
+    sub.set_defaults(handler=cmd_transfer)
+
+    sub = subparsers.add_parser("batch-transfer", parents=[account, recipients],
+                                help="Transfer token ke banyak penerima lewat kontrak batch")
+    sub.add_argument("--token", required=True, help="Alamat token kontrak")
+    sub.add_argument("--amount", type=float, required=True, help="Jumlah token per penerima")
+    sub.add_argument("--max-fee", default="2000", help="maxFeePerGas dalam Gwei (default: %(default)s)")
+    sub.add_argument("--priority-fee", default="1800", help="maxPriorityFeePerGas dalam Gwei (default: %(default)s)")
+    sub.add_argument("--approve-amount", type=int, help="Allowance (wei) yang diberikan sekali, opsional")
+    sub.add_argument("--checkpoint", help="File checkpoint untuk --recipients-file (melanjutkan proses)")
+    sub.add_argument("--max-chunk-size", type=int, default=500, help="Maksimal penerima per transaksi")
+    sub.set_defaults(handler=cmd_batch_transfer)
+
+    for name, handler, help_text in (
+        ("swap-in", cmd_swap_in, "Swap TEA ke token kontrak"),
+        ("swap-out", cmd_swap_out, "Swap token kontrak ke TEA"),
+    ):
+        sub = subparsers.add_parser(name, parents=[account, gas, swap], help=help_text)
+        sub.add_argument("--slippage", type=float, default=0.005, help="Toleransi slippage (default: %(default)s)")
+        sub.add_argument("--max-hops", type=int, default=3, help="Maksimal hop rute (default: %(default)s)")
+        sub.set_defaults(handler=handler)
+
+    sub = subparsers.add_parser("add-liquidity", parents=[account, gas, swap], help="Tambah likuiditas token/WTEA")
+    sub.set_defaults(handler=cmd_add_liquidity)
+
+    sub = subparsers.add_parser("dex-check", help="Cek pair dan reserve di DEX")
+    sub.add_argument("--token-default", help="Alamat token pertama (misalnya WTEA)")
+    sub.add_argument("--token", help="Alamat token kontrak")
+    sub.add_argument("--scan", action="store_true", help="Snapshot pair yang terdaftar di factory")
+    sub.add_argument("--start", type=int, default=0, help="Indeks pair pertama untuk --scan")
+    sub.add_argument("--limit", type=int, help="Jumlah pair untuk --scan")
+    sub.set_defaults(handler=cmd_dex_check)
+
+    sub = subparsers.add_parser("run", help="Jalankan rencana job (YAML/JSON) secara paralel")
+    sub.add_argument("plan", help="File rencana .yaml/.yml atau .json")
+    sub.add_argument("--output", default="-", help="File JSONL hasil per job (default: stdout)")
+    sub.add_argument("--max-workers", type=int, help="Jumlah job bersamaan (default: dari rencana atau 4)")
+    sub.set_defaults(handler=cmd_run)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    _configure_rpc(args)
+    _configure_replacement(args)
+    result = args.handler(args)
+    # Hasil `run` ke stdout sudah berupa JSONL; ringkasan tidak dicetak agar tetap bisa di-parse.
+    if not (args.handler is cmd_run and args.output == "-"):
+        json.dump(result, sys.stdout, indent=2, default=str)
+        sys.stdout.write("\n")
+    return 1 if has_failed(result) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
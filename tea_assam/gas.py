@@ -0,0 +1,158 @@
+import statistics
+import threading
+import time
+
+# Selisih gas terburuk satu slot storage: akses slot dingin (2100) + SSTORE nol→bukan nol (20000).
+COLD_SSTORE_GAS = 22100
+
+
+class GasOracle:
+    """Strategi gas bersama untuk semua jalur pengiriman transaksi.
+
+    Biaya diambil dari `eth_feeHistory` (persentil priority fee) untuk mode EIP-1559,
+    atau dari `eth_gasPrice` untuk mode legacy. Harga tetap bisa diberikan lewat
+    `gas_price` (legacy) atau `max_fee_per_gas`/`max_priority_fee_per_gas` (EIP-1559).
+
+    Batas gas dihitung dari `estimate_gas` dengan margin keamanan dan di-cache per
+    chain dan bentuk panggilan (kontrak, selector, panjang calldata) untuk seluruh proses.
+    Gas panggilan berbentuk sama tetap bergantung pada state (misalnya transfer ke
+    penerima baru menulis slot saldo dari nol), jadi estimasi dari cache hanya batas
+    bawah dan ditambah `cold_storage_gas` sebelum diberi margin. Panggilan yang bisa
+    menulis banyak slot baru (misalnya batch transfer) sebaiknya memakai `use_cache=False`.
+    """
+
+    _gas_cache = {}
+    _gas_cache_lock = threading.Lock()
+
+    def __init__(self, web3, mode: str = "auto", gas_price: int = None, max_fee_per_gas: int = None,
+                 max_priority_fee_per_gas: int = None, percentile: float = 50, block_count: int = 10,
+                 gas_margin: float = 1.2, fee_ttl: float = 3, cold_storage_gas: int = COLD_SSTORE_GAS):
+        """
+        Inisialisasi kelas GasOracle.
+
+        Args:
+            web3 (Web3): Koneksi Web3.
+            mode (str): "auto", "eip1559", atau "legacy". Mode "auto" memakai EIP-1559
+                jika jaringan mendukung `eth_feeHistory`, selain itu legacy.
+            gas_price (int): Harga gas legacy tetap dalam wei (opsional).
+            max_fee_per_gas (int): maxFeePerGas tetap dalam wei (opsional).
+            max_priority_fee_per_gas (int): maxPriorityFeePerGas tetap dalam wei (opsional).
+            percentile (float): Persentil priority fee dari fee history.
+            block_count (int): Jumlah blok yang dipakai untuk fee history.
+            gas_margin (float): Pengali hasil `estimate_gas`, juga saat estimasi dipakai ulang.
+            fee_ttl (float): Lama (detik) biaya hasil estimasi dipakai ulang.
+            cold_storage_gas (int): Tambahan gas untuk estimasi dari cache, menutup satu
+                slot storage yang ditulis dari nol oleh panggilan berikutnya.
+        """
+        if gas_price is not None:
+            mode = "legacy"
+        elif max_fee_per_gas is not None:
+            mode = "eip1559"
+        if mode not in ("auto", "eip1559", "legacy"):
+            raise ValueError("Mode gas tidak dikenal: {}".format(mode))
+
+        self.web3 = web3
+        self.mode = mode
+        self.gas_price = gas_price
+        self.max_fee_per_gas = max_fee_per_gas
+        self.max_priority_fee_per_gas = max_priority_fee_per_gas
+        self.percentile = percentile
+        self.block_count = block_count
+        self.gas_margin = gas_margin
+        self.fee_ttl = fee_ttl
+        self.cold_storage_gas = cold_storage_gas
+
+        self._lock = threading.Lock()
+        self._fees = None
+        self._fees_time = 0
+        self._chain_id = None
+
+    def fee_params(self) -> dict:
+        """Mengembalikan field biaya (`gasPrice` atau `maxFeePerGas`/`maxPriorityFeePerGas`)."""
+        if self.gas_price is not None:
+            return {"gasPrice": self.gas_price}
+        if self.max_fee_per_gas is not None:
+            priority = self.max_priority_fee_per_gas
+            if priority is None:
+                priority = min(self.max_fee_per_gas, self.web3.eth.max_priority_fee)
+            return {"maxFeePerGas": self.max_fee_per_gas, "maxPriorityFeePerGas": priority}
+
+        with self._lock:
+            if self._fees is not None and time.time() - self._fees_time < self.fee_ttl:
+                return dict(self._fees)
+        fees = self._estimate_fees()
+        with self._lock:
+            self._fees = fees
+            self._fees_time = time.time()
+        return dict(fees)
+
+    def _estimate_fees(self) -> dict:
+        if self.mode in ("auto", "eip1559"):
+            try:
+                history = self.web3.eth.fee_history(self.block_count, "latest", [self.percentile])
+                base_fee = history["baseFeePerGas"][-1]
+                rewards = [reward[0] for reward in history["reward"] if reward]
+                if base_fee:
+                    priority = int(statistics.median(rewards)) if rewards else self.web3.eth.max_priority_fee
+                    return {"maxFeePerGas": base_fee * 2 + priority, "maxPriorityFeePerGas": priority}
+            except Exception:
+                if self.mode == "eip1559":
+                    raise
+        return {"gasPrice": self.web3.eth.gas_price}
+
+    def _shape(self, tx: dict) -> tuple:
+        data = tx.get("data") or "0x"
+        if isinstance(data, (bytes, bytearray)):
+            data = "0x" + bytes(data).hex()
+        chain_id = tx.get("chainId")
+        if chain_id is None:
+            if self._chain_id is None:
+                self._chain_id = self.web3.eth.chain_id
+            chain_id = self._chain_id
+        # Chain id ikut di kunci: estimasi dari satu jaringan tidak berlaku di jaringan lain.
+        return (chain_id, str(tx.get("to", "")).lower(), data[:10], len(data))
+
+    def gas_limit(self, tx: dict, use_cache: bool = True) -> int:
+        """Menghitung batas gas dari `estimate_gas` dengan margin, di-cache per bentuk panggilan."""
+        shape = self._shape(tx)
+        if use_cache:
+            with self._gas_cache_lock:
+                estimate = self._gas_cache.get(shape)
+            if estimate is not None:
+                # Estimasi lama bisa berasal dari panggilan yang hanya menulis slot hangat.
+                return int((estimate + self.cold_storage_gas) * self.gas_margin)
+
+        estimate_tx = {key: tx[key] for key in ("from", "to", "data", "value") if key in tx}
+        estimate = self.web3.eth.estimate_gas(estimate_tx)
+        with self._gas_cache_lock:
+            self._gas_cache[shape] = max(estimate, self._gas_cache.get(shape, 0))
+        return int(estimate * self.gas_margin)
+
+    def _fees_for(self, params: dict) -> dict:
+        fee_fields = ("gasPrice", "maxFeePerGas", "maxPriorityFeePerGas")
+        return {} if any(field in params for field in fee_fields) else self.fee_params()
+
+    def build(self, contract_function, params: dict, use_cache: bool = True) -> dict:
+        """
+        Membangun transaksi dengan biaya dari oracle dan batas gas hasil estimasi.
+
+        Field `gas` atau biaya yang sudah ada di `params` tidak ditimpa.
+        """
+        has_gas = "gas" in params
+        # `gas` sementara diisi agar web3 tidak melakukan estimasi sendiri.
+        tx = contract_function.build_transaction({**self._fees_for(params), "gas": 0, **params})
+        if not has_gas:
+            tx["gas"] = self.gas_limit(tx, use_cache)
+        return tx
+
+    def complete(self, tx: dict, use_cache: bool = True) -> dict:
+        """
+        Melengkapi transaksi mentah (`to`/`data` sudah di-encode) dengan biaya dan batas gas.
+
+        Jalur cepat untuk loop panas: tidak melewati `build_transaction` web3. Field
+        yang sudah ada di `tx` tidak ditimpa; `value` diisi 0 jika belum ada.
+        """
+        tx = {**self._fees_for(tx), "value": 0, **tx}
+        if "gas" not in tx:
+            tx["gas"] = self.gas_limit(tx, use_cache)
+        return tx
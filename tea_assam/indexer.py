@@ -0,0 +1,221 @@
+import sqlite3
+import threading
+
+from tea_assam.routing import SYNC_TOPIC, decode_words
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reserves (
+    pair TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    reserve0 TEXT NOT NULL,
+    reserve1 TEXT NOT NULL,
+    PRIMARY KEY (pair, block_number, log_index)
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    block_number INTEGER PRIMARY KEY,
+    block_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class ReserveIndexer:
+    """Indexer reserve pair Uniswap V2 dari event `Sync`, disimpan di SQLite.
+
+    Backfill awal memakai `eth_getLogs` dengan ukuran rentang blok yang
+    menyesuaikan diri (diperkecil saat node menolak, diperbesar saat berhasil),
+    lalu indexer mengikuti blok baru. Hash blok terakhir disimpan sehingga reorg
+    terdeteksi dan data setelah blok percabangan dihapus. Pembacaan reserve dan
+    riwayatnya menjadi query lokal.
+
+    Reserve disimpan sebagai teks karena uint112 melebihi batas INTEGER SQLite.
+    """
+
+    def __init__(self, web3, path: str = ":memory:", pairs: list = None, start_block: int = 0,
+                 confirmations: int = 0, initial_range: int = 2000, min_range: int = 10,
+                 max_range: int = 50000, reorg_depth: int = 64):
+        """
+        Inisialisasi kelas ReserveIndexer.
+
+        Args:
+            web3 (Web3): Koneksi Web3.
+            path (str): Lokasi file SQLite; default di memori.
+            pairs (list): Alamat pair yang diindeks; None untuk semua event `Sync`.
+            start_block (int): Blok awal backfill jika database masih kosong.
+            confirmations (int): Jumlah blok di belakang blok terbaru yang diindeks.
+            initial_range (int): Ukuran awal rentang blok per `eth_getLogs`.
+            min_range (int): Ukuran rentang terkecil sebelum error diteruskan.
+            max_range (int): Ukuran rentang terbesar.
+            reorg_depth (int): Jumlah hash blok terakhir yang disimpan untuk deteksi reorg.
+        """
+        self.web3 = web3
+        self.pairs = [web3.to_checksum_address(pair) for pair in pairs] if pairs else None
+        self.start_block = start_block
+        self.confirmations = confirmations
+        self.range = initial_range
+        self.min_range = min_range
+        self.max_range = max_range
+        self.reorg_depth = reorg_depth
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._thread = None
+        self._stop = threading.Event()
+
+    def close(self):
+        self.stop()
+        with self._lock:
+            self._db.close()
+
+    # --- state ---
+
+    def last_block(self):
+        """Blok terakhir yang sudah diindeks, atau None jika belum ada."""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM state WHERE key = 'last_block'").fetchone()
+        return int(row[0]) if row else None
+
+    def is_synced(self, head: int, max_lag: int = None) -> bool:
+        """
+        Menentukan apakah data indexer cukup baru dibandingkan blok terbaru jaringan.
+
+        Args:
+            head (int): Nomor blok terbaru jaringan.
+            max_lag (int): Selisih blok maksimal yang masih diterima; default `confirmations`.
+        """
+        last = self.last_block()
+        if max_lag is None:
+            max_lag = self.confirmations
+        return last is not None and head - last <= max_lag
+
+    def _set_last_block(self, block_number: int, block_hash: str):
+        self._db.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('last_block', ?)", (str(block_number),))
+        self._db.execute("INSERT OR REPLACE INTO blocks (block_number, block_hash) VALUES (?, ?)", (block_number, block_hash))
+        self._db.execute("DELETE FROM blocks WHERE block_number < ?", (block_number - self.reorg_depth,))
+
+    # --- indexing ---
+
+    def _handle_reorg(self) -> bool:
+        """Mencari blok percabangan jika hash blok terakhir berubah, lalu menghapus data setelahnya."""
+        with self._lock:
+            rows = self._db.execute("SELECT block_number, block_hash FROM blocks ORDER BY block_number DESC").fetchall()
+        if not rows:
+            return False
+        for index, (block_number, block_hash) in enumerate(rows):
+            if self.web3.to_hex(self.web3.eth.get_block(block_number)["hash"]) == block_hash:
+                if index == 0:
+                    return False
+                self.rollback(block_number)
+                return True
+        # Reorg lebih dalam dari hash yang disimpan: mulai ulang dari blok tertua yang diketahui.
+        self.rollback(rows[-1][0] - 1)
+        return True
+
+    def rollback(self, block_number: int):
+        """Menghapus semua data setelah `block_number`."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM reserves WHERE block_number > ?", (block_number,))
+            self._db.execute("DELETE FROM blocks WHERE block_number > ?", (block_number,))
+            self._db.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('last_block', ?)", (str(block_number),))
+
+    def _fetch_logs(self, from_block: int, to_block: int):
+        log_filter = {"fromBlock": from_block, "toBlock": to_block, "topics": [SYNC_TOPIC]}
+        if self.pairs:
+            log_filter["address"] = self.pairs
+        return self.web3.eth.get_logs(log_filter)
+
+    def _store_logs(self, logs, to_block: int, block_hash: str):
+        rows = []
+        for log in logs:
+            if log.get("removed"):
+                continue
+            reserve0, reserve1 = decode_words(log["data"])[:2]
+            rows.append((log["address"].lower(), log["blockNumber"], log["logIndex"], str(reserve0), str(reserve1)))
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO reserves VALUES (?, ?, ?, ?, ?)", rows)
+            self._set_last_block(to_block, block_hash)
+        return len(rows)
+
+    def run_once(self) -> int:
+        """
+        Mengindeks dari blok terakhir sampai blok terbaru (dikurangi `confirmations`).
+
+        Returns:
+            int: Jumlah event `Sync` yang disimpan.
+        """
+        self._handle_reorg()
+        head = self.web3.eth.block_number - self.confirmations
+        last = self.last_block()
+        start = self.start_block if last is None else last + 1
+        stored = 0
+        while start <= head:
+            end = min(start + self.range - 1, head)
+            try:
+                logs = self._fetch_logs(start, end)
+            except Exception:
+                # Node menolak rentang terlalu besar / hasil terlalu banyak: perkecil rentang.
+                if self.range <= self.min_range:
+                    raise
+                self.range = max(self.min_range, self.range // 2)
+                continue
+            block_hash = self.web3.to_hex(self.web3.eth.get_block(end)["hash"])
+            stored += self._store_logs(logs, end, block_hash)
+            self.range = min(self.max_range, self.range * 2)
+            start = end + 1
+        return stored
+
+    def start(self, poll_interval: float = 2.0):
+        """Menjalankan `run_once()` secara berkala di thread latar belakang."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.is_set():
+                try:
+                    self.run_once()
+                except Exception:
+                    pass  # error RPC sementara; dicoba lagi pada putaran berikutnya
+                self._stop.wait(poll_interval)
+
+        self._thread = threading.Thread(target=_run, name="ReserveIndexer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # --- query ---
+
+    def get_reserves(self, pair_address: str, block_number: int = None):
+        """
+        Reserve pair terakhir (atau pada `block_number`) dari database lokal.
+
+        Returns:
+            tuple atau None: `(reserve0, reserve1, block_number)`, atau None jika
+                belum ada event `Sync` untuk pair ini.
+        """
+        query = "SELECT reserve0, reserve1, block_number FROM reserves WHERE pair = ?"
+        params = [pair_address.lower()]
+        if block_number is not None:
+            query += " AND block_number <= ?"
+            params.append(block_number)
+        query += " ORDER BY block_number DESC, log_index DESC LIMIT 1"
+        with self._lock:
+            row = self._db.execute(query, params).fetchone()
+        return (int(row[0]), int(row[1]), row[2]) if row else None
+
+    def history(self, pair_address: str, from_block: int = 0, to_block: int = None) -> list:
+        """Riwayat reserve pair sebagai list `(block_number, reserve0, reserve1)`."""
+        query = "SELECT block_number, reserve0, reserve1 FROM reserves WHERE pair = ? AND block_number >= ?"
+        params = [pair_address.lower(), from_block]
+        if to_block is not None:
+            query += " AND block_number <= ?"
+            params.append(to_block)
+        query += " ORDER BY block_number, log_index"
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [(block_number, int(reserve0), int(reserve1)) for block_number, reserve0, reserve1 in rows]
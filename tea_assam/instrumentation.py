@@ -0,0 +1,214 @@
+import collections
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _MethodStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def add(self, latency, request_bytes, response_bytes, error):
+        self.count += 1
+        self.errors += 1 if error else 0
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.request_bytes += request_bytes or 0
+        self.response_bytes += response_bytes or 0
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                self.buckets[index] += 1
+
+
+class RpcRecorder:
+    """Pencatat semua request provider: method, latensi, ukuran payload dan error.
+
+    Statistik per method selalu dikumpulkan (biayanya kecil). Jejak per request
+    baru disimpan setelah `enable_trace()` dipanggil, dibatasi `max_events` event
+    terakhir. Hasilnya bisa diekspor sebagai teks Prometheus/OpenMetrics atau
+    sebagai dump JSON.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, max_events: int = 10000):
+        """
+        Inisialisasi kelas RpcRecorder.
+
+        Args:
+            max_events (int): Jumlah maksimal event jejak yang disimpan.
+        """
+        self._lock = threading.Lock()
+        self._stats = collections.defaultdict(_MethodStats)
+        self._events = collections.deque(maxlen=max_events)
+        self.trace_enabled = False
+
+    @classmethod
+    def default(cls):
+        """Mengembalikan RpcRecorder bersama untuk seluruh proses."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def enable_trace(self, max_events: int = None):
+        """Mulai menyimpan jejak per request (opsional dengan batas event baru)."""
+        with self._lock:
+            if max_events is not None:
+                self._events = collections.deque(self._events, maxlen=max_events)
+            self.trace_enabled = True
+
+    def disable_trace(self):
+        self.trace_enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._events.clear()
+
+    def record(self, method: str, latency: float, request_bytes: int = None, response_bytes: int = None,
+               error=None, endpoint: str = None, batch_size: int = None):
+        """Mencatat satu request; `error` berisi exception atau pesan error JSON-RPC."""
+        with self._lock:
+            self._stats[method].add(latency, request_bytes, response_bytes, error)
+            if self.trace_enabled:
+                event = {
+                    "time": time.time(),
+                    "method": method,
+                    "latency": latency,
+                    "request_bytes": request_bytes,
+                    "response_bytes": response_bytes,
+                    "endpoint": endpoint,
+                    "thread": threading.current_thread().name,
+                }
+                if batch_size is not None:
+                    event["batch_size"] = batch_size
+                if error:
+                    event["error"] = str(error)
+                self._events.append(event)
+
+    def stats(self) -> dict:
+        """Ringkasan per method: jumlah, error, latensi total/rata-rata/maksimal dan byte."""
+        with self._lock:
+            return {
+                method: {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "latency_total": stats.latency_sum,
+                    "latency_avg": stats.latency_sum / stats.count if stats.count else 0.0,
+                    "latency_max": stats.latency_max,
+                    "request_bytes": stats.request_bytes,
+                    "response_bytes": stats.response_bytes,
+                }
+                for method, stats in self._stats.items()
+            }
+
+    def events(self) -> list:
+        with self._lock:
+            return list(self._events)
+
+    def dump_trace(self, path: str):
+        """Menyimpan statistik dan jejak request ke file JSON."""
+        with open(path, "w") as f:
+            json.dump({"stats": self.stats(), "events": self.events()}, f, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Statistik dalam format teks Prometheus/OpenMetrics."""
+        with self._lock:
+            items = sorted(self._stats.items())
+            lines = [
+                "# TYPE tea_assam_rpc_requests counter",
+                "# HELP tea_assam_rpc_requests Jumlah request JSON-RPC per method.",
+            ]
+            lines += ['tea_assam_rpc_requests_total{{method="{}"}} {}'.format(m, s.count) for m, s in items]
+            lines += [
+                "# TYPE tea_assam_rpc_errors counter",
+                "# HELP tea_assam_rpc_errors Jumlah request JSON-RPC yang error per method.",
+            ]
+            lines += ['tea_assam_rpc_errors_total{{method="{}"}} {}'.format(m, s.errors) for m, s in items]
+            lines += [
+                "# TYPE tea_assam_rpc_latency_seconds histogram",
+                "# HELP tea_assam_rpc_latency_seconds Latensi request JSON-RPC per method.",
+            ]
+            for method, stats in items:
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    lines.append('tea_assam_rpc_latency_seconds_bucket{{method="{}",le="{}"}} {}'.format(method, bound, count))
+                lines.append('tea_assam_rpc_latency_seconds_bucket{{method="{}",le="+Inf"}} {}'.format(method, stats.count))
+                lines.append('tea_assam_rpc_latency_seconds_sum{{method="{}"}} {}'.format(method, stats.latency_sum))
+                lines.append('tea_assam_rpc_latency_seconds_count{{method="{}"}} {}'.format(method, stats.count))
+            for name, attribute in (("request", "request_bytes"), ("response", "response_bytes")):
+                lines += [
+                    "# TYPE tea_assam_rpc_{}_bytes counter".format(name),
+                    "# HELP tea_assam_rpc_{}_bytes Total ukuran payload {} per method.".format(name, name),
+                ]
+                lines += [
+                    'tea_assam_rpc_{}_bytes_total{{method="{}"}} {}'.format(name, m, getattr(s, attribute))
+                    for m, s in items
+                ]
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Menulis metrik ke file (misalnya untuk textfile collector node_exporter)."""
+        tmp_path = "{}.tmp".format(path)
+        with open(tmp_path, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def serve_metrics(self, port: int = 9464, host: str = "127.0.0.1"):
+        """Menjalankan endpoint HTTP `/metrics` di thread latar belakang; mengembalikan server."""
+        recorder = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = recorder.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/openmetrics-text; version=1.0.0; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=server.serve_forever, name="RpcMetrics", daemon=True).start()
+        return server
+
+
+class StepTimings:
+    """Pengukur waktu per langkah flow; hasilnya dipasang sebagai `timings` di dict hasil."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings = {}
+
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            self._timings[name] = self._timings.get(name, 0.0) + seconds
+
+    @contextmanager
+    def step(self, name: str):
+        """Mengukur blok `with` dan menambahkannya ke langkah `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def as_dict(self) -> dict:
+        """Waktu per langkah dalam detik, sesuai urutan langkah pertama kali diukur."""
+        with self._lock:
+            return {name: round(seconds, 6) for name, seconds in self._timings.items()}
@@ -0,0 +1,341 @@
+"""Job runner deklaratif: menjalankan rencana operasi (YAML/JSON) sebagai graf dependensi.
+
+Contoh rencana:
+
+    max_workers: 4
+    jobs:
+      - id: beli
+        op: swap_in
+        key_env: WALLET_A_KEY
+        params: {token: "0x...", amount: 5, journal: beli.jsonl}
+      - id: likuiditas
+        op: add_liquidity
+        key_env: WALLET_A_KEY
+        depends_on: [beli]
+        params: {token: "0x...", amount: 100}
+      - id: airdrop
+        op: batch_transfer
+        key_env: WALLET_B_KEY
+        params: {token: "0x...", amount: 1, recipients_file: addresses.txt}
+
+Job tanpa dependensi yang belum selesai dijalankan bersamaan, kecuali job dari
+pengirim yang sama: flow swap/likuiditas membaca nonce sendiri dari jaringan,
+jadi job satu pengirim tidak pernah berjalan bersamaan (yang lebih dulu siap
+dijalankan lebih dulu, sesuai urutan rencana). Langkah approve/wrap sudah ada
+di dalam setiap flow; `depends_on` dipakai untuk urutan antar-operasi
+(misalnya swap_in sebelum add_liquidity).
+
+Modul ini hanya memuat pustaka standar; kelas flow diimpor saat job dijalankan.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DEFAULT_KEY_ENV = "TEA_ASSAM_PRIVATE_KEY"
+
+
+def has_failed(result) -> bool:
+    """True jika ada langkah berstatus gagal/error di hasil flow."""
+    if isinstance(result, list):
+        return any(has_failed(item) for item in result)
+    if isinstance(result, dict):
+        for key, value in result.items():
+            if key.endswith("status") and isinstance(value, str) and (value == "gagal" or value.startswith("error")):
+                return True
+            if key != "timings" and isinstance(value, (dict, list)) and has_failed(value):
+                return True
+    return False
+
+
+def _recipients(params: dict) -> list:
+    from transfer_token.batch_transfer import iter_recipients
+
+    recipients = list(iter_recipients(params.get("recipients") or []))
+    if params.get("recipients_file"):
+        recipients.extend(iter_recipients(params["recipients_file"]))
+    if not recipients:
+        raise ValueError("Tidak ada penerima; isi `recipients` atau `recipients_file`")
+    return recipients
+
+
+def _op_transfer(params, private_key, address, rpc_urls):
+    from transfer_token.transfer import TransferToken
+
+    transfer = TransferToken(
+        private_key, address, params["token"], params.get("gas_price", 2), _recipients(params),
+        rpc_urls=rpc_urls, batch_rpc=params.get("batch_rpc", False)
+    )
+    return transfer.transfer(
+        params["amount"], pipeline=params.get("pipeline", False), presign=params.get("presign", False),
+        workers=params.get("workers")
+    )
+
+
+def _op_batch_transfer(params, private_key, address, rpc_urls):
+    from transfer_token.batch_transfer import TeaAssamBatchTransfer
+
+    stream = params.get("recipients_file") and not params.get("recipients")
+    batch = TeaAssamBatchTransfer(
+        private_key, address, [] if stream else _recipients(params), params["amount"], params["token"],
+        str(params.get("priority_fee", "1800")), str(params.get("max_fee", "2000")),
+        approve_amount=params.get("approve_amount"), rpc_urls=rpc_urls, batch_rpc=params.get("batch_rpc", False)
+    )
+    if stream:
+        return batch.run_stream(
+            params["recipients_file"], checkpoint_path=params.get("checkpoint"),
+            max_chunk_size=params.get("max_chunk_size", 500)
+        )
+    return batch.run()
+
+
+def _op_swap_in(params, private_key, address, rpc_urls):
+    from swaps_tokens.tea_to_contract import TeaToContract
+
+    swap = TeaToContract(
+        private_key, address, params["amount"], params["token"], params.get("gas_price", 2),
+        approve_amount=params.get("approve_amount"), rpc_urls=rpc_urls, slippage=params.get("slippage", 0.005),
+        max_hops=params.get("max_hops", 3), batch_rpc=params.get("batch_rpc", False)
+    )
+    return swap.eksekusi(journal_path=params.get("journal"))
+
+
+def _op_swap_out(params, private_key, address, rpc_urls):
+    from swaps_tokens.contract_to_tea import ContractToTea
+
+    swap = ContractToTea(
+        private_key, address, params.get("gas_price", 2), params["token"], params["amount"],
+        approve_amount=params.get("approve_amount"), rpc_urls=rpc_urls, slippage=params.get("slippage", 0.005),
+        max_hops=params.get("max_hops", 3), batch_rpc=params.get("batch_rpc", False)
+    )
+    return swap.eksekusi_swap(journal_path=params.get("journal"))
+
+
+def _op_add_liquidity(params, private_key, address, rpc_urls):
+    from swaps_tokens.add_liquidity import LiquidityManager
+
+    manager = LiquidityManager(
+        address, private_key, params.get("gas_price", 2), params["token"], params["amount"],
+        approve_amount=params.get("approve_amount"), rpc_urls=rpc_urls, batch_rpc=params.get("batch_rpc", False)
+    )
+    return manager.main_add_liquidity(journal_path=params.get("journal"))
+
+
+def _op_dex_check(params, private_key, address, rpc_urls):
+    from swaps_tokens.DexChecker import DexChecker
+
+    if params.get("scan"):
+        return DexChecker.scan_factory(params.get("start", 0), params.get("limit"))
+    return DexChecker(params["token_default"], params["token"], rpc_urls=rpc_urls).details()
+
+
+# op → (fungsi, butuh private key)
+OPERATIONS = {
+    "transfer": (_op_transfer, True),
+    "batch_transfer": (_op_batch_transfer, True),
+    "swap_in": (_op_swap_in, True),
+    "swap_out": (_op_swap_out, True),
+    "add_liquidity": (_op_add_liquidity, True),
+    "dex_check": (_op_dex_check, False),
+}
+
+
+class Job:
+    def __init__(self, job_id: str, op: str, params: dict = None, depends_on: list = None,
+                 key_env: str = DEFAULT_KEY_ENV, address: str = None, rpc_urls: list = None):
+        """
+        Inisialisasi kelas Job.
+
+        Args:
+            job_id (str): Id unik job di dalam rencana.
+            op (str): Nama operasi (lihat `OPERATIONS`).
+            params (dict): Parameter operasi.
+            depends_on (list): Id job yang harus sukses lebih dulu.
+            key_env (str): Environment variable berisi private key pengirim.
+            address (str): Alamat pengirim (default: diturunkan dari private key).
+            rpc_urls (list): URL RPC khusus job ini (opsional).
+        """
+        if op not in OPERATIONS:
+            raise ValueError("Operasi tidak dikenal di job {}: {}".format(job_id, op))
+        self.id = job_id
+        self.op = op
+        self.params = params or {}
+        self.depends_on = list(depends_on or [])
+        self.key_env = key_env
+        self.address = address
+        self.rpc_urls = [rpc_urls] if isinstance(rpc_urls, str) else rpc_urls
+
+    @property
+    def needs_key(self) -> bool:
+        return OPERATIONS[self.op][1]
+
+    @property
+    def sender(self):
+        """Kunci serialisasi nonce: job dengan private key sama tidak dijalankan bersamaan."""
+        if not self.needs_key:
+            return None
+        return os.environ.get(self.key_env) or self.key_env
+
+    def run(self):
+        private_key = address = None
+        if self.needs_key:
+            private_key = os.environ.get(self.key_env)
+            if not private_key:
+                raise ValueError("Private key tidak ditemukan di environment {}".format(self.key_env))
+            address = self.address
+            if address is None:
+                from eth_account import Account
+                address = Account.from_key(private_key).address
+        return OPERATIONS[self.op][0](self.params, private_key, address, self.rpc_urls)
+
+
+def load_plan(path: str) -> dict:
+    """Membaca rencana dari file JSON atau YAML (YAML memerlukan `pyyaml`)."""
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("Rencana YAML memerlukan pyyaml: pip install pyyaml") from e
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def parse_plan(plan: dict) -> list:
+    """Membuat daftar Job dari rencana dan memvalidasi id, dependensi serta siklus."""
+    jobs = []
+    for index, item in enumerate(plan.get("jobs") or []):
+        jobs.append(Job(
+            str(item.get("id", index)), item["op"], item.get("params"), item.get("depends_on"),
+            item.get("key_env", plan.get("key_env", DEFAULT_KEY_ENV)), item.get("address"),
+            item.get("rpc_urls", plan.get("rpc_urls"))
+        ))
+
+    by_id = {}
+    for job in jobs:
+        if job.id in by_id:
+            raise ValueError("Id job ganda: {}".format(job.id))
+        by_id[job.id] = job
+    for job in jobs:
+        for dependency in job.depends_on:
+            if dependency not in by_id:
+                raise ValueError("Job {} bergantung pada job yang tidak ada: {}".format(job.id, dependency))
+
+    # Deteksi siklus dengan DFS tiga warna.
+    state = {}
+
+    def visit(job_id, path):
+        if state.get(job_id) == "selesai":
+            return
+        if state.get(job_id) == "dikunjungi":
+            raise ValueError("Siklus dependensi: {}".format(" -> ".join(path + [job_id])))
+        state[job_id] = "dikunjungi"
+        for dependency in by_id[job_id].depends_on:
+            visit(dependency, path + [job_id])
+        state[job_id] = "selesai"
+
+    for job in jobs:
+        visit(job.id, [])
+    return jobs
+
+
+class JsonlSink:
+    """Menulis satu baris JSON per hasil job; `path` "-" berarti stdout."""
+
+    def __init__(self, path: str = "-"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = sys.stdout if path == "-" else open(path, "a")
+
+    def write(self, record: dict):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class JobRunner:
+    """Menjadwalkan job sesuai graf dependensi dengan konkurensi terbatas.
+
+    Job yang gagal membuat semua job turunannya dilewati (status "dilewati");
+    job lain tetap berjalan. Setiap hasil langsung ditulis ke sink.
+    """
+
+    def __init__(self, jobs: list, sink: JsonlSink = None, max_workers: int = 4):
+        """
+        Inisialisasi kelas JobRunner.
+
+        Args:
+            jobs (list): Daftar Job (lihat `parse_plan`).
+            sink (JsonlSink): Tujuan hasil per job (opsional).
+            max_workers (int): Jumlah job maksimal yang berjalan bersamaan.
+        """
+        self.jobs = jobs
+        self.sink = sink
+        self.max_workers = max_workers
+
+    @classmethod
+    def from_file(cls, path: str, sink: JsonlSink = None, max_workers: int = None):
+        plan = load_plan(path)
+        return cls(parse_plan(plan), sink, max_workers or plan.get("max_workers", 4))
+
+    def _emit(self, records: dict, record: dict):
+        records[record["job"]] = record
+        if self.sink is not None:
+            self.sink.write(record)
+
+    def _execute(self, job: Job) -> dict:
+        started = time.time()
+        record = {"job": job.id, "op": job.op, "started": started}
+        try:
+            result = job.run()
+            record["status"] = "gagal" if has_failed(result) else "sukses"
+            record["result"] = result
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = str(e)
+        record["duration"] = round(time.time() - started, 6)
+        return record
+
+    def run(self) -> dict:
+        """Menjalankan semua job dan mengembalikan `{id job: record}`."""
+        records = {}
+        pending = list(self.jobs)
+        busy_senders = set()
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for job in list(pending):
+                    statuses = [records[d]["status"] if d in records else None for d in job.depends_on]
+                    if any(status not in (None, "sukses") for status in statuses):
+                        pending.remove(job)
+                        failed = [d for d, status in zip(job.depends_on, statuses) if status not in (None, "sukses")]
+                        self._emit(records, {
+                            "job": job.id, "op": job.op, "status": "dilewati",
+                            "error": "Dependensi tidak sukses: {}".format(", ".join(failed))
+                        })
+                        continue
+                    if None in statuses or len(running) >= self.max_workers:
+                        continue
+                    if job.sender is not None:
+                        if job.sender in busy_senders:
+                            continue
+                        busy_senders.add(job.sender)
+                    pending.remove(job)
+                    running[executor.submit(self._execute, job)] = job
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    busy_senders.discard(job.sender)
+                    self._emit(records, future.result())
+        return records
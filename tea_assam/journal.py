@@ -0,0 +1,195 @@
+import json
+import os
+import threading
+import time
+import uuid
+
+from web3.exceptions import TransactionNotFound
+
+from tea_assam.instrumentation import StepTimings
+from tea_assam.nonce_manager import send_raw_transaction
+from tea_assam.receipts import ReceiptTracker
+from tea_assam.replacement import TxLifecycleManager, replace_stuck_enabled
+
+
+class Journal:
+    """Jurnal append-only (JSONL) untuk flow multi-langkah seperti approve → swap.
+
+    Setiap langkah transaksi dicatat saat ditandatangani (beserta raw tx), saat
+    terkirim, dan saat terkonfirmasi. Jika proses berhenti di tengah jalan, flow
+    yang sama (kunci `flow` sama dan belum selesai) dilanjutkan dari langkah
+    terakhir tanpa mengirim ulang transaksi yang sudah ada.
+
+    Tanpa `path`, jurnal hanya disimpan di memori dan perilakunya sama dengan
+    mengirim transaksi biasa.
+
+    Waktu build, tanda tangan, kirim dan tunggu receipt setiap langkah dicatat di
+    `timings` dengan kunci `<langkah>.build`, `.sign`, `.send` dan `.wait`.
+
+    Transaksi yang tertahan diganti otomatis dengan fee lebih tinggi oleh
+    TxLifecycleManager jika diaktifkan; hash dan raw tx pengganti dicatat di langkah
+    yang sama (hash sebelumnya di `replaced`), dan receipt hash mana pun
+    menyelesaikan langkah.
+    """
+
+    def __init__(self, path: str = None, flow: str = "default", replace_stuck: bool = None):
+        """
+        Inisialisasi kelas Journal.
+
+        Args:
+            path (str): Lokasi file JSONL jurnal (opsional).
+            flow (str): Kunci flow, misalnya gabungan nama kelas dan parameter.
+            replace_stuck (bool): Jika True, transaksi yang tertahan diganti dengan fee lebih
+                tinggi. Default mengikuti TEA_ASSAM_REPLACE_STUCK (mati).
+        """
+        self.path = path
+        self.flow = flow
+        self.replace_stuck = replace_stuck_enabled(replace_stuck)
+        self._lock = threading.Lock()
+        self._steps = {}
+        self.run_id = None
+        self.timings = StepTimings()
+
+        records = self._read_records()
+        if records and records[-1]["step"] != "__selesai__":
+            self.run_id = records[-1]["run"]
+            for record in records:
+                if record["run"] == self.run_id:
+                    self._steps[record["step"]] = record
+        if self.run_id is None:
+            self.run_id = uuid.uuid4().hex
+
+    def _read_records(self):
+        if not self.path or not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # baris terakhir bisa terpotong jika proses mati saat menulis
+                if record.get("flow") == self.flow:
+                    records.append(record)
+        return records
+
+    def record(self, step: str, status: str, **data) -> dict:
+        """Menambahkan satu catatan langkah ke jurnal."""
+        record = {"run": self.run_id, "flow": self.flow, "step": step, "status": status, "time": time.time()}
+        record.update(data)
+        with self._lock:
+            if step in self._steps:
+                record = {**self._steps[step], **record}
+            self._steps[step] = record
+            if self.path:
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+        return record
+
+    def get(self, step: str):
+        return self._steps.get(step)
+
+    def is_resumed(self) -> bool:
+        return bool(self._steps)
+
+    def send(self, step: str, web3, private_key: str, build_tx) -> str:
+        """
+        Menandatangani dan mengirim transaksi satu langkah, atau melanjutkannya.
+
+        Args:
+            build_tx (callable): Fungsi tanpa argumen yang mengembalikan dict transaksi.
+
+        Returns:
+            str: Hash transaksi (hex) untuk langkah ini.
+        """
+        record = self._steps.get(step)
+        if record and record["status"] in ("terkirim", "ditandatangani", "terkonfirmasi"):
+            if record["status"] == "terkonfirmasi" or any(self._find_receipt(web3, h) for h in self._hashes(record)):
+                return record["tx_hash"]
+            try:
+                web3.eth.send_raw_transaction(record["raw_tx"])
+                self.record(step, "terkirim")
+                self._watch(step, web3, private_key)
+                return record["tx_hash"]
+            except Exception as e:
+                if "already known" in str(e).lower():
+                    self.record(step, "terkirim")
+                    self._watch(step, web3, private_key)
+                    return record["tx_hash"]
+                # Nonce sudah terpakai oleh transaksi lain: langkah ini dibangun ulang.
+                self.record(step, "dibatalkan", error=str(e))
+
+        with self.timings.step(step + ".build"):
+            tx = build_tx()
+        with self.timings.step(step + ".sign"):
+            signed_tx = web3.eth.account.sign_transaction(tx, private_key)
+            tx_hash = web3.to_hex(signed_tx.hash)
+            self.record(step, "ditandatangani", tx_hash=tx_hash, raw_tx=web3.to_hex(signed_tx.raw_transaction),
+                        nonce=tx["nonce"], tx=tx, replaced=[], original_fee=tx.get("gasPrice", tx.get("maxFeePerGas")))
+        with self.timings.step(step + ".send"):
+            send_raw_transaction(web3, signed_tx)
+        self.record(step, "terkirim")
+        self._watch(step, web3, private_key)
+        return tx_hash
+
+    def _watch(self, step: str, web3, private_key: str):
+        """Mendaftarkan transaksi langkah `step` ke TxLifecycleManager agar diganti jika tertahan."""
+        record = self._steps[step]
+        if not self.replace_stuck or "tx" not in record:
+            return
+
+        def on_replace(new_hash, raw_tx, tx):
+            current = self._steps[step]
+            self.record(step, current["status"], tx_hash=new_hash, raw_tx=raw_tx, tx=tx,
+                        replaced=current.get("replaced", []) + [current["tx_hash"]])
+
+        tracker = ReceiptTracker.for_web3(web3)
+        for replaced_hash in record.get("replaced", []):
+            tracker.add_replacement(record["tx_hash"], replaced_hash)
+        TxLifecycleManager.for_web3(web3).watch(
+            record["tx"], private_key, record["tx_hash"], on_replace=on_replace, original_fee=record.get("original_fee")
+        )
+
+    def wait(self, step: str, web3, timeout: float = 120) -> int:
+        """Menunggu receipt langkah `step` dan mengembalikan status receipt (1 atau 0)."""
+        record = self._steps[step]
+        if record["status"] == "terkonfirmasi":
+            return record["receipt_status"]
+        tracker = ReceiptTracker.for_web3(web3)
+        tx_hash = record["tx_hash"]
+        # Receipt hash asli maupun pengganti mana pun menyelesaikan langkah ini.
+        for replaced_hash in record.get("replaced", []):
+            tracker.add_replacement(tx_hash, replaced_hash, check_existing=True)
+        with self.timings.step(step + ".wait"):
+            receipt = tracker.wait(tx_hash, timeout=timeout, check_existing=True)
+        # Hash yang benar-benar masuk blok bisa berupa transaksi pengganti.
+        mined_hash = web3.to_hex(receipt["transactionHash"])
+        record = self._steps[step]
+        replaced = [h for h in self._hashes(record) if h.lower() != mined_hash.lower()]
+        self.record(step, "terkonfirmasi", receipt_status=receipt.status, block_number=receipt.blockNumber,
+                    tx_hash=mined_hash, replaced=replaced)
+        return receipt.status
+
+    def tx_hash(self, step: str):
+        """Hash transaksi langkah `step`; setelah `wait`, hash yang masuk blok."""
+        record = self._steps.get(step)
+        return record["tx_hash"] if record else None
+
+    def finish(self):
+        """Menandai flow selesai; menjalankan flow yang sama lagi akan memulai run baru."""
+        self.record("__selesai__", "selesai")
+
+    @staticmethod
+    def _hashes(record: dict) -> list:
+        return record.get("replaced", []) + [record["tx_hash"]]
+
+    @staticmethod
+    def _find_receipt(web3, tx_hash):
+        try:
+            return web3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            return None
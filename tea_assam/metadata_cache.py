@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+class MetadataCache:
+    """Cache metadata on-chain yang tidak berubah (decimals, alamat WETH, alamat pair).
+
+    Data disimpan di memori dan, bila `path` diisi, juga di file JSON dengan kunci
+    chain id lalu `jenis:alamat`. Hasil negatif (misalnya pair yang belum ada)
+    disimpan dengan TTL agar dicek ulang setelah kedaluwarsa.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, path: str = None, negative_ttl: float = 300):
+        """
+        Inisialisasi kelas MetadataCache.
+
+        Args:
+            path (str): Lokasi file JSON untuk penyimpanan di disk (opsional).
+            negative_ttl (float): Lama (detik) hasil negatif disimpan.
+        """
+        self.path = path
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._loaded = path is None
+
+    @classmethod
+    def default(cls):
+        """Mengembalikan cache bersama untuk seluruh proses."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls(path=os.environ.get("TEA_ASSAM_METADATA_CACHE"))
+            return cls._default
+
+    @classmethod
+    def configure(cls, path: str = None, negative_ttl: float = 300):
+        """Mengganti cache bersama, misalnya untuk mengaktifkan penyimpanan di disk."""
+        with cls._default_lock:
+            cls._default = cls(path=path, negative_ttl=negative_ttl)
+            return cls._default
+
+    @staticmethod
+    def _key(kind: str, key) -> str:
+        if isinstance(key, (list, tuple)):
+            key = "-".join(str(k).lower() for k in key)
+        return "{}:{}".format(kind, str(key).lower())
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def _save(self):
+        if self.path is None:
+            return
+        tmp_path = "{}.tmp".format(self.path)
+        with open(tmp_path, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, chain_id: int, kind: str, key, default=None):
+        """Mengambil nilai dari cache; entri negatif yang kedaluwarsa dianggap tidak ada."""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(str(chain_id), {}).get(self._key(kind, key))
+            if entry is None:
+                return default
+            if entry["expires"] is not None and entry["expires"] < time.time():
+                return default
+            return entry["value"]
+
+    def set(self, chain_id: int, kind: str, key, value, negative: bool = False):
+        """Menyimpan nilai; nilai negatif diberi TTL `negative_ttl`."""
+        expires = time.time() + self.negative_ttl if negative else None
+        with self._lock:
+            self._load()
+            self._entries.setdefault(str(chain_id), {})[self._key(kind, key)] = {"value": value, "expires": expires}
+            self._save()
+
+    def set_many(self, chain_id: int, kind: str, items: dict):
+        """Menyimpan banyak nilai positif sekaligus dengan satu kali tulis ke disk."""
+        with self._lock:
+            self._load()
+            entries = self._entries.setdefault(str(chain_id), {})
+            for key, value in items.items():
+                entries[self._key(kind, key)] = {"value": value, "expires": None}
+            self._save()
+
+    def get_or_fetch(self, chain_id: int, kind: str, key, fetch_fn, is_negative=None):
+        """
+        Mengambil nilai dari cache, atau memanggil `fetch_fn()` lalu menyimpannya.
+
+        Args:
+            is_negative (callable): Penentu apakah hasil `fetch_fn` termasuk negatif.
+        """
+        missing = object()
+        value = self.get(chain_id, kind, key, missing)
+        if value is missing:
+            value = fetch_fn()
+            self.set(chain_id, kind, key, value, negative=bool(is_negative and is_negative(value)))
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._save()
+
+
+def is_zero_address(address) -> bool:
+    return address == ZERO_ADDRESS
+
+
+def pair_key(factory_address: str, token_a: str, token_b: str) -> tuple:
+    """Kunci cache pair; urutan token tidak berpengaruh seperti pada `getPair`."""
+    return (factory_address, *sorted([token_a.lower(), token_b.lower()]))
@@ -0,0 +1,117 @@
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
+
+class Multicall:
+    """Menggabungkan banyak `eth_call` menjadi satu panggilan `aggregate3`.
+
+    Jika kontrak Multicall3 tidak ada di jaringan, panggilan dikirim sebagai satu
+    JSON-RPC batch. Semua hasil dibaca pada blok yang sama.
+    """
+
+    def __init__(self, web3, address: str = MULTICALL3_ADDRESS, max_calls: int = 500):
+        self.web3 = web3
+        self.address = address
+        self.max_calls = max_calls
+        self._available = None
+        self._contract = web3.eth.contract(address=address, abi=MULTICALL3_ABI)
+
+    def is_available(self) -> bool:
+        """Memeriksa (sekali saja) apakah kontrak Multicall3 sudah di-deploy."""
+        if self._available is None:
+            self._available = len(self.web3.eth.get_code(self.address)) > 0
+        return self._available
+
+    def resolve_block(self, block_identifier=None) -> int:
+        """Mengubah `None`/`"latest"` menjadi nomor blok agar semua pembacaan konsisten."""
+        if block_identifier is None or block_identifier == "latest":
+            return self.web3.eth.block_number
+        return block_identifier
+
+    def call(self, calls: list, block_identifier=None) -> list:
+        """
+        Menjalankan banyak panggilan baca sekaligus.
+
+        Args:
+            calls (list): List tuple `(target, calldata, output_types)`.
+            block_identifier: Nomor blok tempat semua panggilan dibaca.
+
+        Returns:
+            list: Hasil yang sudah di-decode untuk setiap panggilan (nilai tunggal
+                langsung dikembalikan tanpa tuple), atau None jika panggilan gagal.
+        """
+        if not calls:
+            return []
+        block_identifier = self.resolve_block(block_identifier)
+        send = self._aggregate3 if self.is_available() else self._batch
+        raw_results = []
+        for start in range(0, len(calls), self.max_calls):
+            raw_results.extend(send(calls[start:start + self.max_calls], block_identifier))
+        return [
+            self._decode(output_types, return_data) if success else None
+            for (_, _, output_types), (success, return_data) in zip(calls, raw_results)
+        ]
+
+    def _aggregate3(self, calls, block_identifier):
+        payload = [(target, True, calldata) for target, calldata, _ in calls]
+        return self._contract.functions.aggregate3(payload).call(block_identifier=block_identifier)
+
+    def _batch(self, calls, block_identifier):
+        try:
+            with self.web3.batch_requests() as batch:
+                for target, calldata, _ in calls:
+                    batch.add(self.web3.eth.call({"to": target, "data": calldata}, block_identifier))
+                return [(True, return_data) for return_data in batch.execute()]
+        except Exception:
+            return [self._single(target, calldata, block_identifier) for target, calldata, _ in calls]
+
+    def _single(self, target, calldata, block_identifier):
+        try:
+            return True, self.web3.eth.call({"to": target, "data": calldata}, block_identifier)
+        except Exception:
+            return False, b""
+
+    def _decode(self, output_types, return_data):
+        if not return_data:
+            return None
+        values = self.web3.codec.decode(output_types, bytes(return_data))
+        values = tuple(self._normalize(t, v) for t, v in zip(output_types, values))
+        return values[0] if len(values) == 1 else values
+
+    def _normalize(self, output_type, value):
+        # eth_abi mengembalikan alamat huruf kecil; samakan dengan hasil `.call()` web3.
+        if output_type == "address":
+            return self.web3.to_checksum_address(value)
+        if output_type == "address[]":
+            return [self.web3.to_checksum_address(v) for v in value]
+        return value
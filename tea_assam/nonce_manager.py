@@ -0,0 +1,159 @@
+import heapq
+import threading
+
+
+def is_already_known(error: Exception) -> bool:
+    """True jika node menjawab bahwa transaksi yang sama sudah ada di mempool."""
+    message = str(error).lower()
+    return "already known" in message or "already imported" in message
+
+
+def send_raw_transaction(web3, signed_tx):
+    """
+    Mengirim transaksi bertanda tangan dan mengembalikan hash-nya.
+
+    Jawaban "already known" (misalnya request yang sama terkirim ulang oleh
+    retry atau failover) berarti transaksi sudah tersiar, jadi dianggap sukses.
+    """
+    try:
+        return web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+    except Exception as e:
+        if not is_already_known(e):
+            raise
+        return signed_tx.hash
+
+
+class NonceManager:
+    """Pembagi nonce lokal yang dipakai bersama untuk satu alamat pengirim di satu chain.
+
+    Nonce `pending` diambil sekali dari jaringan, lalu nonce berikutnya dibagikan
+    secara lokal sehingga transaksi bisa dikirim beruntun tanpa menunggu blok.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, web3, address: str):
+        """
+        Inisialisasi kelas NonceManager.
+
+        Args:
+            web3 (Web3): Koneksi Web3 yang dipakai untuk membaca nonce.
+            address (str): Alamat pengirim.
+        """
+        self.web3 = web3
+        self.address = address
+        self._lock = threading.Lock()
+        self._next_nonce = None
+        self._released = []
+
+    @classmethod
+    def for_address(cls, web3, address: str, chain_id: int = None):
+        """
+        Mengembalikan NonceManager bersama untuk pasangan (chain, alamat) di seluruh proses.
+
+        Nonce adalah state per chain, jadi alamat yang sama di chain lain mendapat
+        manager sendiri. Jika `chain_id` tidak diberikan, dibaca dari `web3`.
+        """
+        if chain_id is None:
+            chain_id = web3.eth.chain_id
+        key = (chain_id, address.lower())
+        with cls._instances_lock:
+            manager = cls._instances.get(key)
+            if manager is None:
+                manager = cls(web3, address)
+                cls._instances[key] = manager
+            return manager
+
+    def _fetch_pending(self):
+        return self.web3.eth.get_transaction_count(self.address, "pending")
+
+    def next(self) -> int:
+        """Mengambil nonce berikutnya, memakai ulang nonce yang dilepas lebih dulu."""
+        with self._lock:
+            if self._released:
+                return heapq.heappop(self._released)
+            if self._next_nonce is None:
+                self._next_nonce = self._fetch_pending()
+            nonce = self._next_nonce
+            self._next_nonce += 1
+            return nonce
+
+    def release(self, nonce: int):
+        """Mengembalikan nonce yang tidak jadi terkirim agar tidak terjadi celah."""
+        with self._lock:
+            if nonce not in self._released:
+                heapq.heappush(self._released, nonce)
+            # Nonce teratas yang dilepas cukup mengurangi `_next_nonce`; sisanya di
+            # `_released` selalu berada di bawah nonce yang sudah dibagikan (celah).
+            while self._next_nonce is not None and self._next_nonce - 1 in self._released:
+                self._released.remove(self._next_nonce - 1)
+                self._next_nonce -= 1
+            heapq.heapify(self._released)
+
+    def take_gaps(self) -> list:
+        """
+        Mengambil nonce yang dilepas di bawah nonce yang sudah dibagikan.
+
+        Transaksi dengan nonce lebih tinggi tidak akan masuk blok sebelum celah
+        ini terisi; pemanggil wajib mengisinya (misalnya transaksi 0 ke diri
+        sendiri) lalu memanggil `resync`.
+        """
+        with self._lock:
+            gaps = sorted(self._released)
+            self._released = []
+            return gaps
+
+    def resync(self):
+        """Menyamakan ulang nonce lokal dengan nonce `pending` di jaringan."""
+        with self._lock:
+            chain_nonce = self._fetch_pending()
+            self._released = [n for n in self._released if n >= chain_nonce]
+            heapq.heapify(self._released)
+            if self._next_nonce is None or self._next_nonce < chain_nonce:
+                self._next_nonce = chain_nonce
+            return self._next_nonce
+
+    def reset(self):
+        """Melupakan state lokal; nonce akan diambil ulang dari jaringan."""
+        with self._lock:
+            self._next_nonce = None
+            self._released = []
+
+    @staticmethod
+    def is_nonce_too_low(error: Exception) -> bool:
+        message = str(error).lower()
+        return "nonce too low" in message or "replacement transaction underpriced" in message
+
+    def send(self, send_fn):
+        """
+        Mengirim transaksi dengan nonce lokal dan memulihkan dari error nonce.
+
+        Args:
+            send_fn (callable): Fungsi `send_fn(nonce)` yang membangun, menandatangani,
+                dan mengirim transaksi lalu mengembalikan hash transaksi.
+
+        Returns:
+            tuple: (nonce, tx_hash) untuk transaksi yang berhasil dikirim.
+
+        Error "already known" berarti transaksi dengan nonce ini sudah tersiar;
+        nonce-nya tidak dilepas agar tidak dipakai transaksi lain. Gunakan
+        `send_raw_transaction` di `send_fn` agar kasus ini mengembalikan hash.
+        """
+        nonce = self.next()
+        try:
+            return nonce, send_fn(nonce)
+        except Exception as e:
+            if is_already_known(e):
+                raise
+            if not self.is_nonce_too_low(e):
+                self.release(nonce)
+                raise
+        self.resync()
+        nonce = self.next()
+        try:
+            return nonce, send_fn(nonce)
+        except Exception as e:
+            if not is_already_known(e):
+                self.release(nonce)
+            raise
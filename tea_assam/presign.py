@@ -0,0 +1,122 @@
+import itertools
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from eth_account import Account
+
+
+def sign_transaction(tx: dict, private_key: str) -> tuple:
+    """Menandatangani satu transaksi dan mengembalikan `(tx_hash, raw_tx)` sebagai bytes.
+
+    Fungsi level modul agar bisa dijalankan di proses lain oleh ProcessPoolExecutor.
+    """
+    signed_tx = Account.sign_transaction(tx, private_key)
+    return bytes(signed_tx.hash), bytes(signed_tx.raw_transaction)
+
+
+class PresignPipeline:
+    """Pipeline dua tahap: tanda tangan di process pool, lalu pengiriman di thread terpisah.
+
+    Transaksi harus sudah lengkap (nonce, gas, biaya, chainId). Tanda tangan ECDSA
+    dan encoding RLP dikerjakan paralel di beberapa proses, sementara transaksi yang
+    sudah ditandatangani langsung dikirim dengan `eth_sendRawTransaction` dalam
+    JSON-RPC batch, sehingga kedua tahap berjalan bersamaan.
+    """
+
+    def __init__(self, web3, private_key: str, workers: int = None, send_batch_size: int = 50, min_parallel: int = 32):
+        """
+        Inisialisasi kelas PresignPipeline.
+
+        Args:
+            web3 (Web3): Koneksi Web3 untuk mengirim transaksi.
+            private_key (str): Kunci privat penanda tangan.
+            workers (int): Jumlah proses penanda tangan; default jumlah CPU.
+            send_batch_size (int): Jumlah maksimal transaksi per JSON-RPC batch.
+            min_parallel (int): Di bawah jumlah ini transaksi ditandatangani di proses
+                utama, karena biaya memulai process pool lebih besar.
+        """
+        self.web3 = web3
+        self.private_key = private_key
+        self.workers = workers or os.cpu_count() or 1
+        self.send_batch_size = send_batch_size
+        self.min_parallel = min_parallel
+        self._executor = None
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def sign_many(self, txs: list):
+        """Menandatangani banyak transaksi; hasil `(tx_hash, raw_tx)` dikembalikan berurutan saat siap."""
+        if len(txs) < self.min_parallel or self.workers == 1:
+            return (sign_transaction(tx, self.private_key) for tx in txs)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        chunksize = max(1, len(txs) // (self.workers * 4))
+        return self._executor.map(sign_transaction, txs, itertools.repeat(self.private_key), chunksize=chunksize)
+
+    def _send_batch(self, items: list) -> list:
+        try:
+            with self.web3.batch_requests() as batch:
+                for _, _, raw_tx in items:
+                    batch.add(self.web3.eth.send_raw_transaction(raw_tx))
+                batch.execute()
+            return [(index, tx_hash, None) for index, tx_hash, _ in items]
+        except Exception:
+            pass
+        # Batch gagal (misalnya satu transaksi ditolak): kirim satu per satu. Transaksi
+        # yang sudah diterima dari batch di atas akan dijawab "already known".
+        results = []
+        for index, tx_hash, raw_tx in items:
+            error = None
+            try:
+                self.web3.eth.send_raw_transaction(raw_tx)
+            except Exception as e:
+                if "already known" not in str(e).lower():
+                    error = e
+            results.append((index, tx_hash, error))
+        return results
+
+    def run(self, txs: list) -> list:
+        """
+        Menandatangani dan mengirim semua transaksi.
+
+        Returns:
+            list: Untuk setiap transaksi (urutan sama), dict `{"tx_hash", "error"}`
+                dengan `error` berisi exception atau None.
+        """
+        results = [None] * len(txs)
+        signed = queue.Queue()
+        done = object()
+
+        def _sender():
+            finished = False
+            while not finished:
+                items = [signed.get()]
+                while len(items) < self.send_batch_size:
+                    try:
+                        items.append(signed.get_nowait())
+                    except queue.Empty:
+                        break
+                if items[-1] is done:
+                    items.pop()
+                    finished = True
+                if items:
+                    for index, tx_hash, error in self._send_batch(items):
+                        results[index] = {"tx_hash": tx_hash, "error": error}
+
+        sender = threading.Thread(target=_sender, name="PresignSender", daemon=True)
+        sender.start()
+        try:
+            for index, (tx_hash, raw_tx) in enumerate(self.sign_many(txs)):
+                signed.put((index, tx_hash, raw_tx))
+        finally:
+            signed.put(done)
+            sender.join()
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = {"tx_hash": None, "error": Exception("Transaksi tidak ditandatangani")}
+        return results
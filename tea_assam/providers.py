@@ -0,0 +1,589 @@
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+from web3.providers import JSONBaseProvider
+
+from tea_assam.instrumentation import RpcRecorder
+from tea_assam.rate_limit import LANE_SEND, AdaptiveRateLimiter, lane_for
+
+DEFAULT_CHAIN_ID = 93384
+DEFAULT_RPC_URL = "https://assam-rpc.tea.xyz"  # RPC Tea Assam Testnet
+DEFAULT_POOL_SIZE = 100
+DEFAULT_MAX_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 0.005
+
+# Method baca yang aman dikirim ke dua node sekaligus (hedging).
+HEDGED_METHODS = {
+    "eth_call", "eth_getBalance", "eth_blockNumber", "eth_getBlockByNumber", "eth_getBlockByHash",
+    "eth_getCode", "eth_getLogs", "eth_getTransactionReceipt", "eth_getTransactionByHash",
+    "eth_chainId", "eth_gasPrice", "eth_maxPriorityFeePerGas", "eth_feeHistory", "eth_estimateGas",
+}
+# Method yang harus tetap di satu node agar urutan nonce konsisten.
+STICKY_METHODS = {"eth_sendRawTransaction", "eth_sendTransaction", "eth_getTransactionCount"}
+RATE_LIMIT_CODES = {429, -32005}
+# Status HTTP yang berarti endpoint kewalahan; request tidak diproses sehingga aman diulang.
+THROTTLE_STATUS_CODES = {429, 503}
+DEFAULT_MAX_RETRIES = 3
+
+
+def rpc_error(response):
+    """Pesan error JSON-RPC dari jawaban tunggal, atau None jika tidak ada."""
+    error = response.get("error") if isinstance(response, dict) else None
+    if not error:
+        return None
+    return error.get("message") if isinstance(error, dict) else error
+
+
+def _is_rate_limited(response) -> bool:
+    """True jika jawaban JSON-RPC (atau salah satu jawaban batch) adalah error rate limit."""
+    if isinstance(response, list):
+        return any(_is_rate_limited(item) for item in response)
+    error = response.get("error") if isinstance(response, dict) else None
+    return isinstance(error, dict) and (
+        error.get("code") in RATE_LIMIT_CODES or "rate limit" in str(error.get("message", "")).lower()
+    )
+
+
+def _throttle_info(response=None, error=None) -> tuple:
+    """
+    Menggolongkan hasil request untuk rate limiter.
+
+    Returns:
+        tuple: (ditolak/timeout, detik Retry-After atau None, aman diulang
+            untuk pengiriman transaksi).
+    """
+    if error is None:
+        return _is_rate_limited(response), None, True
+    while error is not None:
+        if isinstance(error, requests.exceptions.HTTPError) and error.response is not None \
+                and error.response.status_code in THROTTLE_STATUS_CODES:
+            retry_after = error.response.headers.get("Retry-After")
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None
+            return True, retry_after, True
+        if isinstance(error, requests.exceptions.Timeout):
+            # Request mungkin sudah diproses node, jadi hanya bacaan yang diulang.
+            return True, None, False
+        error = error.__cause__
+    return False, None, False
+
+
+def _new_session(pool_size: int):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class RegistryHTTPProvider(Web3.HTTPProvider):
+    """HTTPProvider yang mengubah error koneksi menjadi pesan "Gagal terhubung".
+
+    Koneksi tidak dicek saat objek dibuat; kegagalan baru muncul pada request
+    pertama yang benar-benar dikirim. Setiap request (method, latensi, ukuran
+    payload, error) dicatat ke `RpcRecorder.default()`.
+    """
+
+    _payload = threading.local()
+
+    def __init__(self, *args, rate_limiter: AdaptiveRateLimiter = None, max_retries: int = DEFAULT_MAX_RETRIES, **kwargs):
+        """
+        Inisialisasi kelas RegistryHTTPProvider.
+
+        Args:
+            rate_limiter (AdaptiveRateLimiter): Pembatas request untuk endpoint ini
+                (opsional). Jika diisi, retry bawaan web3 dimatikan agar setiap
+                penolakan terlihat oleh limiter, dan request yang ditolak diulang
+                paling banyak `max_retries` kali.
+            max_retries (int): Jumlah pengulangan request yang ditolak endpoint.
+        """
+        if rate_limiter is not None:
+            kwargs.setdefault("exception_retry_configuration", None)
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+
+    def encode_rpc_request(self, method, params):
+        request_data = super().encode_rpc_request(method, params)
+        self._payload.request_bytes = len(request_data)
+        return request_data
+
+    def encode_batch_rpc_request(self, requests):
+        request_data = super().encode_batch_rpc_request(requests)
+        self._payload.request_bytes = len(request_data)
+        return request_data
+
+    def decode_rpc_response(self, raw_response):
+        self._payload.response_bytes = len(raw_response)
+        return super().decode_rpc_response(raw_response)
+
+    def _record(self, method, start, response=None, error=None, batch_size=None):
+        if error is None:
+            error = rpc_error(response)
+        RpcRecorder.default().record(
+            method, time.perf_counter() - start,
+            request_bytes=getattr(self._payload, "request_bytes", None),
+            response_bytes=getattr(self._payload, "response_bytes", None),
+            error=error, endpoint=self.endpoint_uri, batch_size=batch_size,
+        )
+        self._payload.__dict__.clear()
+
+    def _limited(self, methods: list, send, retry_response: bool = True):
+        """
+        Mengirim lewat rate limiter (jika ada) dan mengulang request yang ditolak endpoint.
+
+        `retry_response=False` untuk batch: jawaban yang sebagian elemennya ditolak
+        tidak dikirim ulang utuh (lihat `make_batch_request`).
+        """
+        if self.rate_limiter is None:
+            return send()
+        lane = min(lane_for(method) for method in methods)
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(lane, len(methods))
+            response = error = None
+            try:
+                response = send()
+            except Exception as e:
+                error = e
+            throttled, retry_after, retryable = _throttle_info(response, error)
+            self.rate_limiter.release(throttled, retry_after)
+            if error is None and not retry_response:
+                break
+            if not throttled or not (retryable or lane != LANE_SEND) or attempt == self.max_retries:
+                break
+        if error is not None:
+            if throttled:
+                raise ConnectionError("Endpoint {} membatasi request: {}".format(self.endpoint_uri, error)) from error
+            raise error
+        return response
+
+    def make_request(self, method, params):
+        return self._limited([method], lambda: self._make_single_request(method, params))
+
+    def make_batch_request(self, batch_requests):
+        """
+        Mengirim JSON-RPC batch; hanya elemen yang ditolak karena rate limit yang diulang.
+
+        Elemen lain (misalnya `eth_sendRawTransaction` yang sudah diterima node)
+        tidak pernah dikirim dua kali.
+        """
+        response = self._limited(
+            [method for method, _ in batch_requests], lambda: self._make_batch(batch_requests), retry_response=False
+        )
+        if self.rate_limiter is None or not isinstance(response, list):
+            return response
+        response = list(response)
+        for _ in range(self.max_retries):
+            rejected = [index for index, item in enumerate(response) if _is_rate_limited(item)]
+            if not rejected or len(response) != len(batch_requests):
+                break
+            retry = [batch_requests[index] for index in rejected]
+            retried = self._limited([method for method, _ in retry], lambda: self._make_batch(retry), retry_response=False)
+            if not isinstance(retried, list) or len(retried) != len(retry):
+                break
+            # Jawaban web3 sudah diurutkan menurut id, sama dengan urutan request.
+            for index, item in zip(rejected, retried):
+                response[index] = item
+        return response
+
+    def _make_single_request(self, method, params):
+        start = time.perf_counter()
+        try:
+            response = super().make_request(method, params)
+        except requests.exceptions.ConnectionError as e:
+            self._record(method, start, error=e)
+            raise ConnectionError("Gagal terhubung ke jaringan ({})".format(self.endpoint_uri)) from e
+        except Exception as e:
+            self._record(method, start, error=e)
+            raise
+        self._record(method, start, response)
+        return response
+
+    def _make_batch(self, batch_requests):
+        start = time.perf_counter()
+        try:
+            response = super().make_batch_request(batch_requests)
+        except requests.exceptions.ConnectionError as e:
+            self._record("batch", start, error=e, batch_size=len(batch_requests))
+            raise ConnectionError("Gagal terhubung ke jaringan ({})".format(self.endpoint_uri)) from e
+        except Exception as e:
+            self._record("batch", start, error=e, batch_size=len(batch_requests))
+            raise
+        self._record("batch", start, response, batch_size=len(batch_requests))
+        return response
+
+
+class _Endpoint:
+    def __init__(self, url: str, provider):
+        self.url = url
+        self.provider = provider
+        self.latency = None
+        self.failures = 0
+        self.down_until = 0
+
+    def is_healthy(self, now: float) -> bool:
+        return self.down_until <= now
+
+
+class MultiEndpointProvider(JSONBaseProvider):
+    """Provider yang membagi request ke beberapa endpoint RPC.
+
+    Request baca dikirim ke endpoint tercepat (atau bergiliran) dan di-hedge ke
+    endpoint kedua jika jawaban pertama lambat. Endpoint yang error ditandai
+    tidak sehat selama `cooldown` detik dan request dialihkan ke endpoint lain.
+    Request tulis (`eth_sendRawTransaction`) dan pembacaan nonce selalu memakai
+    satu endpoint yang sama sampai endpoint itu gagal.
+    """
+
+    def __init__(self, rpc_urls: list, strategy: str = "latency", hedge_delay: float = 0.3,
+                 timeout: float = 10, cooldown: float = 30, pool_size: int = DEFAULT_POOL_SIZE,
+                 rate_limit: bool = False):
+        """
+        Inisialisasi kelas MultiEndpointProvider.
+
+        Args:
+            rpc_urls (list): Daftar URL RPC.
+            strategy (str): "latency" (endpoint dengan latensi rata-rata terendah)
+                atau "round_robin".
+            hedge_delay (float): Jeda (detik) sebelum request baca dikirim juga ke
+                endpoint kedua; None untuk mematikan hedging.
+            timeout (float): Timeout HTTP per request.
+            cooldown (float): Lama (detik) endpoint yang error tidak dipakai.
+            pool_size (int): Jumlah maksimal koneksi keep-alive per endpoint.
+            rate_limit (bool): Pasang `AdaptiveRateLimiter` per endpoint.
+        """
+        if not rpc_urls:
+            raise ValueError("Daftar URL RPC kosong")
+        if strategy not in ("latency", "round_robin"):
+            raise ValueError("Strategi tidak dikenal: {}".format(strategy))
+        super().__init__()
+        self.endpoint_uri = ",".join(rpc_urls)
+        self.strategy = strategy
+        self.hedge_delay = hedge_delay
+        self.cooldown = cooldown
+        self.endpoints = [
+            _Endpoint(url, RegistryHTTPProvider(
+                url, request_kwargs={"timeout": timeout}, session=_new_session(pool_size),
+                rate_limiter=AdaptiveRateLimiter.for_endpoint(url) if rate_limit else None
+            ))
+            for url in rpc_urls
+        ]
+        self._lock = threading.Lock()
+        self._round_robin = itertools.count()
+        self._write_endpoint = None
+        self._executor = ThreadPoolExecutor(max_workers=len(self.endpoints) * 8, thread_name_prefix="rpc-hedge")
+
+    def _ordered(self, exclude=()) -> list:
+        """Endpoint sehat sesuai strategi, lalu endpoint yang sedang cooldown sebagai cadangan."""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude]
+            healthy = [endpoint for endpoint in candidates if endpoint.is_healthy(now)]
+            down = sorted((endpoint for endpoint in candidates if not endpoint.is_healthy(now)), key=lambda e: e.down_until)
+            if self.strategy == "round_robin" and healthy:
+                start = next(self._round_robin) % len(healthy)
+                healthy = healthy[start:] + healthy[:start]
+            else:
+                healthy.sort(key=lambda endpoint: endpoint.latency or 0)
+        return healthy + down
+
+    def _call(self, endpoint, method, params):
+        start = time.perf_counter()
+        try:
+            response = endpoint.provider.make_request(method, params)
+            if _is_rate_limited(response):
+                raise ConnectionError("Endpoint {} membatasi request: {}".format(endpoint.url, response["error"].get("message")))
+        except Exception:
+            with self._lock:
+                endpoint.failures += 1
+                endpoint.down_until = time.monotonic() + self.cooldown
+            raise
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            endpoint.failures = 0
+            endpoint.latency = elapsed if endpoint.latency is None else endpoint.latency * 0.8 + elapsed * 0.2
+        return response
+
+    def _failover(self, method, params, exclude=(), error=None):
+        for endpoint in self._ordered(exclude):
+            try:
+                return self._call(endpoint, method, params)
+            except Exception as e:
+                error = e
+        raise error
+
+    def _hedged(self, method, params):
+        endpoints = self._ordered()
+        futures = {self._executor.submit(self._call, endpoints[0], method, params): endpoints[0]}
+        done, _ = wait(futures, timeout=self.hedge_delay)
+        if not done and len(endpoints) > 1:
+            futures[self._executor.submit(self._call, endpoints[1], method, params)] = endpoints[1]
+
+        error = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        return self._failover(method, params, exclude=set(futures.values()), error=error)
+
+    def _sticky(self, method, params):
+        error = None
+        tried = set()
+        while True:
+            with self._lock:
+                endpoint = self._write_endpoint
+            if endpoint is None or endpoint in tried or not endpoint.is_healthy(time.monotonic()):
+                remaining = self._ordered(tried)
+                if not remaining:
+                    raise error
+                endpoint = remaining[0]
+                with self._lock:
+                    self._write_endpoint = endpoint
+            try:
+                return self._call(endpoint, method, params)
+            except Exception as e:
+                error = e
+                tried.add(endpoint)
+
+    def make_request(self, method, params):
+        if method in STICKY_METHODS:
+            return self._sticky(method, params)
+        if method in HEDGED_METHODS and self.hedge_delay is not None and len(self.endpoints) > 1:
+            return self._hedged(method, params)
+        return self._failover(method, params)
+
+    def make_batch_request(self, batch_requests):
+        error = None
+        for endpoint in self._ordered():
+            try:
+                return endpoint.provider.make_batch_request(batch_requests)
+            except Exception as e:
+                with self._lock:
+                    endpoint.failures += 1
+                    endpoint.down_until = time.monotonic() + self.cooldown
+                error = e
+        raise error
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return any(endpoint.provider.is_connected(show_traceback) for endpoint in self.endpoints)
+
+    def check_health(self) -> dict:
+        """Mengirim `eth_blockNumber` ke semua endpoint dan mengembalikan status serta latensinya."""
+        status = {}
+        for endpoint in self.endpoints:
+            try:
+                self._call(endpoint, "eth_blockNumber", [])
+                status[endpoint.url] = {"healthy": True, "latency": endpoint.latency}
+            except Exception as e:
+                status[endpoint.url] = {"healthy": False, "error": str(e)}
+        return status
+
+
+class BatchingProvider(JSONBaseProvider):
+    """Provider yang menggabungkan request dari banyak thread menjadi JSON-RPC batch.
+
+    Setiap `make_request` dimasukkan ke antrean dan menunggu hasilnya. Antrean
+    dikirim sebagai satu array JSON-RPC ketika berisi `max_batch_size` request
+    atau `flush_interval` detik setelah request pertama masuk, lalu setiap
+    jawaban dikembalikan ke pemanggilnya. Keuntungan baru terasa jika request
+    dikirim bersamaan dari beberapa thread; pemanggil tunggal hanya menunggu
+    paling lama `flush_interval`.
+    """
+
+    def __init__(self, provider, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """
+        Inisialisasi kelas BatchingProvider.
+
+        Args:
+            provider: Provider yang mendukung `make_batch_request` (misalnya
+                RegistryHTTPProvider atau MultiEndpointProvider).
+            max_batch_size (int): Jumlah maksimal request per batch.
+            flush_interval (float): Jeda (detik) maksimal sebelum antrean dikirim.
+        """
+        super().__init__()
+        self.provider = provider
+        self.endpoint_uri = provider.endpoint_uri
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self._condition = threading.Condition()
+        self._queue = []
+        self._thread = None
+
+    def make_request(self, method, params):
+        future = Future()
+        with self._condition:
+            self._queue.append((method, params, future))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="BatchingProvider", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+        return future.result()
+
+    def make_batch_request(self, batch_requests):
+        return self.provider.make_batch_request(batch_requests)
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return self.provider.is_connected(show_traceback)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._queue:
+                    self._condition.wait(timeout=1)
+                    if not self._queue:
+                        self._thread = None
+                        return
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._queue) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(timeout=remaining)
+                items = self._queue[:self.max_batch_size]
+                del self._queue[:self.max_batch_size]
+            self._flush(items)
+
+    def _flush(self, items):
+        try:
+            if len(items) == 1:
+                method, params, _ = items[0]
+                responses = [self.provider.make_request(method, params)]
+            else:
+                responses = self.provider.make_batch_request([(method, params) for method, params, _ in items])
+        except Exception as e:
+            for _, _, future in items:
+                future.set_exception(e)
+            return
+        if isinstance(responses, dict):
+            # Node mengembalikan satu error untuk seluruh batch.
+            responses = [responses] * len(items)
+        for index, (_, _, future) in enumerate(items):
+            if index < len(responses):
+                future.set_result(responses[index])
+            else:
+                future.set_exception(ValueError("Jawaban batch JSON-RPC tidak lengkap"))
+
+
+class ProviderRegistry:
+    """Registry koneksi Web3 bersama per chain id dan URL RPC.
+
+    Setiap URL memakai satu instance Web3 dengan `requests.Session` keep-alive,
+    sehingga membuat banyak objek tidak membuka koneksi TCP/TLS baru dan tidak
+    memanggil `is_connected()` setiap kali. Daftar beberapa URL memakai
+    `MultiEndpointProvider` untuk failover dan load balancing, dan `batching=True`
+    membungkus provider dengan `BatchingProvider`. Setiap endpoint dibatasi
+    `AdaptiveRateLimiter` yang mundur saat endpoint menolak (HTTP 429/503) dan
+    mendahulukan `eth_sendRawTransaction` di atas bacaan dan polling receipt.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, rate_limit: bool = None):
+        """
+        Inisialisasi kelas ProviderRegistry.
+
+        Args:
+            pool_size (int): Jumlah maksimal koneksi keep-alive per URL.
+            max_batch_size (int): Ukuran batch maksimal untuk instance `batching=True`.
+            flush_interval (float): Jeda kirim batch untuk instance `batching=True`.
+            rate_limit (bool): Pasang `AdaptiveRateLimiter` per endpoint. Default
+                aktif, kecuali TEA_ASSAM_RATE_LIMIT=0.
+        """
+        self.pool_size = pool_size
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        if rate_limit is None:
+            rate_limit = os.environ.get("TEA_ASSAM_RATE_LIMIT", "1").lower() not in ("0", "false", "no")
+        self.rate_limit = rate_limit
+        self._lock = threading.Lock()
+        # TEA_ASSAM_RPC_URL boleh berisi beberapa URL dipisah koma.
+        env_urls = os.environ.get("TEA_ASSAM_RPC_URL", DEFAULT_RPC_URL).split(",")
+        self._rpc_urls = {DEFAULT_CHAIN_ID: [url.strip() for url in env_urls if url.strip()]}
+        self._web3_instances = {}
+
+    @classmethod
+    def default(cls):
+        """Mengembalikan registry bersama untuk seluruh proses."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def configure(self, chain_id: int, rpc_url):
+        """Mengatur URL RPC (string atau list beberapa URL) yang dipakai untuk `chain_id`."""
+        with self._lock:
+            self._rpc_urls[chain_id] = rpc_url
+
+    def rpc_urls(self, chain_id: int = DEFAULT_CHAIN_ID) -> list:
+        """Mengembalikan semua URL RPC yang terdaftar untuk `chain_id`."""
+        with self._lock:
+            if chain_id not in self._rpc_urls:
+                raise ValueError("URL RPC untuk chain id {} belum diatur".format(chain_id))
+            rpc_url = self._rpc_urls[chain_id]
+        return [rpc_url] if isinstance(rpc_url, str) else list(rpc_url)
+
+    def rpc_url(self, chain_id: int = DEFAULT_CHAIN_ID) -> str:
+        """Mengembalikan URL RPC utama (pertama) untuk `chain_id`, misalnya untuk AsyncWeb3."""
+        return self.rpc_urls(chain_id)[0]
+
+    def _provider(self, rpc_urls: list):
+        if len(rpc_urls) == 1:
+            return RegistryHTTPProvider(
+                rpc_urls[0], session=_new_session(self.pool_size),
+                rate_limiter=AdaptiveRateLimiter.for_endpoint(rpc_urls[0]) if self.rate_limit else None
+            )
+        return MultiEndpointProvider(rpc_urls, pool_size=self.pool_size, rate_limit=self.rate_limit)
+
+    def get_web3(self, chain_id: int = DEFAULT_CHAIN_ID, rpc_url=None, batching: bool = False):
+        """
+        Mengembalikan instance Web3 bersama untuk `rpc_url` (atau URL milik `chain_id`).
+
+        `rpc_url` boleh berupa list beberapa URL. Instance dibuat sekali per URL
+        (atau per daftar URL) tanpa request apa pun ke jaringan. Dengan
+        `batching=True`, request dari banyak thread digabung menjadi JSON-RPC batch.
+        """
+        rpc_urls = [rpc_url] if isinstance(rpc_url, str) else list(rpc_url or self.rpc_urls(chain_id))
+        key = (tuple(rpc_urls), batching)
+        with self._lock:
+            web3 = self._web3_instances.get(key)
+            if web3 is None:
+                provider = self._provider(rpc_urls)
+                if batching:
+                    provider = BatchingProvider(provider, self.max_batch_size, self.flush_interval)
+                web3 = Web3(provider)
+                self._web3_instances[key] = web3
+            return web3
+
+
+def get_web3(chain_id: int = DEFAULT_CHAIN_ID, rpc_url=None, batching: bool = False):
+    """Singkatan untuk `ProviderRegistry.default().get_web3(...)`."""
+    return ProviderRegistry.default().get_web3(chain_id, rpc_url, batching)
+
+
+def call_concurrently(*calls) -> list:
+    """
+    Menjalankan beberapa pembacaan independen bersamaan dan mengembalikan hasilnya sesuai urutan.
+
+    Tiap panggilan berjalan di thread sendiri, sehingga pada web3 dengan `batching=True`
+    request-request ini digabung BatchingProvider menjadi satu JSON-RPC batch. Exception
+    dari salah satu panggilan diteruskan ke pemanggil.
+    """
+    if len(calls) < 2:
+        return [call() for call in calls]
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        futures = [executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
@@ -0,0 +1,183 @@
+import threading
+import time
+
+from tea_assam.metadata_cache import MetadataCache, is_zero_address, pair_key
+from tea_assam.multicall import Multicall
+from tea_assam.providers import DEFAULT_CHAIN_ID
+
+DEFAULT_FACTORY_ADDRESS = "0x384d179F3f499E876fAd943d270AD38bb414aC24"
+DEFAULT_FEE_BPS = 30  # Fee Uniswap V2: 0,3%
+
+QUOTE_ABI = [
+    {"inputs": [{"internalType": "address", "name": "tokenA", "type": "address"}, {"internalType": "address", "name": "tokenB", "type": "address"}], "name": "getPair", "outputs": [{"internalType": "address", "name": "pair", "type": "address"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "getReserves", "outputs": [{"internalType": "uint112", "name": "reserve0", "type": "uint112"}, {"internalType": "uint112", "name": "reserve1", "type": "uint112"}, {"internalType": "uint32", "name": "blockTimestampLast", "type": "uint32"}], "stateMutability": "view", "type": "function"}
+]
+
+
+def get_amount_out(amount_in: int, reserve_in: int, reserve_out: int, fee_bps: int = DEFAULT_FEE_BPS) -> int:
+    """Rumus `getAmountOut` Uniswap V2 (constant product dengan fee), hasil sama persis dengan router."""
+    if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+        return 0
+    amount_in_with_fee = amount_in * (10000 - fee_bps)
+    return (amount_in_with_fee * reserve_out) // (reserve_in * 10000 + amount_in_with_fee)
+
+
+def get_amounts_out_many(amounts_in, hops: list, fee_bps: int = DEFAULT_FEE_BPS) -> list:
+    """
+    Menghitung output multi-hop untuk banyak ukuran trade sekaligus.
+
+    Args:
+        amounts_in (list): Daftar jumlah input (wei).
+        hops (list): List tuple `(reserve_in, reserve_out)` untuk setiap hop di path.
+
+    Returns:
+        list: Jumlah output akhir untuk setiap jumlah input.
+    """
+    amounts = [int(amount) for amount in amounts_in]
+    for reserve_in, reserve_out in hops:
+        if reserve_in <= 0 or reserve_out <= 0:
+            return [0] * len(amounts)
+        # Bilangan bulat Python dipakai agar hasil sama persis dengan perhitungan uint256 router.
+        multiplier = 10000 - fee_bps
+        base = reserve_in * 10000
+        amounts = [
+            (amount * multiplier * reserve_out) // (base + amount * multiplier) if amount > 0 else 0
+            for amount in amounts
+        ]
+    return amounts
+
+
+def apply_slippage(amount_out: int, slippage: float) -> int:
+    """Mengembalikan `amountOutMin` dari jumlah output dan toleransi slippage (misalnya 0.005 = 0,5%)."""
+    if not 0 <= slippage < 1:
+        raise ValueError("Slippage harus di antara 0 dan 1")
+    return amount_out * (10000 - int(round(slippage * 10000))) // 10000
+
+
+class QuoteEngine:
+    """Kalkulator harga swap Uniswap V2 di sisi klien.
+
+    Reserve semua pair di path dibaca dalam satu panggilan Multicall lalu
+    di-cache selama `ttl` detik, sehingga quote berikutnya (termasuk grid banyak
+    ukuran trade) tidak memerlukan `getAmountsOut` ke router.
+    """
+
+    def __init__(self, web3, factory_address: str = DEFAULT_FACTORY_ADDRESS, fee_bps: int = DEFAULT_FEE_BPS,
+                 ttl: float = 3, multicall: Multicall = None, metadata_cache: MetadataCache = None,
+                 chain_id: int = DEFAULT_CHAIN_ID):
+        """
+        Inisialisasi kelas QuoteEngine.
+
+        Args:
+            web3 (Web3): Koneksi Web3.
+            factory_address (str): Alamat factory Uniswap V2.
+            fee_bps (int): Fee swap dalam basis poin.
+            ttl (float): Lama (detik) reserve di-cache.
+            multicall (Multicall): Multicall yang dipakai (opsional).
+            metadata_cache (MetadataCache): Cache alamat pair (opsional).
+            chain_id (int): Chain id untuk kunci cache.
+        """
+        self.web3 = web3
+        self.chain_id = chain_id
+        self.factory_address = factory_address
+        self.fee_bps = fee_bps
+        self.ttl = ttl
+        self.multicall = multicall or Multicall(web3)
+        self.metadata_cache = metadata_cache or MetadataCache.default()
+        self._contract = web3.eth.contract(abi=QUOTE_ABI)
+        self._lock = threading.Lock()
+        self._reserves = {}
+
+    def _pair_addresses(self, pairs: list) -> list:
+        chain_id = self.chain_id
+        missing = object()
+        addresses = [
+            self.metadata_cache.get(chain_id, "pair", pair_key(self.factory_address, a, b), missing)
+            for a, b in pairs
+        ]
+        lookups = [pair for pair, address in zip(pairs, addresses) if address is missing]
+        if lookups:
+            found = iter(self.multicall.call([
+                (self.factory_address, self._contract.encode_abi("getPair", args=[a, b]), ["address"])
+                for a, b in lookups
+            ]))
+            for index, address in enumerate(addresses):
+                if address is missing:
+                    a, b = pairs[index]
+                    address = next(found)
+                    self.metadata_cache.set(
+                        chain_id, "pair", pair_key(self.factory_address, a, b), address, negative=is_zero_address(address)
+                    )
+                    addresses[index] = address
+        return addresses
+
+    def hops(self, path: list, refresh: bool = False) -> list:
+        """
+        Mengembalikan `(reserve_in, reserve_out)` untuk setiap hop di `path`.
+
+        Raises:
+            ValueError: Jika salah satu pair di path belum ada, `getReserves` gagal,
+                atau reserve-nya kosong.
+        """
+        pairs = list(zip(path[:-1], path[1:]))
+        addresses = self._pair_addresses(pairs)
+        for (a, b), address in zip(pairs, addresses):
+            if address is None or is_zero_address(address):
+                raise ValueError("Pair {} / {} tidak ditemukan".format(a, b))
+
+        now = time.time()
+        with self._lock:
+            cached = {
+                address: self._reserves[address][0] for address in addresses
+                if not refresh and address in self._reserves and now - self._reserves[address][1] < self.ttl
+            }
+        stale = [address for address in dict.fromkeys(addresses) if address not in cached]
+        if stale:
+            values = self.multicall.call([
+                (address, self._contract.encode_abi("getReserves"), ["uint112", "uint112", "uint32"])
+                for address in stale
+            ])
+            with self._lock:
+                for address, value in zip(stale, values):
+                    if not value or not value[0] or not value[1]:
+                        # Tidak di-cache: quote berikutnya membaca ulang reserve pair ini.
+                        self._reserves.pop(address, None)
+                        raise ValueError("Reserve pair {} tidak tersedia atau kosong".format(address))
+                    reserves = (value[0], value[1])
+                    self._reserves[address] = (reserves, now)
+                    cached[address] = reserves
+
+        hops = []
+        for (token_in, token_out), address in zip(pairs, addresses):
+            reserve0, reserve1 = cached[address]
+            # Pada Uniswap V2, token0 adalah alamat yang lebih kecil.
+            if int(token_in, 16) < int(token_out, 16):
+                hops.append((reserve0, reserve1))
+            else:
+                hops.append((reserve1, reserve0))
+        return hops
+
+    def update_reserves(self, pair_address: str, reserve0: int, reserve1: int):
+        """Memperbarui reserve pair dari sumber lain (misalnya event `Sync`)."""
+        with self._lock:
+            self._reserves[pair_address] = ((reserve0, reserve1), time.time())
+
+    def quote(self, amount_in: int, path: list) -> int:
+        """Jumlah output (wei) untuk `amount_in` melalui `path`."""
+        return self.quote_many([amount_in], path)[0]
+
+    def quote_many(self, amounts_in, path: list) -> list:
+        """Jumlah output (wei) untuk banyak ukuran trade dengan satu kali baca reserve."""
+        return get_amounts_out_many(amounts_in, self.hops(path), self.fee_bps)
+
+    def amount_out_min(self, amount_in: int, path: list, slippage: float = 0.005) -> int:
+        """
+        `amountOutMin` untuk swap: output yang diharapkan dikurangi toleransi slippage.
+
+        Raises:
+            ValueError: Jika quote bernilai 0; swap tanpa batas output tidak pernah dikirim diam-diam.
+        """
+        amount_out = self.quote(amount_in, path)
+        if amount_out <= 0:
+            raise ValueError("Quote swap bernilai 0 untuk path {}".format(path))
+        return apply_slippage(amount_out, slippage)
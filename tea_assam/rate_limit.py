@@ -0,0 +1,160 @@
+import threading
+import time
+
+# Lane prioritas: angka lebih kecil dilayani lebih dulu.
+LANE_SEND = 0
+LANE_READ = 1
+LANE_BULK = 2
+
+# Pengiriman transaksi (dan nonce yang mendahuluinya) tidak boleh mengantre di belakang bacaan.
+SEND_METHODS = {"eth_sendRawTransaction", "eth_sendTransaction", "eth_getTransactionCount"}
+# Polling receipt/blok dan pembacaan log: boleh menunggu paling lama.
+BULK_METHODS = {
+    "eth_getTransactionReceipt", "eth_getTransactionByHash", "eth_blockNumber", "eth_getBlockByNumber",
+    "eth_getLogs",
+}
+
+DEFAULT_MAX_RATE = 500.0
+DEFAULT_BURST = 50
+DEFAULT_MAX_CONCURRENCY = 64
+
+
+def lane_for(method: str) -> int:
+    """Lane prioritas untuk method JSON-RPC."""
+    if method in SEND_METHODS:
+        return LANE_SEND
+    if method in BULK_METHODS:
+        return LANE_BULK
+    return LANE_READ
+
+
+class AdaptiveRateLimiter:
+    """Pembatas request sisi klien per endpoint: token bucket + konkurensi AIMD.
+
+    Laju (token per detik) dan batas request yang berjalan bersamaan dimulai dari
+    nilai maksimal. Setiap request yang ditolak endpoint (HTTP 429/503, error
+    rate limit JSON-RPC, timeout) memotong keduanya secara multiplikatif, paling
+    banyak sekali per `decrease_interval` detik, dan `Retry-After` menjeda semua
+    lane. Setiap jawaban sehat menaikkannya secara aditif, sehingga laju
+    berayun di sekitar kapasitas endpoint alih-alih meledak lalu ditolak.
+
+    Request menunggu di tiga lane: `LANE_SEND` selalu dilayani lebih dulu
+    daripada `LANE_READ`, dan keduanya lebih dulu daripada `LANE_BULK`. Lane
+    kirim juga punya `send_reserve` slot konkurensi tambahan.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, max_rate: float = DEFAULT_MAX_RATE, min_rate: float = 1.0, burst: int = DEFAULT_BURST,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, min_concurrency: int = 1,
+                 rate_increase: float = 2.0, concurrency_increase: float = 1.0, decrease: float = 0.5,
+                 decrease_interval: float = 1.0, send_reserve: int = 2):
+        """
+        Inisialisasi kelas AdaptiveRateLimiter.
+
+        Args:
+            max_rate (float): Laju maksimal (request per detik).
+            min_rate (float): Laju minimal setelah dipotong.
+            burst (int): Kapasitas token bucket.
+            max_concurrency (int): Batas maksimal request bersamaan.
+            min_concurrency (int): Batas minimal request bersamaan.
+            rate_increase (float): Kenaikan laju (request/detik) per putaran jawaban sehat.
+            concurrency_increase (float): Kenaikan batas konkurensi per putaran jawaban sehat.
+            decrease (float): Pengali laju dan konkurensi saat endpoint menolak.
+            decrease_interval (float): Jeda minimal (detik) antar-pemotongan.
+            send_reserve (int): Slot konkurensi tambahan khusus `LANE_SEND`.
+        """
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.rate_increase = rate_increase
+        self.concurrency_increase = concurrency_increase
+        self.decrease = decrease
+        self.decrease_interval = decrease_interval
+        self.send_reserve = send_reserve
+
+        self.rate = float(max_rate)
+        self.concurrency = float(max_concurrency)
+        self._condition = threading.Condition()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._waiting = [0, 0, 0]
+        self.throttled = 0
+
+    @classmethod
+    def for_endpoint(cls, endpoint_uri: str):
+        """Mengembalikan limiter bersama untuk satu endpoint (batas rate berlaku per endpoint)."""
+        with cls._instances_lock:
+            limiter = cls._instances.get(endpoint_uri)
+            if limiter is None:
+                limiter = cls()
+                cls._instances[endpoint_uri] = limiter
+            return limiter
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self, lane: int = LANE_READ, cost: int = 1):
+        """Menunggu sampai request di `lane` boleh dikirim; `cost` untuk batch (jumlah request)."""
+        cost = min(cost, self.burst)
+        with self._condition:
+            self._waiting[lane] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    timeout = None
+                    if now < self._paused_until:
+                        timeout = self._paused_until - now
+                    elif not any(self._waiting[:lane]):
+                        limit = max(self.min_concurrency, int(self.concurrency))
+                        if lane == LANE_SEND:
+                            limit += self.send_reserve
+                        if self._in_flight < limit:
+                            if self._tokens >= cost:
+                                self._tokens -= cost
+                                self._in_flight += 1
+                                return
+                            timeout = (cost - self._tokens) / self.rate
+                    # Tanpa batas waktu, tunggu `release` atau lane yang lebih tinggi selesai.
+                    self._condition.wait(timeout)
+            finally:
+                self._waiting[lane] -= 1
+                self._condition.notify_all()
+
+    def release(self, throttled: bool = False, retry_after: float = None):
+        """Menandai request selesai; `throttled=True` jika endpoint menolak atau timeout."""
+        with self._condition:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                self.throttled += 1
+                if now - self._last_decrease >= self.decrease_interval:
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                    self.concurrency = max(self.min_concurrency, self.concurrency * self.decrease)
+                    self._tokens = min(self._tokens, 0.0)
+                    self._last_decrease = now
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+            else:
+                # Kenaikan per jawaban dibagi nilai saat ini: total +increase per "putaran".
+                self.rate = min(self.max_rate, self.rate + self.rate_increase / self.rate)
+                self.concurrency = min(self.max_concurrency, self.concurrency + self.concurrency_increase / self.concurrency)
+            self._condition.notify_all()
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "rate": round(self.rate, 3),
+                "concurrency": round(self.concurrency, 3),
+                "in_flight": self._in_flight,
+                "waiting": {"send": self._waiting[LANE_SEND], "read": self._waiting[LANE_READ], "bulk": self._waiting[LANE_BULK]},
+                "throttled": self.throttled,
+            }
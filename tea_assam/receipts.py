@@ -0,0 +1,255 @@
+import collections
+import threading
+import time
+from concurrent.futures import Future
+
+from web3.exceptions import TimeExhausted, TransactionNotFound
+
+
+class ReceiptTracker:
+    """Penunggu receipt bersama untuk banyak transaksi sekaligus.
+
+    Satu thread mengikuti blok baru (`eth_getBlockByNumber`), mencocokkan hash
+    transaksi di setiap blok dengan hash yang sedang ditunggu, lalu mengambil
+    receipt yang cocok dalam satu JSON-RPC batch. Setiap pemanggil mendapat
+    `Future` yang selesai saat receipt tersedia, menggantikan loop polling
+    `wait_for_transaction_receipt` per transaksi.
+
+    Transaksi pengganti (nonce sama, fee dinaikkan) didaftarkan lewat
+    `add_replacement`; receipt salah satu hash menyelesaikan penantian semua
+    hash dalam kelompok yang sama.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, web3, poll_interval: float = 1.0, timeout: float = 300, lookback: int = 5, history: int = 64):
+        """
+        Inisialisasi kelas ReceiptTracker.
+
+        Args:
+            web3 (Web3): Koneksi Web3 yang dipakai untuk membaca blok dan receipt.
+            poll_interval (float): Jeda (detik) antar pengecekan blok baru.
+            timeout (float): Batas waktu default (detik) menunggu satu receipt.
+            lookback (int): Jumlah blok sebelum blok terbaru yang ikut dipindai saat
+                tracker mulai berjalan, untuk transaksi yang sudah masuk blok.
+            history (int): Jumlah blok terakhir yang hash transaksinya disimpan agar
+                hash yang baru didaftarkan tetap ditemukan.
+        """
+        self.web3 = web3
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.lookback = lookback
+        self.history = history
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._found = set()
+        self._recent = collections.OrderedDict()
+        self._groups = {}
+        self._settled = collections.OrderedDict()
+        self._cursor = None
+        self._thread = None
+
+    @classmethod
+    def for_web3(cls, web3):
+        """Mengembalikan ReceiptTracker bersama untuk endpoint RPC yang sama di seluruh proses."""
+        key = getattr(web3.provider, "endpoint_uri", None) or id(web3)
+        with cls._instances_lock:
+            tracker = cls._instances.get(key)
+            if tracker is None:
+                tracker = cls(web3)
+                cls._instances[key] = tracker
+            return tracker
+
+    @staticmethod
+    def normalize(tx_hash) -> str:
+        """Hash transaksi dalam bentuk hex huruf kecil berawalan `0x` (kunci antrean)."""
+        if isinstance(tx_hash, (bytes, bytearray)):
+            return "0x" + bytes(tx_hash).hex()
+        tx_hash = str(tx_hash).lower()
+        return tx_hash if tx_hash.startswith("0x") else "0x" + tx_hash
+
+    @property
+    def head_block(self):
+        """Nomor blok terbaru yang sudah dipindai, atau None jika tracker belum berjalan."""
+        return self._cursor
+
+    def track(self, tx_hash, callback=None, timeout: float = None, check_existing: bool = False) -> Future:
+        """
+        Mendaftarkan hash transaksi untuk ditunggu receipt-nya.
+
+        Args:
+            tx_hash: Hash transaksi (hex atau bytes).
+            callback (callable): Dipanggil dengan `Future` saat selesai (opsional).
+            timeout (float): Batas waktu menunggu; default `self.timeout`.
+            check_existing (bool): Jika True, receipt langsung dicek di jaringan,
+                untuk transaksi lama (misalnya saat melanjutkan dari checkpoint).
+
+        Returns:
+            Future: Berisi receipt, atau exception `TimeExhausted` jika waktu habis.
+        """
+        key = self.normalize(tx_hash)
+        deadline = time.time() + (self.timeout if timeout is None else timeout)
+        with self._lock:
+            if key in self._settled:
+                # Sudah terkonfirmasi lewat transaksi pengganti.
+                future = Future()
+                future.set_result(self._settled[key])
+                if callback is not None:
+                    future.add_done_callback(callback)
+                return future
+            entry = self._pending.get(key)
+            if entry is None:
+                entry = {"futures": [], "deadline": deadline}
+                self._pending[key] = entry
+                if check_existing or any(key in hashes for hashes in self._recent.values()):
+                    self._found.add(key)
+            else:
+                entry["deadline"] = max(entry["deadline"], deadline)
+            future = Future()
+            entry["futures"].append(future)
+            self._ensure_running()
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
+    def add_replacement(self, tx_hash, replacement_hash, check_existing: bool = False):
+        """
+        Mendaftarkan `replacement_hash` sebagai pengganti `tx_hash` (nonce yang sama).
+
+        Penantian `tx_hash` yang sedang atau akan berjalan selesai dengan receipt
+        hash mana pun di kelompoknya yang lebih dulu masuk blok. `check_existing`
+        sama seperti di `track`.
+        """
+        key = self.normalize(tx_hash)
+        replacement = self.normalize(replacement_hash)
+        with self._lock:
+            group = self._groups.get(key) or {key}
+            group.add(replacement)
+            for member in group:
+                self._groups[member] = group
+            if replacement not in self._pending:
+                original = self._pending.get(key)
+                deadline = original["deadline"] if original else time.time() + self.timeout
+                self._pending[replacement] = {"futures": [], "deadline": deadline}
+                if check_existing or any(replacement in hashes for hashes in self._recent.values()):
+                    self._found.add(replacement)
+            self._ensure_running()
+
+    def _deadline(self, key) -> float:
+        return max(self._pending[member]["deadline"] for member in self._groups.get(key, {key}) if member in self._pending)
+
+    def _settle(self, key, receipt) -> list:
+        """Menghapus `key` beserta kelompok penggantinya dari antrean; mengembalikan semua future-nya."""
+        futures = []
+        group = self._groups.get(key, {key})
+        for member in group:
+            self._groups.pop(member, None)
+            self._found.discard(member)
+            entry = self._pending.pop(member, None)
+            if entry is not None:
+                futures.extend(entry["futures"])
+            if len(group) > 1:
+                self._settled[member] = receipt
+        while len(self._settled) > self.history * 16:
+            self._settled.popitem(last=False)
+        return futures
+
+    def wait(self, tx_hash, timeout: float = None, check_existing: bool = False):
+        """Menunggu satu receipt; pengganti `wait_for_transaction_receipt`."""
+        return self.track(tx_hash, timeout=timeout, check_existing=check_existing).result()
+
+    def wait_all(self, tx_hashes, timeout: float = None, check_existing: bool = False) -> list:
+        """
+        Menunggu banyak receipt sekaligus.
+
+        Returns:
+            list: Receipt untuk setiap hash (urutan sama), atau exception jika gagal.
+        """
+        futures = [self.track(tx_hash, timeout=timeout, check_existing=check_existing) for tx_hash in tx_hashes]
+        return [future.exception() or future.result() for future in futures]
+
+    def _ensure_running(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="ReceiptTracker", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self._tick()
+            except Exception:
+                pass  # error RPC sementara; dicoba lagi pada putaran berikutnya
+            self._expire()
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+            time.sleep(self.poll_interval)
+
+    def _tick(self):
+        head = self.web3.eth.block_number
+        # Dibatasi ke 0: pada chain yang masih pendek, `head - lookback` bisa negatif.
+        start = max(0, head - self.lookback) if self._cursor is None else max(self._cursor, head - self.history, 0)
+        if start < head:
+            blocks = self._fetch_blocks(range(start + 1, head + 1))
+            with self._lock:
+                for block in blocks:
+                    hashes = {self.normalize(tx_hash) for tx_hash in block["transactions"]}
+                    self._recent[block["number"]] = hashes
+                    self._found.update(hashes & self._pending.keys())
+                while len(self._recent) > self.history:
+                    self._recent.popitem(last=False)
+            self._cursor = head
+
+        with self._lock:
+            found = list(self._found)
+        if not found:
+            return
+        for key, receipt in zip(found, self._fetch_receipts(found)):
+            with self._lock:
+                self._found.discard(key)
+                if receipt is None or key not in self._pending:
+                    continue  # belum masuk blok; ditunggu dari blok berikutnya
+                futures = self._settle(key, receipt)
+            for future in futures:
+                future.set_result(receipt)
+
+    def _expire(self):
+        now = time.time()
+        with self._lock:
+            # Hash dalam satu kelompok pengganti kedaluwarsa bersama.
+            expired = [key for key in self._pending if self._deadline(key) < now]
+            entries = [(key, self._pending.pop(key)) for key in expired]
+            self._found.difference_update(expired)
+            for key in expired:
+                self._groups.pop(key, None)
+        for key, entry in entries:
+            error = TimeExhausted("Receipt transaksi {} tidak ditemukan dalam batas waktu".format(key))
+            for future in entry["futures"]:
+                future.set_exception(error)
+
+    def _fetch_blocks(self, numbers):
+        try:
+            with self.web3.batch_requests() as batch:
+                for number in numbers:
+                    batch.add(self.web3.eth.get_block(number))
+                return batch.execute()
+        except Exception:
+            return [self.web3.eth.get_block(number) for number in numbers]
+
+    def _fetch_receipts(self, tx_hashes):
+        try:
+            with self.web3.batch_requests() as batch:
+                for tx_hash in tx_hashes:
+                    batch.add(self.web3.eth.get_transaction_receipt(tx_hash))
+                return batch.execute()
+        except Exception:
+            # Satu receipt yang belum ada membuat batch gagal; cek satu per satu.
+            return [self._single_receipt(tx_hash) for tx_hash in tx_hashes]
+
+    def _single_receipt(self, tx_hash):
+        try:
+            return self.web3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            return None
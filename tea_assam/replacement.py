@@ -0,0 +1,276 @@
+import os
+import threading
+import time
+import weakref
+
+from tea_assam.receipts import ReceiptTracker
+
+DEFAULT_STUCK_BLOCKS = 3
+DEFAULT_BUMP_PERCENT = 12
+MIN_BUMP_PERCENT = 10  # node menolak pengganti dengan kenaikan fee di bawah 10%
+DEFAULT_MAX_FEE_MULTIPLIER = 1.5  # fee pengganti paling tinggi 1,5x fee transaksi asli
+
+
+def replace_stuck_enabled(replace_stuck: bool = None) -> bool:
+    """Nilai `replace_stuck` efektif; None mengikuti TEA_ASSAM_REPLACE_STUCK (default mati)."""
+    if replace_stuck is None:
+        return os.environ.get("TEA_ASSAM_REPLACE_STUCK", "0").lower() not in ("0", "", "false", "no")
+    return replace_stuck
+
+
+def bump_fees(tx: dict, bump_percent: int = DEFAULT_BUMP_PERCENT, floor: dict = None) -> dict:
+    """
+    Mengembalikan salinan `tx` dengan fee dinaikkan paling sedikit `bump_percent` persen.
+
+    Transaksi legacy menaikkan `gasPrice`; transaksi EIP-1559 menaikkan
+    `maxFeePerGas` dan `maxPriorityFeePerGas` sekaligus (node mensyaratkan
+    keduanya naik). Fee di `floor` (misalnya biaya pasar terbaru dari GasOracle)
+    dipakai jika lebih tinggi.
+    """
+    if bump_percent < MIN_BUMP_PERCENT:
+        raise ValueError("Kenaikan fee pengganti minimal {}%".format(MIN_BUMP_PERCENT))
+    floor = floor or {}
+
+    def bumped(value):
+        # Pembulatan ke atas agar kenaikan tidak pernah kurang dari batas persentase.
+        return value + max(1, -(-value * bump_percent // 100))
+
+    tx = dict(tx)
+    if "gasPrice" in tx:
+        tx["gasPrice"] = max(bumped(tx["gasPrice"]), floor.get("gasPrice", 0))
+    else:
+        priority = max(bumped(tx["maxPriorityFeePerGas"]), floor.get("maxPriorityFeePerGas", 0))
+        tx["maxPriorityFeePerGas"] = priority
+        tx["maxFeePerGas"] = max(bumped(tx["maxFeePerGas"]), floor.get("maxFeePerGas", 0), priority)
+    return tx
+
+
+def _fee_of(tx: dict) -> int:
+    return tx.get("gasPrice", tx.get("maxFeePerGas", 0))
+
+
+class PendingTx:
+    """Transaksi yang diawasi TxLifecycleManager beserta semua hash penggantinya.
+
+    `future` selesai dengan receipt hash mana pun (asli atau pengganti) yang
+    lebih dulu masuk blok; `tx_hash` selalu hash yang terakhir dikirim.
+    """
+
+    def __init__(self, tx: dict, private_key: str, tx_hash: str, future, gas_oracle=None, on_replace=None,
+                 original_fee: int = None):
+        self.tx = tx
+        self.hashes = [tx_hash]
+        self.future = future
+        self.bumps = 0
+        self.sent_block = None
+        self.error = None
+        self._private_key = private_key
+        self._gas_oracle = gas_oracle
+        self._on_replace = on_replace
+        self._settling = False
+        self.original_fee = _fee_of(tx) if original_fee is None else original_fee
+
+    @property
+    def tx_hash(self) -> str:
+        return self.hashes[-1]
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: float = None):
+        """Menunggu dan mengembalikan receipt (dari hash asli atau pengganti)."""
+        return self.future.result(timeout)
+
+
+class TxLifecycleManager:
+    """Pengganti otomatis untuk transaksi yang tertahan di mempool.
+
+    Transaksi yang didaftarkan lewat `watch` diawasi oleh satu thread. Jika
+    belum masuk blok setelah `stuck_blocks` blok, transaksi ditandatangani ulang
+    dengan nonce yang sama dan fee dinaikkan (`bump_fees`), lalu dikirim. Semua
+    hash pengganti didaftarkan ke ReceiptTracker sebagai satu kelompok, sehingga
+    penantian hash asli (termasuk `ReceiptTracker.wait_all` di flow) selesai
+    dengan receipt hash mana pun yang lebih dulu masuk blok.
+
+    Kenaikan dibatasi `max_bumps` kali, `max_fee_multiplier` kali fee transaksi
+    asli, dan (jika diberikan) `max_fee_cap` wei per gas; setelah itu transaksi
+    hanya ditunggu sampai timeout. Flow hanya memakai manager ini jika
+    `replace_stuck=True` atau TEA_ASSAM_REPLACE_STUCK=1.
+    """
+
+    _instances = weakref.WeakKeyDictionary()
+    _instances_lock = threading.Lock()
+
+    def __init__(self, web3, stuck_blocks: int = DEFAULT_STUCK_BLOCKS, bump_percent: int = DEFAULT_BUMP_PERCENT,
+                 max_bumps: int = 5, max_fee_cap: int = None, max_fee_multiplier: float = DEFAULT_MAX_FEE_MULTIPLIER,
+                 poll_interval: float = 1.0, timeout: float = None):
+        """
+        Inisialisasi kelas TxLifecycleManager.
+
+        Args:
+            web3 (Web3): Koneksi Web3 untuk membaca blok dan mengirim pengganti.
+            stuck_blocks (int): Jumlah blok tanpa receipt sebelum transaksi diganti.
+            bump_percent (int): Kenaikan fee per penggantian dalam persen (minimal 10).
+            max_bumps (int): Maksimal penggantian per transaksi.
+            max_fee_cap (int): Batas atas `gasPrice`/`maxFeePerGas` (wei) pengganti, opsional.
+            max_fee_multiplier (float): Batas atas fee pengganti relatif terhadap fee
+                transaksi asli; None untuk tanpa batas relatif.
+            poll_interval (float): Jeda (detik) antar-pengecekan.
+            timeout (float): Batas waktu default menunggu receipt; default timeout ReceiptTracker.
+        """
+        if bump_percent < MIN_BUMP_PERCENT:
+            raise ValueError("Kenaikan fee pengganti minimal {}%".format(MIN_BUMP_PERCENT))
+        self.web3 = web3
+        self.stuck_blocks = stuck_blocks
+        self.bump_percent = bump_percent
+        self.max_bumps = max_bumps
+        self.max_fee_cap = max_fee_cap
+        self.max_fee_multiplier = max_fee_multiplier
+        self.poll_interval = poll_interval
+        self.tracker = ReceiptTracker.for_web3(web3)
+        self.timeout = self.tracker.timeout if timeout is None else timeout
+        self.replaced = 0
+        self._lock = threading.Lock()
+        self._watched = {}
+        self._thread = None
+
+    @classmethod
+    def for_web3(cls, web3):
+        """Mengembalikan manager bersama untuk satu koneksi Web3."""
+        with cls._instances_lock:
+            manager = cls._instances.get(web3)
+            if manager is None:
+                manager = cls(web3)
+                cls._instances[web3] = manager
+            return manager
+
+    def watch(self, tx: dict, private_key: str, tx_hash, gas_oracle=None, on_replace=None, timeout: float = None,
+              original_fee: int = None) -> PendingTx:
+        """
+        Mengawasi transaksi yang sudah dikirim dan menggantinya jika tertahan.
+
+        Args:
+            tx (dict): Transaksi yang ditandatangani (harus berisi `nonce` dan `from`).
+            private_key (str): Kunci untuk menandatangani pengganti.
+            tx_hash: Hash transaksi yang sudah dikirim.
+            gas_oracle (GasOracle): Jika diberikan, fee pengganti minimal sama dengan
+                biaya pasar terbaru (opsional).
+            on_replace (callable): Dipanggil dengan `(hash_baru, raw_tx_hex, tx_baru)`
+                setiap kali pengganti terkirim, misalnya untuk mencatat ke jurnal.
+            timeout (float): Batas waktu menunggu receipt.
+            original_fee (int): Fee transaksi pertama untuk `max_fee_multiplier`, jika `tx`
+                sudah berupa pengganti (misalnya dilanjutkan dari jurnal).
+
+        Returns:
+            PendingTx: Hash asli dan pengganti, serta future receipt.
+        """
+        if "from" not in tx:
+            tx = dict(tx, **{"from": self.web3.eth.account.from_key(private_key).address})
+        tx_hash = self.tracker.normalize(tx_hash)
+        future = self.tracker.track(tx_hash, timeout=self.timeout if timeout is None else timeout)
+        pending = PendingTx(tx, private_key, tx_hash, future, gas_oracle, on_replace, original_fee)
+        with self._lock:
+            self._watched[tx_hash] = pending
+            self._ensure_running()
+        future.add_done_callback(lambda _: self._forget(tx_hash))
+        return pending
+
+    def get(self, tx_hash):
+        """Mengembalikan PendingTx untuk hash asli yang masih diawasi, atau None."""
+        with self._lock:
+            return self._watched.get(self.tracker.normalize(tx_hash))
+
+    def _forget(self, tx_hash):
+        with self._lock:
+            self._watched.pop(tx_hash, None)
+
+    def _ensure_running(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="TxLifecycleManager", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self._tick()
+            except Exception:
+                pass  # error RPC sementara; dicoba lagi pada putaran berikutnya
+            with self._lock:
+                if not self._watched:
+                    self._thread = None
+                    return
+            time.sleep(self.poll_interval)
+
+    def _tick(self):
+        with self._lock:
+            watched = [pending for pending in self._watched.values() if not pending.done()]
+        if not watched:
+            return
+        # Blok terakhir yang dilihat ReceiptTracker; hemat satu `eth_blockNumber` per putaran.
+        head = self.tracker.head_block
+        if head is None:
+            head = self.web3.eth.block_number
+        mined_nonces = {}  # nonce terkonfirmasi per pengirim, dibaca sekali per putaran
+        for pending in watched:
+            if pending.sent_block is None:
+                pending.sent_block = head
+            elif (head - pending.sent_block >= self.stuck_blocks and pending.bumps < self.max_bumps
+                  and not pending._settling):
+                try:
+                    self._replace(pending, head, mined_nonces)
+                except Exception as e:
+                    pending.error = str(e)
+
+    def _over_cap(self, pending: PendingTx, new_tx: dict) -> bool:
+        fee = _fee_of(new_tx)
+        if self.max_fee_cap is not None and fee > self.max_fee_cap:
+            return True
+        return self.max_fee_multiplier is not None and fee > pending.original_fee * self.max_fee_multiplier
+
+    def _replace(self, pending: PendingTx, head: int, mined_nonces: dict):
+        tx = pending.tx
+        sender = tx["from"].lower()
+        if sender not in mined_nonces:
+            mined_nonces[sender] = self.web3.eth.get_transaction_count(tx["from"], "latest")
+        if mined_nonces[sender] > tx["nonce"]:
+            # Nonce sudah terpakai (oleh hash kita atau lainnya); tinggal menunggu receipt.
+            pending._settling = True
+            return
+
+        floor = pending._gas_oracle.fee_params() if pending._gas_oracle is not None else None
+        new_tx = bump_fees(tx, self.bump_percent, floor)
+        if self._over_cap(pending, new_tx):
+            pending._settling = True
+            return
+        signed_tx = self.web3.eth.account.sign_transaction(new_tx, pending._private_key)
+        new_hash = self.tracker.normalize(signed_tx.hash)
+        raw_tx = self.web3.to_hex(signed_tx.raw_transaction)
+        try:
+            self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        except Exception as e:
+            message = str(e).lower()
+            if "nonce too low" in message:
+                pending._settling = True
+                return
+            if "underpriced" in message:
+                # Fee pasar naik lebih cepat; kenaikan berikutnya dihitung dari fee ini.
+                pending.tx = new_tx
+                pending.bumps += 1
+                pending.error = str(e)
+                return
+            if "already known" not in message:
+                pending.error = str(e)
+                return
+
+        self.tracker.add_replacement(pending.hashes[0], new_hash)
+        pending.tx = new_tx
+        pending.hashes.append(new_hash)
+        pending.bumps += 1
+        pending.sent_block = head
+        pending.error = None
+        self.replaced += 1
+        if pending._on_replace is not None:
+            try:
+                pending._on_replace(new_hash, raw_tx, new_tx)
+            except Exception as e:
+                pending.error = str(e)
@@ -0,0 +1,245 @@
+import threading
+import time
+
+from tea_assam.metadata_cache import MetadataCache
+from tea_assam.multicall import Multicall
+from tea_assam.providers import DEFAULT_CHAIN_ID
+from tea_assam.quote import DEFAULT_FACTORY_ADDRESS, DEFAULT_FEE_BPS, get_amount_out
+
+# keccak256("Sync(uint112,uint112)") dan keccak256("PairCreated(address,address,address,uint256)")
+SYNC_TOPIC = "0x1c411e9a96e071241c2f21f7726b17ae89e3cab4c78be50e062b03a9fffbbad1"
+PAIR_CREATED_TOPIC = "0x0d3648bd0f6ba80134a33ba9275ac585d9d315f0ad8355cddefde31afa28d0e9"
+
+ROUTING_ABI = [
+    {"inputs": [], "name": "allPairsLength", "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}], "name": "allPairs", "outputs": [{"internalType": "address", "name": "", "type": "address"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "token0", "outputs": [{"internalType": "address", "name": "", "type": "address"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "token1", "outputs": [{"internalType": "address", "name": "", "type": "address"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "getReserves", "outputs": [{"internalType": "uint112", "name": "reserve0", "type": "uint112"}, {"internalType": "uint112", "name": "reserve1", "type": "uint112"}, {"internalType": "uint32", "name": "blockTimestampLast", "type": "uint32"}], "stateMutability": "view", "type": "function"}
+]
+
+
+def _topic_address(topic) -> str:
+    value = topic.hex() if isinstance(topic, (bytes, bytearray)) else str(topic)
+    return "0x" + value[-40:]
+
+
+def decode_words(data) -> list:
+    """Memecah data log menjadi list uint256 (satu per 32 byte)."""
+    value = bytes(data) if isinstance(data, (bytes, bytearray)) else bytes.fromhex(str(data)[2:])
+    return [int.from_bytes(value[i:i + 32], "big") for i in range(0, len(value), 32)]
+
+
+class PairGraph:
+    """Graf pair Uniswap V2 di memori untuk mencari rute swap terbaik.
+
+    Semua pair factory dibaca sekali (Multicall), lalu reserve diperbarui secara
+    bertahap dari event `Sync` dan pair baru dari event `PairCreated`. Pencarian
+    rute hanya memakai data di memori, tanpa RPC per query.
+    """
+
+    def __init__(self, web3, factory_address: str = DEFAULT_FACTORY_ADDRESS, fee_bps: int = DEFAULT_FEE_BPS,
+                 chain_id: int = DEFAULT_CHAIN_ID, multicall: Multicall = None, log_range: int = 2000):
+        """
+        Inisialisasi kelas PairGraph.
+
+        Args:
+            web3 (Web3): Koneksi Web3.
+            factory_address (str): Alamat factory Uniswap V2.
+            fee_bps (int): Fee swap dalam basis poin.
+            chain_id (int): Chain id untuk kunci cache.
+            multicall (Multicall): Multicall yang dipakai (opsional).
+            log_range (int): Jumlah blok maksimal per panggilan `eth_getLogs`.
+        """
+        self.web3 = web3
+        self.factory_address = web3.to_checksum_address(factory_address)
+        self.fee_bps = fee_bps
+        self.chain_id = chain_id
+        self.multicall = multicall or Multicall(web3)
+        self.metadata_cache = MetadataCache.default()
+        self.log_range = log_range
+        self.block_number = None
+        self._contract = web3.eth.contract(abi=ROUTING_ABI)
+        self._lock = threading.Lock()
+        self._pairs = {}  # pair (huruf kecil) -> [token0, token1, reserve0, reserve1]
+        self._edges = {}  # token (huruf kecil) -> {token lain: pair}
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _add_pair(self, pair: str, token0: str, token1: str, reserve0: int = 0, reserve1: int = 0):
+        pair, token0, token1 = pair.lower(), token0.lower(), token1.lower()
+        self._pairs[pair] = [token0, token1, reserve0, reserve1]
+        self._edges.setdefault(token0, {})[token1] = pair
+        self._edges.setdefault(token1, {})[token0] = pair
+
+    def load(self, block_identifier=None):
+        """Membaca semua pair factory beserta token dan reserve-nya pada satu blok."""
+        block_identifier = self.multicall.resolve_block(block_identifier)
+        total = self.multicall.call([
+            (self.factory_address, self._contract.encode_abi("allPairsLength"), ["uint256"])
+        ], block_identifier)[0] or 0
+        pairs = self.multicall.call([
+            (self.factory_address, self._contract.encode_abi("allPairs", args=[index]), ["address"])
+            for index in range(total)
+        ], block_identifier)
+        pairs = [pair for pair in pairs if pair]
+
+        tokens = {pair: self.metadata_cache.get(self.chain_id, "pair_tokens", pair) for pair in pairs}
+        missing = [pair for pair, value in tokens.items() if value is None]
+        calls = []
+        for pair in missing:
+            calls.append((pair, self._contract.encode_abi("token0"), ["address"]))
+            calls.append((pair, self._contract.encode_abi("token1"), ["address"]))
+        calls.extend((pair, self._contract.encode_abi("getReserves"), ["uint112", "uint112", "uint32"]) for pair in pairs)
+        values = self.multicall.call(calls, block_identifier)
+
+        fetched = {pair: [values[i * 2], values[i * 2 + 1]] for i, pair in enumerate(missing)}
+        self.metadata_cache.set_many(
+            self.chain_id, "pair_tokens", {pair: value for pair, value in fetched.items() if all(value)}
+        )
+        tokens.update(fetched)
+        reserves = values[len(missing) * 2:]
+
+        with self._lock:
+            self._pairs = {}
+            self._edges = {}
+            for pair, reserve in zip(pairs, reserves):
+                token0, token1 = tokens[pair]
+                if token0 and token1:
+                    self._add_pair(pair, token0, token1, *(reserve[:2] if reserve else (0, 0)))
+            self.block_number = block_identifier
+        return len(self._pairs)
+
+    def sync(self, to_block=None) -> int:
+        """
+        Memperbarui reserve dari event `Sync` dan menambah pair dari `PairCreated`.
+
+        Returns:
+            int: Jumlah event yang diproses.
+        """
+        if self.block_number is None:
+            self.load()
+            return 0
+        to_block = self.web3.eth.block_number if to_block is None else to_block
+        processed = 0
+        start = self.block_number + 1
+        while start <= to_block:
+            end = min(start + self.log_range - 1, to_block)
+            logs = self.web3.eth.get_logs({
+                "fromBlock": start,
+                "toBlock": end,
+                "topics": [[SYNC_TOPIC, PAIR_CREATED_TOPIC]],
+            })
+            logs = sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"]))
+            processed += self.apply_logs(logs)
+            with self._lock:
+                self.block_number = end
+            start = end + 1
+        return processed
+
+    def apply_logs(self, logs) -> int:
+        """Menerapkan log `Sync`/`PairCreated` yang sudah terurut ke graf."""
+        processed = 0
+        with self._lock:
+            for log in logs:
+                topic = self.web3.to_hex(log["topics"][0])
+                address = log["address"].lower()
+                if topic == PAIR_CREATED_TOPIC and address == self.factory_address.lower():
+                    words = decode_words(log["data"])
+                    pair = "0x{:040x}".format(words[0])
+                    self._add_pair(pair, _topic_address(log["topics"][1]), _topic_address(log["topics"][2]))
+                    processed += 1
+                elif topic == SYNC_TOPIC and address in self._pairs:
+                    reserve0, reserve1 = decode_words(log["data"])[:2]
+                    self._pairs[address][2] = reserve0
+                    self._pairs[address][3] = reserve1
+                    processed += 1
+        return processed
+
+    def start(self, poll_interval: float = 2.0):
+        """Menjalankan `sync()` secara berkala di thread latar belakang."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.is_set():
+                try:
+                    self.sync()
+                except Exception:
+                    pass  # error RPC sementara; dicoba lagi pada putaran berikutnya
+                self._stop.wait(poll_interval)
+
+        self._thread = threading.Thread(target=_run, name="PairGraph", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def reserves(self, token_in: str, token_out: str):
+        """Mengembalikan `(reserve_in, reserve_out)` pair token, atau None jika tidak ada."""
+        with self._lock:
+            return self._reserves(token_in.lower(), token_out.lower())
+
+    def _reserves(self, token_in, token_out):
+        pair = self._edges.get(token_in, {}).get(token_out)
+        if pair is None:
+            return None
+        token0, _, reserve0, reserve1 = self._pairs[pair]
+        return (reserve0, reserve1) if token0 == token_in else (reserve1, reserve0)
+
+    def quote_path(self, amount_in: int, path: list) -> int:
+        """Jumlah output untuk `amount_in` melalui `path` memakai reserve di memori."""
+        amount = amount_in
+        with self._lock:
+            for token_in, token_out in zip(path[:-1], path[1:]):
+                reserves = self._reserves(token_in.lower(), token_out.lower())
+                if reserves is None:
+                    return 0
+                amount = get_amount_out(amount, *reserves, self.fee_bps)
+        return amount
+
+    def best_route(self, amount_in: int, token_in: str, token_out: str, max_hops: int = 3):
+        """
+        Mencari rute dengan output terbesar untuk `amount_in`, maksimal `max_hops` pair.
+
+        Untuk setiap jumlah hop, hanya jumlah terbesar yang mencapai tiap token
+        yang diteruskan (output swap naik monoton terhadap input), sehingga
+        pencarian tetap cepat pada graf besar.
+
+        Returns:
+            dict atau None: `{"path", "amount_out", "hops", "search_ms"}` dengan alamat
+                checksum, atau None jika tidak ada rute.
+        """
+        start = time.time()
+        source, target = token_in.lower(), token_out.lower()
+        best = None
+        with self._lock:
+            frontier = {source: (amount_in, [source])}
+            for _ in range(max_hops):
+                next_frontier = {}
+                for token, (amount, path) in frontier.items():
+                    for neighbor in self._edges.get(token, {}):
+                        if neighbor in path:
+                            continue
+                        amount_out = get_amount_out(amount, *self._reserves(token, neighbor), self.fee_bps)
+                        if amount_out <= 0:
+                            continue
+                        if neighbor == target:
+                            if best is None or amount_out > best[0]:
+                                best = (amount_out, path + [neighbor])
+                            continue
+                        current = next_frontier.get(neighbor)
+                        if current is None or amount_out > current[0]:
+                            next_frontier[neighbor] = (amount_out, path + [neighbor])
+                frontier = next_frontier
+                if not frontier:
+                    break
+        if best is None:
+            return None
+        return {
+            "path": [self.web3.to_checksum_address(token) for token in best[1]],
+            "amount_out": best[0],
+            "hops": len(best[1]) - 1,
+            "search_ms": (time.time() - start) * 1000,
+        }
@@ -0,0 +1,152 @@
+import csv
+
+from tea_assam.abi import ERC20_ABI, encode_allowance, encode_balance_of, get_contract
+from tea_assam.metadata_cache import MetadataCache
+from tea_assam.multicall import Multicall
+from tea_assam.providers import DEFAULT_CHAIN_ID
+
+
+class Snapshot:
+    """Hasil snapshot saldo (dan allowance) holder × token pada satu blok.
+
+    Nilai disimpan dalam list datar berurutan per holder lalu per token, sehingga
+    ribuan holder tidak membuat ribuan dict. Nilai None berarti panggilan gagal
+    (misalnya kontrak bukan ERC-20).
+    """
+
+    def __init__(self, block_number: int, holders: list, tokens: list, decimals: list, balances: list,
+                 spenders: list = None, allowances: list = None):
+        self.block_number = block_number
+        self.holders = holders
+        self.tokens = tokens
+        self.decimals = decimals
+        self.balances = balances
+        self.spenders = spenders or []
+        self.allowances = allowances or []
+        self._holder_index = {holder.lower(): i for i, holder in enumerate(holders)}
+        self._token_index = {token.lower(): i for i, token in enumerate(tokens)}
+        self._spender_index = {spender.lower(): i for i, spender in enumerate(self.spenders)}
+
+    def _offset(self, holder: str, token: str) -> int:
+        return self._holder_index[holder.lower()] * len(self.tokens) + self._token_index[token.lower()]
+
+    def balance(self, holder: str, token: str):
+        """Saldo `holder` untuk `token` dalam satuan terkecil (wei)."""
+        return self.balances[self._offset(holder, token)]
+
+    def allowance(self, holder: str, token: str, spender: str):
+        """Allowance `holder` kepada `spender` untuk `token` dalam satuan terkecil."""
+        offset = self._offset(holder, token) * len(self.spenders) + self._spender_index[spender.lower()]
+        return self.allowances[offset]
+
+    def rows(self):
+        """
+        Menghasilkan satu baris per holder × token.
+
+        Yields:
+            dict: `block_number`, `holder`, `token`, `decimals`, `balance`, lalu
+                `allowance:<spender>` untuk setiap spender.
+        """
+        for h, holder in enumerate(self.holders):
+            for t, token in enumerate(self.tokens):
+                offset = h * len(self.tokens) + t
+                row = {
+                    "block_number": self.block_number,
+                    "holder": holder,
+                    "token": token,
+                    "decimals": self.decimals[t],
+                    "balance": self.balances[offset],
+                }
+                for s, spender in enumerate(self.spenders):
+                    row["allowance:{}".format(spender)] = self.allowances[offset * len(self.spenders) + s]
+                yield row
+
+    def _columns(self) -> list:
+        return ["block_number", "holder", "token", "decimals", "balance"] + [
+            "allowance:{}".format(spender) for spender in self.spenders
+        ]
+
+    def to_csv(self, path: str):
+        """Menyimpan snapshot ke file CSV; nilai uint256 ditulis utuh sebagai bilangan bulat."""
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self._columns())
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+    def to_parquet(self, path: str):
+        """
+        Menyimpan snapshot ke file Parquet (memerlukan `pyarrow`).
+
+        Saldo dan allowance disimpan sebagai string karena uint256 melebihi
+        tipe integer Parquet.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Ekspor Parquet memerlukan pyarrow: pip install pyarrow") from e
+
+        columns = {column: [] for column in self._columns()}
+        for row in self.rows():
+            for column, value in row.items():
+                columns[column].append(value)
+        table = pa.table({
+            column: values if column in ("block_number", "holder", "token", "decimals")
+            else [None if value is None else str(value) for value in values]
+            for column, values in columns.items()
+        })
+        pq.write_table(table, path)
+
+
+def take_snapshot(web3, holders: list, tokens: list, spenders: list = None, block_identifier=None,
+                  multicall: Multicall = None, metadata_cache: MetadataCache = None,
+                  chain_id: int = DEFAULT_CHAIN_ID) -> Snapshot:
+    """
+    Membaca saldo (dan allowance) banyak holder untuk beberapa token pada satu blok.
+
+    Semua `balanceOf`/`allowance` dikirim lewat Multicall (atau JSON-RPC batch jika
+    Multicall3 tidak tersedia); `decimals` diambil dari MetadataCache.
+
+    Args:
+        web3 (Web3): Koneksi Web3.
+        holders (list): Alamat holder.
+        tokens (list): Alamat kontrak token ERC-20.
+        spenders (list): Alamat spender untuk allowance (opsional).
+        block_identifier: Nomor blok; default blok terbaru saat dipanggil.
+        multicall (Multicall): Multicall yang dipakai (opsional).
+        metadata_cache (MetadataCache): Cache `decimals` (opsional).
+        chain_id (int): Chain id untuk kunci cache.
+
+    Returns:
+        Snapshot: Hasil yang terkunci pada satu nomor blok.
+    """
+    multicall = multicall or Multicall(web3)
+    metadata_cache = metadata_cache or MetadataCache.default()
+    contract = get_contract(web3, abi=ERC20_ABI)
+    holders = [web3.to_checksum_address(holder) for holder in holders]
+    tokens = [web3.to_checksum_address(token) for token in tokens]
+    spenders = [web3.to_checksum_address(spender) for spender in spenders or []]
+    block_number = multicall.resolve_block(block_identifier)
+
+    decimals = [metadata_cache.get(chain_id, "decimals", token) for token in tokens]
+    missing = [token for token, value in zip(tokens, decimals) if value is None]
+    if missing:
+        fetched = dict(zip(missing, multicall.call(
+            [(token, contract.encode_abi("decimals"), ["uint8"]) for token in missing], block_number
+        )))
+        metadata_cache.set_many(chain_id, "decimals", {token: value for token, value in fetched.items() if value is not None})
+        decimals = [fetched.get(token, value) for token, value in zip(tokens, decimals)]
+
+    # Calldata sama untuk semua token, jadi cukup di-encode sekali per holder (dan spender).
+    balance_calls = [encode_balance_of(holder) for holder in holders]
+    balances = multicall.call([
+        (token, call_data, ["uint256"])
+        for call_data in balance_calls for token in tokens
+    ], block_number)
+    allowance_calls = [[encode_allowance(holder, spender) for spender in spenders] for holder in holders]
+    allowances = multicall.call([
+        (token, call_data, ["uint256"])
+        for holder_calls in allowance_calls for token in tokens for call_data in holder_calls
+    ], block_number)
+
+    return Snapshot(block_number, holders, tokens, decimals, balances, spenders, allowances)
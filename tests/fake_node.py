@@ -0,0 +1,123 @@
+import threading
+
+import rlp
+from eth_account import Account
+from web3 import Web3
+from web3.providers import JSONBaseProvider
+
+CHAIN_ID = 93384
+
+
+class FakeNode(JSONBaseProvider):
+    """Node JSON-RPC di memori: setiap transaksi yang diterima langsung ditambang di blok baru.
+
+    Transaksi dengan nonce di atas nonce berikutnya ditahan di antrean sampai celahnya
+    terisi, seperti mempool. `fail_nonces` berisi nonce yang ditolak saat dikirim
+    (satu entri per penolakan) dan `revert_nonces` nonce yang ditambang dengan status 0.
+    """
+
+    def __init__(self, start_block: int = 100, gas_estimate: int = 50000):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.block_number = start_block
+        self.gas_estimate = gas_estimate
+        self.nonces = {}
+        self.blocks = {}
+        self.receipts = {}
+        self.sent = []
+        self.queued = {}
+        self.fail_nonces = []
+        self.revert_nonces = set()
+
+    def _tx_fields(self, raw: bytes) -> tuple:
+        sender = Account.recover_transaction(raw)
+        fields = rlp.decode(raw[1:]) if raw[0] < 0x80 else rlp.decode(raw)
+        nonce_field = fields[1] if raw[0] < 0x80 else fields[0]
+        return sender.lower(), int.from_bytes(nonce_field, "big")
+
+    def _block(self, number: int) -> dict:
+        return {
+            "number": hex(number),
+            "hash": "0x{:064x}".format(number),
+            "parentHash": "0x{:064x}".format(max(0, number - 1)),
+            "timestamp": hex(number),
+            "gasLimit": hex(30000000),
+            "transactions": self.blocks.get(number, []),
+        }
+
+    def _send(self, raw_hex: str) -> str:
+        raw = bytes.fromhex(raw_hex[2:])
+        sender, nonce = self._tx_fields(raw)
+        if nonce in self.fail_nonces:
+            self.fail_nonces.remove(nonce)
+            raise ValueError("simulasi: node menolak transaksi")
+        expected = self.nonces.get(sender, 0)
+        if nonce < expected:
+            raise ValueError("nonce too low")
+        tx_hash = Web3.to_hex(Web3.keccak(raw))
+        queue = self.queued.setdefault(sender, {})
+        queue[nonce] = tx_hash
+        while self.nonces.get(sender, 0) in queue:
+            self._mine(sender, self.nonces.get(sender, 0), queue.pop(self.nonces.get(sender, 0)))
+        return tx_hash
+
+    def _mine(self, sender: str, nonce: int, tx_hash: str):
+        self.nonces[sender] = nonce + 1
+        self.block_number += 1
+        self.blocks[self.block_number] = [tx_hash]
+        self.receipts[tx_hash] = {
+            "transactionHash": tx_hash,
+            "transactionIndex": "0x0",
+            "blockNumber": hex(self.block_number),
+            "blockHash": "0x{:064x}".format(self.block_number),
+            "from": sender,
+            "to": None,
+            "status": "0x0" if nonce in self.revert_nonces else "0x1",
+            "gasUsed": hex(self.gas_estimate),
+            "cumulativeGasUsed": hex(self.gas_estimate),
+            "effectiveGasPrice": "0x1",
+            "logs": [],
+            "logsBloom": "0x" + "00" * 256,
+            "contractAddress": None,
+            "type": "0x0",
+        }
+        self.sent.append((sender, nonce, tx_hash))
+
+    def _result(self, method, params):
+        if method == "eth_chainId":
+            return hex(CHAIN_ID)
+        if method == "eth_blockNumber":
+            return hex(self.block_number)
+        if method == "eth_gasPrice":
+            return "0x1"
+        if method == "eth_estimateGas":
+            return hex(self.gas_estimate)
+        if method == "eth_getTransactionCount":
+            return hex(self.nonces.get(params[0].lower(), 0))
+        if method == "eth_getBlockByNumber":
+            number = self.block_number if params[0] == "latest" else int(params[0], 16)
+            if number < 0:
+                raise ValueError("nomor blok tidak valid: {}".format(params[0]))
+            return self._block(number) if number <= self.block_number else None
+        if method == "eth_getTransactionReceipt":
+            return self.receipts.get(params[0].lower())
+        if method == "eth_sendRawTransaction":
+            return self._send(params[0])
+        raise ValueError("method {} tidak didukung node palsu".format(method))
+
+    def make_request(self, method, params):
+        with self.lock:
+            try:
+                return {"jsonrpc": "2.0", "id": 1, "result": self._result(method, params)}
+            except ValueError as e:
+                return {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": str(e)}}
+
+    def make_batch_request(self, requests):
+        return [self.make_request(method, params) for method, params in requests]
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return True
+
+
+def fake_web3(**kwargs) -> Web3:
+    return Web3(FakeNode(**kwargs))
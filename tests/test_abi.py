@@ -0,0 +1,20 @@
+from web3 import Web3
+
+from tea_assam.abi import ERC20_ABI, FACTORY_ABI, get_contract
+
+ADDRESS = "0x" + "11" * 20
+
+
+def test_contract_cache_keys_abi_by_content():
+    web3 = Web3()
+    assert get_contract(web3, ADDRESS, ERC20_ABI) is get_contract(web3, ADDRESS, ERC20_ABI)
+    # ABI yang dibuat ulang dengan isi sama memakai kontrak yang sama.
+    assert get_contract(web3, ADDRESS, [dict(item) for item in FACTORY_ABI]) is get_contract(web3, ADDRESS, FACTORY_ABI)
+
+
+def test_contract_cache_does_not_reuse_freed_abi_ids():
+    web3 = Web3()
+    first = get_contract(web3, ADDRESS, [{"type": "function", "name": "a", "inputs": [], "outputs": []}])
+    second = get_contract(web3, ADDRESS, [{"type": "function", "name": "b", "inputs": [], "outputs": []}])
+    assert first is not second
+    assert [item["name"] for item in second.abi] == ["b"]
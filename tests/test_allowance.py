@@ -0,0 +1,57 @@
+import tea_assam.allowance as allowance_module
+from tea_assam.allowance import AllowanceManager
+
+TOKEN = "0x" + "aa" * 20
+OWNER = "0x" + "bb" * 20
+SPENDER = "0x" + "cc" * 20
+
+
+class FakeToken:
+    def __init__(self, allowances):
+        self.allowances = allowances
+        self.reads = 0
+        self.functions = self
+
+    def allowance(self, owner, spender):
+        return self
+
+    def call(self):
+        self.reads += 1
+        return self.allowances.pop(0)
+
+
+def _patch_token(monkeypatch, *allowances):
+    token = FakeToken(list(allowances))
+    monkeypatch.setattr(allowance_module, "get_contract", lambda web3, address, abi: token)
+    return token
+
+
+def test_stale_allowance_is_read_again(monkeypatch):
+    token = _patch_token(monkeypatch, 100, 0)
+    manager = AllowanceManager(ttl=60)
+    assert manager.required_approval(None, 1, TOKEN, OWNER, SPENDER, 50) is None
+    assert manager.required_approval(None, 1, TOKEN, OWNER, SPENDER, 50) is None
+    assert token.reads == 1
+
+    # Allowance dicabut di luar proses: setelah TTL lewat approve dikirim lagi.
+    manager.ttl = 0
+    assert manager.required_approval(None, 1, TOKEN, OWNER, SPENDER, 50) == 50
+    assert token.reads == 2
+
+
+def test_allowance_is_cached_per_chain(monkeypatch):
+    token = _patch_token(monkeypatch, 100, 0)
+    manager = AllowanceManager()
+    assert manager.get(None, 1, TOKEN, OWNER, SPENDER) == 100
+    assert manager.get(None, 2, TOKEN, OWNER, SPENDER) == 0
+    assert token.reads == 2
+
+
+def test_invalidate_after_failed_tx(monkeypatch):
+    token = _patch_token(monkeypatch, 0)
+    manager = AllowanceManager()
+    manager.record_approval(1, TOKEN, OWNER, SPENDER, 100)
+    assert manager.required_approval(None, 1, TOKEN, OWNER, SPENDER, 50) is None
+    manager.invalidate(1, TOKEN, OWNER, SPENDER)
+    assert manager.required_approval(None, 1, TOKEN, OWNER, SPENDER, 50) == 50
+    assert token.reads == 1
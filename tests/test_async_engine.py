@@ -0,0 +1,89 @@
+import asyncio
+import threading
+
+from tea_assam.async_engine import run_in_thread
+from transfer_token.batch_transfer import TeaAssamBatchTransfer
+
+
+def test_run_in_thread_does_not_block_loop():
+    def blocking(value, suffix=""):
+        return threading.current_thread(), value + suffix
+
+    async def main():
+        return await run_in_thread(blocking, "ok", suffix="!")
+
+    thread, result = asyncio.run(main())
+    assert result == "ok!"
+    assert thread is not threading.main_thread()
+
+
+def test_async_entry_point_runs_sync_flow():
+    flow = TeaAssamBatchTransfer.__new__(TeaAssamBatchTransfer)
+    flow.run = lambda: [{"step": "final", "status": "sukses"}]
+
+    # Jalur async tidak punya implementasi sendiri: hasilnya persis hasil `run`.
+    assert asyncio.run(flow.run_async()) == [{"step": "final", "status": "sukses"}]
+
+
+def test_async_provider_records_requests(monkeypatch):
+    from web3 import AsyncWeb3
+
+    from tea_assam.async_engine import RecordingAsyncHTTPProvider
+    from tea_assam.instrumentation import RpcRecorder
+
+    async def fake_make_request(provider, method, params):
+        if method == "eth_call":
+            return {"jsonrpc": "2.0", "id": 1, "error": {"code": 3, "message": "execution reverted"}}
+        return {"jsonrpc": "2.0", "id": 1, "result": "0x1"}
+
+    monkeypatch.setattr(AsyncWeb3.AsyncHTTPProvider, "make_request", fake_make_request)
+    recorder = RpcRecorder.default()
+    recorder.reset()
+    provider = RecordingAsyncHTTPProvider("http://localhost:8545")
+
+    async def main():
+        await provider.make_request("eth_blockNumber", [])
+        await provider.make_request("eth_call", [])
+
+    asyncio.run(main())
+    stats = recorder.stats()
+    assert stats["eth_blockNumber"]["count"] == 1 and stats["eth_blockNumber"]["errors"] == 0
+    assert stats["eth_call"]["errors"] == 1
+    recorder.reset()
+
+
+def test_set_max_workers_replaces_executor():
+    from tea_assam import async_engine
+
+    async_engine.set_max_workers(2)
+    executor = async_engine.get_executor()
+    assert executor._max_workers == 2
+    assert async_engine.get_executor() is executor
+
+    async def main():
+        return await run_in_thread(lambda: threading.current_thread().name)
+
+    assert asyncio.run(main()).startswith("tea-assam-async")
+    async_engine.set_max_workers(async_engine.DEFAULT_MAX_WORKERS)
+
+
+def test_transfer_async_runs_against_node(monkeypatch):
+    from eth_account import Account
+
+    from fake_node import fake_web3
+    from tea_assam.receipts import ReceiptTracker
+    from transfer_token import transfer as transfer_module
+
+    web3 = fake_web3()
+    monkeypatch.setattr(transfer_module, "get_web3", lambda **kwargs: web3)
+    ReceiptTracker.for_web3(web3).poll_interval = 0.01
+    sender = Account.create()
+    recipients = [Account.create().address for _ in range(3)]
+    flow = transfer_module.TransferToken(
+        sender.key.hex(), sender.address, "0x" + "11" * 20, 1, recipients, rpc_urls=["http://fake"]
+    )
+
+    results = asyncio.run(flow.transfer_async(1, pipeline=True))
+
+    assert [result["status"] for result in results] == ["sukses"] * 3
+    assert [nonce for _, nonce, _ in web3.provider.sent] == [0, 1, 2]
@@ -0,0 +1,73 @@
+import json
+from types import SimpleNamespace
+
+from tea_assam.gas import COLD_SSTORE_GAS
+from transfer_token.batch_transfer import TeaAssamBatchTransfer
+
+BASE_GAS = 30000
+WARM_RECIPIENT_GAS = 10000
+HOLDERS = ["0x" + "{:02x}".format(index) * 20 for index in range(1, 21)]
+FRESH = ["0x" + "{:02x}".format(index) * 20 for index in range(0x81, 0x81 + 20)]
+
+
+class FakeEth:
+    def estimate_gas(self, tx):
+        data = tx["data"]
+        gas = BASE_GAS
+        for address in HOLDERS:
+            gas += WARM_RECIPIENT_GAS * data.count(address[2:])
+        for address in FRESH:
+            gas += (WARM_RECIPIENT_GAS + COLD_SSTORE_GAS) * data.count(address[2:])
+        return gas
+
+    def get_block(self, block):
+        return {"gasLimit": 30000000}
+
+
+def _batch():
+    batch = TeaAssamBatchTransfer.__new__(TeaAssamBatchTransfer)
+    batch.web3 = SimpleNamespace(eth=FakeEth())
+    batch.sender_address = "0x" + "ee" * 20
+    batch.batch_transfer_contract = SimpleNamespace(address="0x" + "dd" * 20)
+    batch.TOKEN_BATH_ADDRESS = "0x" + "cc" * 20
+    batch.amount_per_address = 10**18
+    return batch
+
+
+def test_chunk_gas_covers_fresh_recipients_after_warm_probe():
+    # Probe hanya berisi holder lama; chunk berikutnya berisi penerima baru.
+    max_chunk_size, gas_for = _batch().estimate_chunk_gas(HOLDERS, gas_budget=1000000)
+    needed = FakeEth().estimate_gas({"data": "".join(FRESH)})
+    assert gas_for(FRESH) >= needed
+    # Ukuran chunk tetap muat dalam budget meski semua penerimanya baru.
+    worst = BASE_GAS + max_chunk_size * (WARM_RECIPIENT_GAS + COLD_SSTORE_GAS)
+    assert worst * 1.2 <= 1000000
+
+
+def _stream_batch():
+    batch = _batch()
+    batch.chain_id = 93384
+    batch.batch_transfer_contract_address = batch.batch_transfer_contract.address
+    return batch
+
+
+def test_checkpoint_from_other_run_is_refused(tmp_path):
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    batch = _stream_batch()
+    identity = batch._checkpoint_identity(HOLDERS, len(HOLDERS))
+    identity["token"] = "0x" + "99" * 20
+    with open(checkpoint_path, "w") as f:
+        json.dump({"approve_tx_hash": "dilewati", "chunks": [], "identity": identity}, f)
+
+    result = batch.run_stream(HOLDERS, checkpoint_path)
+    assert result[-1]["status"] == "gagal"
+    assert "token" in result[-1]["error"]
+
+
+def test_checkpoint_identity_tracks_recipient_content(tmp_path):
+    batch = _stream_batch()
+    path = tmp_path / "recipients.txt"
+    path.write_text("\n".join(HOLDERS))
+    first = batch._checkpoint_identity(str(path), len(HOLDERS))
+    path.write_text("\n".join(FRESH))
+    assert batch._checkpoint_identity(str(path), len(FRESH))["recipients_sha256"] != first["recipients_sha256"]
@@ -0,0 +1,114 @@
+from web3 import Web3
+
+from swaps_tokens.DexChecker import DexChecker
+
+PAIR = Web3.to_checksum_address("0x" + "a1" * 20)
+TOKEN0 = Web3.to_checksum_address("0x" + "a2" * 20)
+TOKEN1 = Web3.to_checksum_address("0x" + "a3" * 20)
+
+
+class FakeMulticall:
+    def __init__(self):
+        self.blocks = []
+
+    def resolve_block(self, block_identifier):
+        return 1234 if block_identifier is None else block_identifier
+
+    def call(self, calls, block_identifier):
+        self.blocks.append(block_identifier)
+        if len(self.blocks) == 1:
+            return [TOKEN0, TOKEN1, 10**18, 18]
+        # balanceOf token0/token1, lalu decimals token yang belum ada di cache.
+        return [2 * 10**18, 10**18] + [18] * (len(calls) - 2)
+
+
+class FailingMulticall:
+    def resolve_block(self, block_identifier):
+        raise AssertionError("koneksi bersama kelas tidak boleh dipakai")
+
+    call = resolve_block
+
+
+def test_lp_details_read_from_instance_connection(monkeypatch):
+    monkeypatch.setattr(DexChecker, "_shared_web3", Web3())
+    monkeypatch.setattr(DexChecker, "_shared_multicall", FailingMulticall())
+    checker = DexChecker.__new__(DexChecker)
+    checker.web3 = Web3()
+    checker.multicall = FakeMulticall()
+    checker.reserve_indexer = None
+
+    detail = checker.get_lp_token_details(PAIR)
+    assert detail["reserve_token0"] == 2.0
+    assert detail["block_number"] == 1234
+    assert checker.multicall.blocks == [1234, 1234]
+
+
+def _selector(signature):
+    return "0x" + Web3.keccak(text=signature)[:4].hex().removeprefix("0x")
+
+
+ANSWERS = {
+    _selector("token0()"): TOKEN0,
+    _selector("token1()"): TOKEN1,
+    _selector("totalSupply()"): 10**18,
+    _selector("decimals()"): 18,
+    _selector("getReserves()"): (3 * 10**18, 10**18, 0),
+    _selector("balanceOf(address)"): 10**18,
+}
+
+
+class SelectorMulticall:
+    def __init__(self):
+        self.selectors = []
+
+    def resolve_block(self, block_identifier):
+        return 1234 if block_identifier is None else block_identifier
+
+    def call(self, calls, block_identifier):
+        selectors = [calldata[:10] for _, calldata, _ in calls]
+        self.selectors.extend(selectors)
+        return [ANSWERS[selector] for selector in selectors]
+
+
+def _indexer(last_block):
+    from tea_assam.indexer import ReserveIndexer
+
+    indexer = ReserveIndexer(None)
+    data = (5 * 10**18).to_bytes(32, "big") + (10**18).to_bytes(32, "big")
+    indexer._store_logs([{"address": PAIR, "blockNumber": 1200, "logIndex": 0, "data": data}], last_block, "0x00")
+    return indexer
+
+
+def _checker(reserve_indexer):
+    checker = DexChecker.__new__(DexChecker)
+    checker.web3 = Web3()
+    checker.multicall = SelectorMulticall()
+    checker.reserve_indexer = reserve_indexer
+    return checker
+
+
+def test_lp_details_use_synced_indexer():
+    checker = _checker(_indexer(1234))
+
+    detail = checker.get_lp_token_details(PAIR)
+    assert detail["reserve_token0"] == 5.0
+    assert _selector("balanceOf(address)") not in checker.multicall.selectors
+
+
+def test_lp_details_fall_back_when_indexer_lags():
+    checker = _checker(_indexer(1200))
+
+    detail = checker.get_lp_token_details(PAIR)
+    assert detail["reserve_token0"] == 1.0
+    assert checker.multicall.selectors.count(_selector("balanceOf(address)")) == 2
+
+
+def test_scan_skips_get_reserves_for_indexed_pairs(monkeypatch):
+    multicall = SelectorMulticall()
+    monkeypatch.setattr(DexChecker, "_shared_web3", Web3())
+    monkeypatch.setattr(DexChecker, "_shared_multicall", multicall)
+    other = Web3.to_checksum_address("0x" + "a4" * 20)
+
+    rows = DexChecker.scan([PAIR, other], reserve_indexer=_indexer(1234))
+    assert [row["reserve_token0"] for row in rows] == [5.0, 3.0]
+    assert multicall.selectors.count(_selector("getReserves()")) == 1
@@ -0,0 +1,45 @@
+from tea_assam.abi import encode_transfer
+from tea_assam.gas import COLD_SSTORE_GAS, GasOracle
+
+TOKEN = "0x" + "aa" * 20
+WARM_TRANSFER_GAS = 35000
+FRESH_TRANSFER_GAS = WARM_TRANSFER_GAS + COLD_SSTORE_GAS
+
+
+class FakeEth:
+    chain_id = 424242
+
+    def __init__(self, estimates):
+        self.estimates = estimates
+
+    def estimate_gas(self, tx):
+        return self.estimates.pop(0)
+
+
+class FakeWeb3:
+    def __init__(self, estimates):
+        self.eth = FakeEth(estimates)
+
+
+def _transfer_tx(recipient):
+    return {"to": TOKEN, "data": encode_transfer(recipient, 10**18), "chainId": FakeEth.chain_id}
+
+
+def test_cached_shape_does_not_undershoot_fresh_recipient():
+    GasOracle._gas_cache.clear()
+    oracle = GasOracle(FakeWeb3([WARM_TRANSFER_GAS]), gas_price=1)
+    # Estimasi pertama: penerima yang sudah punya saldo (slot hangat).
+    assert oracle.gas_limit(_transfer_tx("0x" + "11" * 20)) == int(WARM_TRANSFER_GAS * 1.2)
+
+    # Penerima baru berbentuk sama memakai cache, tetapi butuh SSTORE nol→bukan nol.
+    cached = oracle.gas_limit(_transfer_tx("0x" + "22" * 20))
+    assert cached >= FRESH_TRANSFER_GAS
+    GasOracle._gas_cache.clear()
+
+
+def test_uncached_estimate_per_tx():
+    GasOracle._gas_cache.clear()
+    oracle = GasOracle(FakeWeb3([WARM_TRANSFER_GAS, FRESH_TRANSFER_GAS]), gas_price=1)
+    oracle.gas_limit(_transfer_tx("0x" + "11" * 20))
+    assert oracle.gas_limit(_transfer_tx("0x" + "22" * 20), use_cache=False) == int(FRESH_TRANSFER_GAS * 1.2)
+    GasOracle._gas_cache.clear()
@@ -0,0 +1,18 @@
+from tea_assam.indexer import ReserveIndexer
+
+
+def test_is_synced_compares_last_block_with_head():
+    indexer = ReserveIndexer(None)
+    assert not indexer.is_synced(100)
+
+    indexer.rollback(98)
+    assert not indexer.is_synced(100)
+    assert indexer.is_synced(100, max_lag=2)
+    assert indexer.is_synced(98)
+
+
+def test_is_synced_allows_configured_confirmations():
+    indexer = ReserveIndexer(None, confirmations=3)
+    indexer.rollback(97)
+    assert indexer.is_synced(100)
+    assert not indexer.is_synced(101)
@@ -0,0 +1,48 @@
+import pytest
+
+from tea_assam.nonce_manager import NonceManager
+
+
+class FakeNonceManager(NonceManager):
+    def __init__(self, chain_nonce=7):
+        super().__init__(None, "0x" + "11" * 20)
+        self.chain_nonce = chain_nonce
+
+    def _fetch_pending(self):
+        return self.chain_nonce
+
+
+def test_already_known_keeps_nonce():
+    manager = FakeNonceManager()
+
+    def send_fn(nonce):
+        raise ValueError({"code": -32000, "message": "already known"})
+
+    with pytest.raises(ValueError):
+        manager.send(send_fn)
+    # Nonce 7 sudah tersiar; penerima berikutnya tidak boleh memakainya lagi.
+    assert manager.next() == 8
+
+
+def test_released_top_nonces_are_not_gaps():
+    manager = FakeNonceManager()
+    nonces = [manager.next() for _ in range(3)]
+    manager.release(nonces[1])
+    manager.release(nonces[2])
+    assert manager.take_gaps() == []
+    assert manager.next() == 8
+
+
+def test_released_nonce_below_broadcast_is_a_gap():
+    manager = FakeNonceManager()
+    nonces = [manager.next() for _ in range(4)]
+    manager.release(nonces[1])
+    assert manager.take_gaps() == [8]
+    assert manager.next() == 11
+
+
+def test_managers_are_shared_per_chain_and_address():
+    address = "0x" + "ab" * 20
+    first = NonceManager.for_address(None, address, chain_id=1)
+    assert NonceManager.for_address(None, address.upper().replace("0X", "0x"), chain_id=1) is first
+    assert NonceManager.for_address(None, address, chain_id=2) is not first
@@ -0,0 +1,50 @@
+import threading
+
+import pytest
+
+from tea_assam.providers import RegistryHTTPProvider, call_concurrently
+from tea_assam.rate_limit import AdaptiveRateLimiter
+
+LIMITED = {"jsonrpc": "2.0", "error": {"code": 429, "message": "rate limit exceeded"}}
+
+
+class FakeBatchProvider(RegistryHTTPProvider):
+    def __init__(self, answers):
+        super().__init__("http://localhost:8545", rate_limiter=AdaptiveRateLimiter(decrease_interval=0))
+        self.answers = answers
+        self.sent = []
+
+    def _make_batch(self, batch_requests):
+        self.sent.append([method for method, _ in batch_requests])
+        return self.answers.pop(0)
+
+
+def test_batch_retries_only_rate_limited_elements():
+    provider = FakeBatchProvider([
+        [{"result": "0xhash"}, LIMITED, {"result": "0x1"}],
+        [{"result": "0x2"}],
+    ])
+    response = provider.make_batch_request([
+        ("eth_sendRawTransaction", ["0xraw"]), ("eth_blockNumber", []), ("eth_chainId", []),
+    ])
+    assert provider.sent == [["eth_sendRawTransaction", "eth_blockNumber", "eth_chainId"], ["eth_blockNumber"]]
+    assert [item["result"] for item in response] == ["0xhash", "0x2", "0x1"]
+
+
+def test_call_concurrently_overlaps_calls_and_keeps_order():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def read(value):
+        # Hanya lolos jika ketiga panggilan berjalan bersamaan.
+        barrier.wait()
+        return value
+
+    assert call_concurrently(lambda: read("a"), lambda: read("b"), lambda: read("c")) == ["a", "b", "c"]
+
+
+def test_call_concurrently_raises_errors():
+    def fail():
+        raise ValueError("gagal")
+
+    with pytest.raises(ValueError):
+        call_concurrently(lambda: 1, fail)
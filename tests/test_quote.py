@@ -0,0 +1,79 @@
+import pytest
+from web3 import Web3
+
+from tea_assam.metadata_cache import MetadataCache, pair_key
+from tea_assam.providers import DEFAULT_CHAIN_ID
+from tea_assam.quote import DEFAULT_FACTORY_ADDRESS, QuoteEngine, apply_slippage, get_amount_out
+
+TOKEN_A = "0x" + "11" * 20
+TOKEN_B = "0x" + "22" * 20
+PAIR = "0x" + "33" * 20
+
+
+def router_amount_out(amount_in, reserve_in, reserve_out):
+    """`UniswapV2Library.getAmountOut` apa adanya (fee 997/1000)."""
+    amount_in_with_fee = amount_in * 997
+    return (amount_in_with_fee * reserve_out) // (reserve_in * 1000 + amount_in_with_fee)
+
+
+@pytest.mark.parametrize("amount_in, reserve_in, reserve_out", [
+    (10 ** 18, 10 * 10 ** 18, 20 * 10 ** 18),
+    (1, 10 ** 6, 10 ** 6),
+    (123456789, 987654321, 5555),
+    (2 ** 100, 2 ** 111, 2 ** 112 - 1),
+])
+def test_get_amount_out_matches_router(amount_in, reserve_in, reserve_out):
+    assert get_amount_out(amount_in, reserve_in, reserve_out) == router_amount_out(amount_in, reserve_in, reserve_out)
+
+
+def test_get_amount_out_known_value():
+    assert get_amount_out(10 ** 18, 10 * 10 ** 18, 20 * 10 ** 18) == 1813221787760298263
+
+
+@pytest.mark.parametrize("reserves", [(0, 10 ** 18), (10 ** 18, 0), (0, 0)])
+def test_get_amount_out_empty_pair(reserves):
+    assert get_amount_out(10 ** 18, *reserves) == 0
+
+
+def test_apply_slippage():
+    assert apply_slippage(10000, 0.005) == 9950
+    assert apply_slippage(10000, 0) == 10000
+    assert apply_slippage(1813221787760298263, 0.01) == 1813221787760298263 * 9900 // 10000
+    with pytest.raises(ValueError):
+        apply_slippage(10000, 1)
+    with pytest.raises(ValueError):
+        apply_slippage(10000, -0.1)
+
+
+class FakeMulticall:
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = 0
+
+    def call(self, calls, block_identifier=None):
+        self.calls += 1
+        return self.results.pop(0)
+
+
+def make_engine(reserve_results):
+    cache = MetadataCache()
+    cache.set(DEFAULT_CHAIN_ID, "pair", pair_key(DEFAULT_FACTORY_ADDRESS, TOKEN_A, TOKEN_B), PAIR)
+    multicall = FakeMulticall(reserve_results)
+    return QuoteEngine(Web3(), multicall=multicall, metadata_cache=cache), multicall
+
+
+@pytest.mark.parametrize("value", [None, (0, 10 ** 18, 0), (10 ** 18, 0, 0)])
+def test_failed_or_empty_reserves_raise_and_are_not_cached(value):
+    engine, multicall = make_engine([[value], [(10 ** 18, 2 * 10 ** 18, 0)]])
+    with pytest.raises(ValueError):
+        engine.amount_out_min(10 ** 15, [TOKEN_A, TOKEN_B])
+    # Kegagalan tidak di-cache: quote berikutnya membaca ulang reserve.
+    expected = apply_slippage(get_amount_out(10 ** 15, 10 ** 18, 2 * 10 ** 18), 0.005)
+    assert engine.amount_out_min(10 ** 15, [TOKEN_A, TOKEN_B]) == expected
+    assert multicall.calls == 2
+
+
+def test_zero_quote_raises():
+    engine, _ = make_engine([[(10 ** 18, 10 ** 18, 0)]])
+    with pytest.raises(ValueError):
+        engine.amount_out_min(0, [TOKEN_A, TOKEN_B])
@@ -0,0 +1,20 @@
+from eth_account import Account
+
+from fake_node import CHAIN_ID, fake_web3
+from tea_assam.receipts import ReceiptTracker
+
+
+def _send_transfer(web3, account, nonce):
+    tx = {"to": account.address, "value": 0, "gas": 21000, "gasPrice": 1, "nonce": nonce, "chainId": CHAIN_ID}
+    return web3.eth.send_raw_transaction(account.sign_transaction(tx).raw_transaction)
+
+
+def test_tracker_follows_low_height_chain():
+    web3 = fake_web3(start_block=0)
+    account = Account.create()
+    tracker = ReceiptTracker(web3, poll_interval=0.01, timeout=5, lookback=5, history=64)
+
+    # Tick pertama terjadi saat head (1) lebih kecil dari lookback (5).
+    receipt = tracker.wait(_send_transfer(web3, account, 0))
+    assert receipt["blockNumber"] == 1
+    assert tracker.wait(_send_transfer(web3, account, 1))["blockNumber"] == 2
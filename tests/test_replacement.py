@@ -0,0 +1,47 @@
+import pytest
+
+from tea_assam.replacement import MIN_BUMP_PERCENT, PendingTx, TxLifecycleManager, bump_fees, replace_stuck_enabled
+
+
+def test_bump_legacy_gas_price():
+    assert bump_fees({"gasPrice": 100}, 12) == {"gasPrice": 112}
+    # Pembulatan ke atas: kenaikan tidak pernah di bawah persentase minimal.
+    assert bump_fees({"gasPrice": 11}, 10)["gasPrice"] == 13
+
+
+def test_bump_eip1559_raises_both_fees():
+    tx = bump_fees({"maxFeePerGas": 1000, "maxPriorityFeePerGas": 7}, 10)
+    assert tx["maxFeePerGas"] >= 1100
+    assert tx["maxPriorityFeePerGas"] >= 8
+
+
+def test_bump_respects_market_floor():
+    tx = bump_fees({"maxFeePerGas": 1000, "maxPriorityFeePerGas": 100}, 12,
+                   floor={"maxFeePerGas": 5000, "maxPriorityFeePerGas": 300})
+    assert tx == {"maxFeePerGas": 5000, "maxPriorityFeePerGas": 300}
+
+
+def test_bump_below_minimum_rejected():
+    with pytest.raises(ValueError):
+        bump_fees({"gasPrice": 100}, MIN_BUMP_PERCENT - 1)
+
+
+def test_fee_multiplier_caps_escalation():
+    manager = TxLifecycleManager.__new__(TxLifecycleManager)
+    manager.max_fee_cap = None
+    manager.max_fee_multiplier = 1.5
+    pending = PendingTx({"gasPrice": 100}, "0xkey", "0xhash", None)
+    tx = {"gasPrice": 100}
+    bumps = 0
+    while not manager._over_cap(pending, bump_fees(tx)):
+        tx = bump_fees(tx)
+        bumps += 1
+    assert bumps == 3 and tx["gasPrice"] <= 150
+
+
+def test_replace_stuck_is_opt_in(monkeypatch):
+    monkeypatch.delenv("TEA_ASSAM_REPLACE_STUCK", raising=False)
+    assert replace_stuck_enabled() is False
+    monkeypatch.setenv("TEA_ASSAM_REPLACE_STUCK", "1")
+    assert replace_stuck_enabled() is True
+    assert replace_stuck_enabled(False) is False
@@ -0,0 +1,50 @@
+from eth_account import Account
+
+from fake_node import fake_web3
+from tea_assam.receipts import ReceiptTracker
+from transfer_token import transfer as transfer_module
+
+
+def _flow(monkeypatch, web3):
+    monkeypatch.setattr(transfer_module, "get_web3", lambda **kwargs: web3)
+    ReceiptTracker.for_web3(web3).poll_interval = 0.01
+    sender = Account.create()
+    return transfer_module.TransferToken(
+        sender.key.hex(), sender.address, "0x" + "11" * 20, 1, [], rpc_urls=["http://fake"]
+    )
+
+
+def _open_gap(flow, web3):
+    """Meniru pengiriman paralel: nonce 0 dan 2 terkirim, nonce 1 dilepas, nonce 2 tertahan."""
+    recipient = Account.create().address
+    nonces = [flow._nonce_manager.next() for _ in range(3)]
+    flow._send_transfer(recipient, 1, nonces[0])
+    flow._send_transfer(recipient, 1, nonces[2])
+    flow._nonce_manager.release(nonces[1])
+    assert [nonce for _, nonce, _ in web3.provider.sent] == [0]
+
+
+def test_fill_nonce_gaps_unblocks_later_transfers(monkeypatch):
+    web3 = fake_web3()
+    flow = _flow(monkeypatch, web3)
+    _open_gap(flow, web3)
+
+    flow._fill_nonce_gaps()
+
+    assert [nonce for _, nonce, _ in web3.provider.sent] == [0, 1, 2]
+    assert flow._nonce_manager.next() == 3
+
+
+def test_fill_nonce_gaps_keeps_nonce_when_filler_fails(monkeypatch):
+    web3 = fake_web3()
+    flow = _flow(monkeypatch, web3)
+    _open_gap(flow, web3)
+    web3.provider.fail_nonces.append(1)
+
+    flow._fill_nonce_gaps()
+
+    # Nonce 1 tetap dilepas: transaksi berikutnya mengisinya dan nonce 2 ikut masuk blok.
+    nonce = flow._nonce_manager.next()
+    assert nonce == 1
+    flow._send_transfer(Account.create().address, 1, nonce)
+    assert [nonce for _, nonce, _ in web3.provider.sent] == [0, 1, 2]
@@ -0,0 +1,21 @@
+"""Entry point transfer token: transfer per penerima dan batch transfer.
+
+Kelas dimuat saat pertama kali diakses agar import paket tetap ringan.
+"""
+import importlib
+
+_EXPORTS = {
+    "TeaAssamBatchTransfer": "batch_transfer",
+    "TransferToken": "transfer",
+    "iter_recipients": "batch_transfer",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module("{}.{}".format(__name__, _EXPORTS[name])), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
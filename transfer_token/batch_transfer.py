@@ -1,67 +1,105 @@
+import csv
+import hashlib
+import itertools
+import json
+import os
+import threading
+
 from web3 import Web3
 
+from tea_assam.abi import BATCH_TRANSFER_ABI, ERC20_ABI, encode_approve, encode_batch_transfer, get_contract
+from tea_assam.allowance import AllowanceManager
+from tea_assam.async_engine import run_in_thread
+from tea_assam.gas import COLD_SSTORE_GAS, GasOracle
+from tea_assam.instrumentation import StepTimings
+from tea_assam.nonce_manager import NonceManager, send_raw_transaction
+from tea_assam.providers import ProviderRegistry, call_concurrently, get_web3
+from tea_assam.receipts import ReceiptTracker
+from tea_assam.replacement import TxLifecycleManager, replace_stuck_enabled
+
+
+def iter_recipients(source):
+    """
+    Membaca alamat penerima satu per satu tanpa memuat seluruh daftar ke memori.
+
+    Args:
+        source: Path file (.txt satu alamat per baris, .csv dengan kolom `address`
+            atau kolom pertama, .jsonl berisi string atau objek dengan key `address`),
+            atau iterable berisi alamat.
+
+    Yields:
+        str: Alamat penerima dalam format checksum.
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        for address in source:
+            yield Web3.to_checksum_address(address.strip())
+        return
+
+    path = str(source)
+    with open(path, newline="") as f:
+        if path.endswith(".csv"):
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            if "address" in [column.strip().lower() for column in header]:
+                column = [c.strip().lower() for c in header].index("address")
+            else:
+                column = 0
+                if Web3.is_address(header[0].strip()):
+                    yield Web3.to_checksum_address(header[0].strip())
+            for row in reader:
+                if row and row[column].strip():
+                    yield Web3.to_checksum_address(row[column].strip())
+        elif path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    item = json.loads(line)
+                    address = item["address"] if isinstance(item, dict) else item
+                    yield Web3.to_checksum_address(address)
+        else:
+            for line in f:
+                if line.strip():
+                    yield Web3.to_checksum_address(line.strip())
+
+
 class TeaAssamBatchTransfer:
-    def __init__(self, private_key, sender_address, recipient_addresses, amount_per_address, contract_address, maxPriorityFeePerGas="1800", maxFeePerGas="2000"):
-        self.rpc_url = "https://assam-rpc.tea.xyz"
+    def __init__(self, private_key, sender_address, recipient_addresses, amount_per_address, contract_address, maxPriorityFeePerGas="1800", maxFeePerGas="2000", approve_amount=None, gas_oracle=None, rpc_urls=None, batch_rpc=False, replace_stuck=None):
         self.chain_id = 93384
+        # Beberapa URL di `rpc_urls` memakai failover dan load balancing.
+        self.rpc_urls = rpc_urls or ProviderRegistry.default().rpc_urls(self.chain_id)
+        self.rpc_url = self.rpc_urls[0]
 
-        self.web3 = Web3(Web3.HTTPProvider(self.rpc_url))
-        if not self.web3.is_connected():
-            raise Exception("Gagal terhubung ke blockchain.")
+        # `batch_rpc`: request bersamaan dari beberapa thread digabung menjadi JSON-RPC batch.
+        self.web3 = get_web3(self.chain_id, self.rpc_urls, batching=batch_rpc)
 
         self.private_key = private_key
         self.sender_address = sender_address
         self.recipient_addresses = recipient_addresses
         self.amount_per_address = self.web3.to_wei(amount_per_address, "ether")
         self.TOKEN_BATH_ADDRESS = contract_address
+        self.approve_amount = approve_amount  # Allowance lebih besar (wei) yang diberikan sekali, opsional
+        self.allowance_manager = AllowanceManager.default()
+        self.receipt_tracker = ReceiptTracker.for_web3(self.web3)
+        self._checkpoint_lock = threading.Lock()
+        # `replace_stuck`: transaksi yang tertahan dikirim ulang dengan nonce sama dan fee lebih tinggi
+        # (default mengikuti TEA_ASSAM_REPLACE_STUCK, mati).
+        self.lifecycle = TxLifecycleManager.for_web3(self.web3) if replace_stuck_enabled(replace_stuck) else None
 
         self.maxPriorityFeePerGas = self.web3.to_wei(maxPriorityFeePerGas, "gwei")
         self.maxFeePerGas = self.web3.to_wei(maxFeePerGas, "gwei")
+        # Default memakai biaya EIP-1559 tetap di atas; berikan GasOracle sendiri untuk biaya adaptif.
+        self.gas_oracle = gas_oracle or GasOracle(
+            self.web3, max_fee_per_gas=self.maxFeePerGas, max_priority_fee_per_gas=self.maxPriorityFeePerGas
+        )
 
         self.batch_transfer_contract_address = "0xAB60Db6Bc74B6A5869A874F32d57Dc1CB6234766"
 
-        self.batch_transfer_abi = [
-            {
-                "inputs": [
-                    {"internalType": "address", "name": "token", "type": "address"},
-                    {"internalType": "address[]", "name": "recipients", "type": "address[]"},
-                    {"internalType": "uint256", "name": "amount", "type": "uint256"}
-                ],
-                "name": "batchTransfer",
-                "outputs": [],
-                "stateMutability": "nonpayable",
-                "type": "function"
-            }
-        ]
-
-        self.batch_transfer_contract = self.web3.eth.contract(
-            address=self.batch_transfer_contract_address, 
-            abi=self.batch_transfer_abi
-        )
+        self.batch_transfer_abi = BATCH_TRANSFER_ABI
+        self.batch_transfer_contract = get_contract(self.web3, self.batch_transfer_contract_address, self.batch_transfer_abi)
 
-        self.erc20_abi = [
-            {
-                "constant": False,
-                "inputs": [
-                    {"name": "spender", "type": "address"},
-                    {"name": "amount", "type": "uint256"}
-                ],
-                "name": "approve",
-                "outputs": [{"name": "", "type": "bool"}],
-                "stateMutability": "nonpayable",
-                "type": "function"
-            },
-            {
-                "constant": True,
-                "inputs": [{"name": "owner", "type": "address"}],
-                "name": "balanceOf",
-                "outputs": [{"name": "", "type": "uint256"}],
-                "stateMutability": "view",
-                "type": "function"
-            }
-        ]
-
-        self.token_contract = self.web3.eth.contract(address=self.TOKEN_BATH_ADDRESS, abi=self.erc20_abi)
+        self.erc20_abi = ERC20_ABI
+        self.token_contract = get_contract(self.web3, self.TOKEN_BATH_ADDRESS, self.erc20_abi)
 
     def check_balance(self):
         """Memeriksa saldo token pengirim dan mengembalikan dalam wei dan ether."""
@@ -69,50 +107,106 @@ class TeaAssamBatchTransfer:
         sender_balance_eth = self.web3.from_wei(sender_balance_wei, "ether")
         return sender_balance_wei, sender_balance_eth
 
-    def approve_token(self):
+    def _check_balance_and_allowance(self):
+        """Seperti `check_balance`, tetapi allowance ikut dibaca bersamaan agar `approve_if_needed` memakai cache."""
+        balance, _ = call_concurrently(
+            self.check_balance,
+            lambda: self.allowance_manager.get(
+                self.web3, self.chain_id, self.TOKEN_BATH_ADDRESS, self.sender_address, self.batch_transfer_contract_address
+            ),
+        )
+        return balance
+
+    def approve_token(self, total_needed=None, nonce=None):
         """Melakukan approve token dan mengembalikan status dan hash transaksi."""
-        total_needed = self.amount_per_address * len(self.recipient_addresses)
-        nonce = self.web3.eth.get_transaction_count(self.sender_address)
-        tx = self.token_contract.functions.approve(
-            self.batch_transfer_contract_address, total_needed
-        ).build_transaction({
+        if total_needed is None:
+            total_needed = self.amount_per_address * len(self.recipient_addresses)
+        if nonce is None:
+            nonce = self.web3.eth.get_transaction_count(self.sender_address)
+        tx = self.gas_oracle.complete({
             "from": self.sender_address,
+            "to": self.token_contract.address,
+            "data": encode_approve(self.batch_transfer_contract_address, total_needed),
             "nonce": nonce,
-            "gas": 100000,
-            "maxPriorityFeePerGas": self.maxPriorityFeePerGas,
-            "maxFeePerGas": self.maxFeePerGas,
             "chainId": self.chain_id
         })
         signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        tx_hash = send_raw_transaction(self.web3, signed_tx)
+        self._watch(tx, tx_hash)
+        receipt = self.receipt_tracker.wait(tx_hash)
         status = "sukses" if receipt.status == 1 else "gagal"
-        return status, self.web3.to_hex(tx_hash)
+        return status, self.web3.to_hex(receipt["transactionHash"])
 
-    def batch_transfer(self):
-        """Melakukan batch transfer dan mengembalikan status dan hash transaksi."""
-        nonce = self.web3.eth.get_transaction_count(self.sender_address)
-        tx = self.batch_transfer_contract.functions.batchTransfer(
-            self.TOKEN_BATH_ADDRESS, self.recipient_addresses, self.amount_per_address
-        ).build_transaction({
+    def _invalidate_allowance(self):
+        """Allowance dibaca ulang dari jaringan setelah approve/transfer gagal."""
+        self.allowance_manager.invalidate(
+            self.chain_id, self.TOKEN_BATH_ADDRESS, self.sender_address, self.batch_transfer_contract_address
+        )
+
+    def approve_if_needed(self, total_needed, nonce_manager=None):
+        """Melakukan approve hanya jika allowance belum cukup dan mengembalikan dictionary langkah approve."""
+        approve_value = self.allowance_manager.required_approval(
+            self.web3, self.chain_id, self.TOKEN_BATH_ADDRESS, self.sender_address,
+            self.batch_transfer_contract_address, total_needed, self.approve_amount
+        )
+        if approve_value is None:
+            return {"step": "approve", "status": "sukses", "tx_hash": None, "skipped": True}
+
+        nonce = nonce_manager.next() if nonce_manager else None
+        try:
+            status, tx_hash = self.approve_token(approve_value, nonce)
+        except Exception:
+            if nonce_manager:
+                nonce_manager.release(nonce)
+            self._invalidate_allowance()
+            raise
+        if status == "sukses":
+            self.allowance_manager.record_approval(
+                self.chain_id, self.TOKEN_BATH_ADDRESS, self.sender_address, self.batch_transfer_contract_address, approve_value
+            )
+        else:
+            self._invalidate_allowance()
+        return {"step": "approve", "status": status, "tx_hash": tx_hash}
+
+    def _send_batch_transfer(self, recipients, nonce, gas=None, on_replace=None):
+        """
+        Mengirim satu transaksi batchTransfer tanpa menunggu receipt; tanpa `gas`, batas gas diestimasi.
+
+        `on_replace(hash_baru, raw_tx, tx)` dipanggil jika transaksi diganti karena tertahan.
+        """
+        tx = self.gas_oracle.complete({
             "from": self.sender_address,
+            "to": self.batch_transfer_contract.address,
+            "data": encode_batch_transfer(self.TOKEN_BATH_ADDRESS, recipients, self.amount_per_address),
             "nonce": nonce,
-            "gas": 500000,
-            "maxPriorityFeePerGas": self.maxPriorityFeePerGas,
-            "maxFeePerGas": self.maxFeePerGas,
-            "chainId": self.chain_id
-        })
+            "chainId": self.chain_id,
+            **({"gas": gas} if gas is not None else {})
+        }, use_cache=False)  # tiap penerima bisa menulis slot saldo baru; estimasi per transaksi
         signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        tx_hash = send_raw_transaction(self.web3, signed_tx)
+        self._watch(tx, tx_hash, on_replace)
+        return tx_hash
+
+    def _watch(self, tx, tx_hash, on_replace=None):
+        """Mendaftarkan transaksi terkirim agar diganti dengan fee lebih tinggi jika tertahan."""
+        if self.lifecycle is not None:
+            self.lifecycle.watch(tx, self.private_key, tx_hash, gas_oracle=self.gas_oracle, on_replace=on_replace)
+
+    def batch_transfer(self):
+        """Melakukan batch transfer dan mengembalikan status dan hash transaksi."""
+        nonce = self.web3.eth.get_transaction_count(self.sender_address)
+        tx_hash = self._send_batch_transfer(self.recipient_addresses, nonce)
+        receipt = self.receipt_tracker.wait(tx_hash)
         status = "sukses" if receipt.status == 1 else "gagal"
-        return status, self.web3.to_hex(tx_hash)
+        return status, self.web3.to_hex(receipt["transactionHash"])
 
     def run(self):
         """Menjalankan seluruh proses dan mengembalikan list of dictionaries."""
         result_list = []
+        timings = StepTimings()
         try:
-            sender_balance_wei, sender_balance_eth = self.check_balance()
+            with timings.step("check_balance"):
+                sender_balance_wei, sender_balance_eth = self._check_balance_and_allowance()
             total_needed_wei = self.amount_per_address * len(self.recipient_addresses)
             total_needed_eth = self.web3.from_wei(total_needed_wei, "ether")
 
@@ -132,14 +226,11 @@ class TeaAssamBatchTransfer:
                 })
                 return result_list
 
-            approve_status, approve_tx_hash = self.approve_token()
-            result_list.append({
-                "step": "approve",
-                "status": approve_status,
-                "tx_hash": approve_tx_hash
-            })
+            with timings.step("approve"):
+                approve_step = self.approve_if_needed(total_needed_wei)
+            result_list.append(approve_step)
 
-            if approve_status != "sukses":
+            if approve_step["status"] != "sukses":
                 result_list.append({
                     "step": "error",
                     "status": "gagal",
@@ -147,7 +238,14 @@ class TeaAssamBatchTransfer:
                 })
                 return result_list
 
-            batch_status, batch_tx_hash = self.batch_transfer()
+            with timings.step("batch_transfer"):
+                batch_status, batch_tx_hash = self.batch_transfer()
+            if batch_status == "sukses":
+                self.allowance_manager.consume(
+                    self.chain_id, self.TOKEN_BATH_ADDRESS, self.sender_address, self.batch_transfer_contract_address, total_needed_wei
+                )
+            else:
+                self._invalidate_allowance()
             result_list.append({
                 "step": "batch_transfer",
                 "status": batch_status,
@@ -157,7 +255,8 @@ class TeaAssamBatchTransfer:
             result_list.append({
                 "step": "final",
                 "status": batch_status,
-                "message": "Batch Transfer Sukses!" if batch_status == "sukses" else "Batch Transfer Gagal!"
+                "message": "Batch Transfer Sukses!" if batch_status == "sukses" else "Batch Transfer Gagal!",
+                "timings": timings.as_dict()
             })
 
         except Exception as e:
@@ -169,4 +268,286 @@ class TeaAssamBatchTransfer:
 
         return result_list
 
+    def estimate_chunk_gas(self, probe_recipients, gas_budget=None, safety_margin=1.2):
+        """
+        Menentukan ukuran chunk dari `estimate_gas` dua ukuran batch, dan gas tiap chunk.
+
+        Gas per penerima bergantung pada state: penerima baru menulis slot saldo dari
+        nol, penerima lama tidak. Karena penerima probe bisa saja sudah punya saldo,
+        ukuran chunk dihitung dengan skenario terburuk (ditambah `COLD_SSTORE_GAS` per
+        penerima), dan batas gas setiap chunk diestimasi dari penerimanya sendiri.
+
+        Returns:
+            tuple: (ukuran chunk maksimal, fungsi gas untuk list penerima satu chunk).
+        """
+        def estimate(recipients):
+            return self.web3.eth.estimate_gas({
+                "from": self.sender_address,
+                "to": self.batch_transfer_contract.address,
+                "data": encode_batch_transfer(self.TOKEN_BATH_ADDRESS, recipients, self.amount_per_address)
+            })
+
+        gas_single = estimate(probe_recipients[:1])
+        if len(probe_recipients) > 1:
+            gas_probe = estimate(probe_recipients)
+            per_recipient = max(1, (gas_probe - gas_single) // (len(probe_recipients) - 1))
+        else:
+            per_recipient = gas_single
+        base_gas = max(0, gas_single - per_recipient)
+        worst_per_recipient = per_recipient + COLD_SSTORE_GAS
+
+        if gas_budget is None:
+            gas_budget = self.web3.eth.get_block("latest")["gasLimit"] // 2
+        max_chunk_size = max(1, int((gas_budget / safety_margin - base_gas) // worst_per_recipient))
+
+        def gas_for(recipients):
+            return int(estimate(recipients) * safety_margin)
+
+        return max_chunk_size, gas_for
+
+    def _checkpoint_identity(self, source, total):
+        """
+        Data pengenal run yang disimpan di checkpoint.
+
+        Daftar penerima dikenali dari hash isinya (bukan path), sehingga file yang
+        isinya berubah tidak dilanjutkan berdasarkan indeks. Iterable sekali pakai
+        tidak bisa di-hash tanpa menghabiskannya; untuknya hanya `total` yang dicek.
+        """
+        recipients_sha256 = None
+        if isinstance(source, (str, os.PathLike, list, tuple)):
+            digest = hashlib.sha256()
+            for address in iter_recipients(source):
+                digest.update(address.lower().encode() + b"\n")
+            recipients_sha256 = digest.hexdigest()
+        return {
+            "chain_id": self.chain_id,
+            "sender": self.sender_address.lower(),
+            "token": self.TOKEN_BATH_ADDRESS.lower(),
+            "batch_transfer_contract": self.batch_transfer_contract_address.lower(),
+            "amount_per_address": self.amount_per_address,
+            "total": total,
+            "recipients_sha256": recipients_sha256,
+        }
+
+    def _load_checkpoint(self, checkpoint_path):
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                return json.load(f)
+        return {"approve_tx_hash": None, "chunks": []}
+
+    def _save_checkpoint(self, checkpoint_path, checkpoint):
+        if not checkpoint_path:
+            return
+        # Dipanggil juga dari thread TxLifecycleManager saat chunk diganti.
+        with self._checkpoint_lock:
+            tmp_path = "{}.tmp".format(checkpoint_path)
+            with open(tmp_path, "w") as f:
+                json.dump(checkpoint, f)
+            os.replace(tmp_path, checkpoint_path)
+
+    def _chunk_replacer(self, chunk, checkpoint, checkpoint_path):
+        """Callback `on_replace` yang mencatat hash pengganti chunk ke checkpoint."""
+        def on_replace(new_hash, raw_tx, tx):
+            with self._checkpoint_lock:
+                if "tx_hash" in chunk:
+                    chunk.setdefault("replaced", []).append(chunk["tx_hash"])
+                chunk["tx_hash"] = new_hash
+            self._save_checkpoint(checkpoint_path, checkpoint)
+        return on_replace
+
+    def _chunk_mined(self, chunk, receipt):
+        """Menandai status chunk dari receipt; hash yang masuk blok menjadi `tx_hash`."""
+        mined_hash = self.web3.to_hex(receipt["transactionHash"])
+        hashes = chunk.get("replaced", []) + [chunk["tx_hash"]]
+        chunk["replaced"] = [h for h in hashes if h.lower() != mined_hash.lower()]
+        chunk["tx_hash"] = mined_hash
+        chunk["status"] = "sukses" if receipt.status == 1 else "gagal"
+
+    def run_stream(self, source, checkpoint_path=None, total=None, max_chunk_size=500, probe_size=20, gas_budget=None):
+        """
+        Menjalankan batch transfer untuk daftar penerima yang dibaca secara streaming.
+
+        Daftar dipecah menjadi beberapa chunk yang ukurannya dihitung dari
+        `estimate_gas`, approve dilakukan sekali untuk total, lalu chunk dikirim
+        beruntun dengan nonce lokal dan receipt dikumpulkan di akhir. Progress
+        disimpan ke `checkpoint_path` sehingga proses bisa dilanjutkan; chunk yang
+        gagal (revert) dikirim ulang lebih dulu saat dilanjutkan.
+
+        Args:
+            source: Path file atau iterable alamat (lihat `iter_recipients`).
+            checkpoint_path (str): File JSON untuk menyimpan progress (opsional).
+                Checkpoint dari run lain (penerima, token, jumlah, pengirim, atau
+                chain berbeda) ditolak, tidak dilanjutkan berdasarkan indeks.
+            total (int): Jumlah penerima; jika kosong dan `source` bukan path,
+                iterable akan dimuat ke memori untuk dihitung.
+            max_chunk_size (int): Batas atas jumlah penerima per transaksi.
+            probe_size (int): Jumlah penerima untuk mengukur gas per penerima.
+            gas_budget (int): Batas gas per transaksi; default setengah gas limit blok.
+
+        Returns:
+            list: List dictionary hasil setiap langkah, seperti pada `run`.
+        """
+        result_list = []
+        try:
+            if total is None:
+                if not isinstance(source, (str, os.PathLike)):
+                    source = list(source)
+                total = sum(1 for _ in iter_recipients(source))
+
+            checkpoint = self._load_checkpoint(checkpoint_path)
+            identity = self._checkpoint_identity(source, total)
+            mismatched = [
+                key for key, value in (checkpoint.get("identity") or {}).items()
+                if value is not None and identity.get(key) is not None and value != identity[key]
+            ]
+            if mismatched:
+                result_list.append({
+                    "step": "error",
+                    "status": "gagal",
+                    "error": "Checkpoint {} milik run lain (berbeda: {}); hapus atau pakai file checkpoint lain.".format(
+                        checkpoint_path, ", ".join(mismatched)
+                    )
+                })
+                return result_list
+            checkpoint["identity"] = identity
+            nonce_manager = NonceManager.for_address(self.web3, self.sender_address, self.chain_id)
+
+            unconfirmed = [chunk for chunk in checkpoint["chunks"] if chunk["status"] == "terkirim"]
+            for chunk in unconfirmed:
+                # Receipt hash asli maupun pengganti mana pun menyelesaikan chunk.
+                for replaced_hash in chunk.get("replaced", []):
+                    self.receipt_tracker.add_replacement(chunk["tx_hash"], replaced_hash, check_existing=True)
+            receipts = self.receipt_tracker.wait_all([chunk["tx_hash"] for chunk in unconfirmed], check_existing=True)
+            for chunk, receipt in zip(unconfirmed, receipts):
+                if isinstance(receipt, Exception):
+                    raise receipt
+                self._chunk_mined(chunk, receipt)
+            self._save_checkpoint(checkpoint_path, checkpoint)
+            done = max([chunk["end"] for chunk in checkpoint["chunks"]], default=0)
+            # Rentang chunk yang revert diantrekan ulang; hanya chunk sukses yang dianggap selesai.
+            retry = [chunk for chunk in checkpoint["chunks"] if chunk["status"] == "gagal"]
+            if retry and not isinstance(source, (str, os.PathLike, list, tuple)):
+                source = list(source)
+            succeeded = sum(chunk["end"] - chunk["start"] for chunk in checkpoint["chunks"] if chunk["status"] == "sukses")
+
+            sender_balance_wei, sender_balance_eth = self._check_balance_and_allowance()
+            total_needed_wei = self.amount_per_address * (total - succeeded)
+            total_needed_eth = self.web3.from_wei(total_needed_wei, "ether")
+            result_list.append({
+                "step": "check_balance",
+                "balance_wei": sender_balance_wei,
+                "balance_eth": sender_balance_eth,
+                "total_needed_wei": total_needed_wei,
+                "total_needed_eth": total_needed_eth,
+                "resumed_from": done,
+                "retried_chunks": len(retry)
+            })
+
+            if sender_balance_wei < total_needed_wei:
+                result_list.append({
+                    "step": "error",
+                    "status": "gagal",
+                    "error": f"Saldo tidak cukup! Anda butuh {total_needed_eth} BATH."
+                })
+                return result_list
+
+            if (checkpoint["approve_tx_hash"] is None or retry) and succeeded < total:
+                approve_step = self.approve_if_needed(total_needed_wei, nonce_manager)
+                result_list.append(approve_step)
+                if approve_step["status"] != "sukses":
+                    result_list.append({
+                        "step": "error",
+                        "status": "gagal",
+                        "error": "Approve gagal."
+                    })
+                    return result_list
+                checkpoint["approve_tx_hash"] = approve_step["tx_hash"] or "dilewati"
+                self._save_checkpoint(checkpoint_path, checkpoint)
+
+            retry_batches = [
+                (chunk, list(itertools.islice(iter_recipients(source), chunk["start"], chunk["end"])))
+                for chunk in retry
+            ]
+            recipients = itertools.islice(iter_recipients(source), done, None)
+            probe = list(itertools.islice(recipients, min(probe_size, max_chunk_size)))
+            if probe or retry_batches:
+                chunk_size, gas_for = self.estimate_chunk_gas(
+                    probe or retry_batches[0][1][:min(probe_size, max_chunk_size)], gas_budget
+                )
+                chunk_size = min(chunk_size, max_chunk_size)
+                recipients = itertools.chain(probe, recipients)
+
+            pending = []
+            for failed_chunk, chunk_recipients in retry_batches:
+                chunk = {"start": failed_chunk["start"], "end": failed_chunk["end"], "status": "terkirim", "replaced": []}
+                on_replace = self._chunk_replacer(chunk, checkpoint, checkpoint_path)
+                _, tx_hash = nonce_manager.send(
+                    lambda nonce: self._send_batch_transfer(
+                        chunk_recipients, nonce, gas_for(chunk_recipients), on_replace
+                    )
+                )
+                failed_chunk["status"] = "diulang"
+                chunk["tx_hash"] = self.web3.to_hex(tx_hash)
+                checkpoint["chunks"].append(chunk)
+                self._save_checkpoint(checkpoint_path, checkpoint)
+                pending.append(chunk)
+
+            start = done
+            while True:
+                chunk_recipients = list(itertools.islice(recipients, chunk_size)) if probe else []
+                if not chunk_recipients:
+                    break
+                end = start + len(chunk_recipients)
+                chunk = {"start": start, "end": end, "status": "terkirim", "replaced": []}
+                on_replace = self._chunk_replacer(chunk, checkpoint, checkpoint_path)
+                _, tx_hash = nonce_manager.send(
+                    lambda nonce: self._send_batch_transfer(
+                        chunk_recipients, nonce, gas_for(chunk_recipients), on_replace
+                    )
+                )
+                chunk["tx_hash"] = self.web3.to_hex(tx_hash)
+                checkpoint["chunks"].append(chunk)
+                self._save_checkpoint(checkpoint_path, checkpoint)
+                pending.append(chunk)
+                start = end
+
+            futures = [self.receipt_tracker.track(chunk["tx_hash"]) for chunk in pending]
+            for chunk, future in zip(pending, futures):
+                receipt = future.result()
+                self._chunk_mined(chunk, receipt)
+                self._save_checkpoint(checkpoint_path, checkpoint)
+                if chunk["status"] == "sukses":
+                    self.allowance_manager.consume(
+                        self.chain_id, self.TOKEN_BATH_ADDRESS, self.sender_address, self.batch_transfer_contract_address,
+                        self.amount_per_address * (chunk["end"] - chunk["start"])
+                    )
+                else:
+                    self._invalidate_allowance()
+                result_list.append({
+                    "step": "batch_transfer",
+                    "status": chunk["status"],
+                    "tx_hash": chunk["tx_hash"],
+                    "recipients": chunk["end"] - chunk["start"],
+                    "start": chunk["start"]
+                })
+
+            failed = [chunk for chunk in checkpoint["chunks"] if chunk["status"] not in ("sukses", "diulang")]
+            batch_status = "gagal" if failed else "sukses"
+            result_list.append({
+                "step": "final",
+                "status": batch_status,
+                "message": "Batch Transfer Sukses!" if batch_status == "sukses" else "Batch Transfer Gagal!"
+            })
+
+        except Exception as e:
+            result_list.append({
+                "step": "exception",
+                "status": "error",
+                "error": str(e)
+            })
+
+        return result_list
 
+    async def run_async(self):
+        """Versi async dari `run`; flow sinkron yang sama dijalankan di thread pool."""
+        return await run_in_thread(self.run)
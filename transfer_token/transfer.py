@@ -1,7 +1,18 @@
-from web3 import Web3
+from concurrent.futures import ThreadPoolExecutor
+
+from web3.exceptions import TimeExhausted
+
+from tea_assam.abi import ERC20_ABI, encode_transfer, get_contract
+from tea_assam.async_engine import run_in_thread
+from tea_assam.gas import GasOracle
+from tea_assam.nonce_manager import NonceManager, send_raw_transaction
+from tea_assam.presign import PresignPipeline
+from tea_assam.providers import ProviderRegistry, get_web3
+from tea_assam.receipts import ReceiptTracker
+from tea_assam.replacement import TxLifecycleManager, replace_stuck_enabled
 
 class TransferToken:
-    def __init__(self, private_key: str, sender_address: str, contract_address: str, gas_price: int, recipient_addresses: list):
+    def __init__(self, private_key: str, sender_address: str, contract_address: str, gas_price: int, recipient_addresses: list, gas_oracle: GasOracle = None, rpc_urls: list = None, batch_rpc: bool = False, replace_stuck: bool = None):
         """
         Inisialisasi kelas TransferToken.
         
@@ -11,12 +22,21 @@ class TransferToken:
             contract_address (str): Alamat kontrak token.
             gas_price (int): Harga gas dalam Gwei.
             recipient_addresses (list): Daftar alamat penerima.
+            gas_oracle (GasOracle): Strategi gas; default harga legacy tetap `gas_price`
+                dengan batas gas hasil estimasi.
+            rpc_urls (list): Daftar URL RPC (opsional); lebih dari satu URL memakai
+                failover dan load balancing. Default URL dari ProviderRegistry.
+            batch_rpc (bool): Jika True, request bersamaan digabung menjadi JSON-RPC
+                batch dan mode `pipeline` mengirim transaksi secara paralel agar
+                `eth_sendRawTransaction` ikut tergabung dalam batch.
+            replace_stuck (bool): Jika True, transaksi yang tertahan beberapa blok dikirim
+                ulang dengan nonce sama dan fee lebih tinggi (TxLifecycleManager).
+                Default mengikuti TEA_ASSAM_REPLACE_STUCK (mati).
         """
-        self._rpc_url = "https://assam-rpc.tea.xyz"  # RPC Tea Assam Testnet
-        self._web3 = Web3(Web3.HTTPProvider(self._rpc_url))
-        
-        if not self._web3.is_connected():
-            raise Exception("Gagal terhubung ke jaringan")
+        self._rpc_urls = rpc_urls or ProviderRegistry.default().rpc_urls()  # RPC Tea Assam Testnet
+        self._rpc_url = self._rpc_urls[0]
+        self._batch_rpc = batch_rpc
+        self._web3 = get_web3(rpc_url=self._rpc_urls, batching=batch_rpc)
         
         self._private_key = private_key
         self._sender_address = sender_address
@@ -24,36 +44,123 @@ class TransferToken:
         self._gas_price = gas_price
         self._recipient_addresses = recipient_addresses
         
-        self._contract_abi = [
-            {
-                "constant": False,
-                "inputs": [
-                    {"name": "_to", "type": "address"},
-                    {"name": "_value", "type": "uint256"}
-                ],
-                "name": "transfer",
-                "outputs": [{"name": "", "type": "bool"}],
-                "type": "function"
-            }
-        ]
-        
-        self._contract = self._web3.eth.contract(address=self._contract_address, abi=self._contract_abi)
+        self._contract = get_contract(self._web3, self._contract_address, ERC20_ABI)
         
         from_account = self._web3.eth.account.from_key(self._private_key)
         if from_account.address.lower() != self._sender_address.lower():
             raise ValueError("Private key tidak sesuai dengan alamat pengirim")
+        
+        self._nonce_manager = NonceManager.for_address(self._web3, self._sender_address)
+        self._receipt_tracker = ReceiptTracker.for_web3(self._web3)
+        self._lifecycle = TxLifecycleManager.for_web3(self._web3) if replace_stuck_enabled(replace_stuck) else None
+        self._gas_oracle = gas_oracle or GasOracle(self._web3, gas_price=self._web3.to_wei(str(self._gas_price), "gwei"))
+
+    def _build_transfer_tx(self, recipient_address: str, amount_wei: int, nonce: int) -> dict:
+        """Membangun transaksi transfer dari calldata yang di-encode langsung (tanpa `build_transaction`)."""
+        return self._gas_oracle.complete({
+            "from": self._sender_address,
+            "to": self._contract.address,
+            "data": encode_transfer(recipient_address, amount_wei),
+            "chainId": 93384,  # Chain ID Tea Assam Testnet
+            "nonce": nonce,    # Nonce untuk urutan transaksi
+        })
 
-    def transfer(self, amount: float) -> list:
+    def _send_transfer(self, recipient_address: str, amount_wei: int, nonce: int):
+        """Membangun, menandatangani, dan mengirim satu transaksi transfer."""
+        tx = self._build_transfer_tx(recipient_address, amount_wei, nonce)
+        
+        signed_tx = self._web3.eth.account.sign_transaction(tx, self._private_key)
+        
+        tx_hash = send_raw_transaction(self._web3, signed_tx)
+        self._watch(tx, tx_hash)
+        return tx_hash
+
+    def _fill_nonce_gaps(self):
+        """
+        Mengisi nonce yang gagal terkirim di antara transaksi yang sudah tersiar.
+
+        Tanpa ini, semua transaksi dengan nonce lebih tinggi tertahan di mempool.
+        Celah diisi transaksi 0 TEA ke alamat sendiri, lalu nonce lokal disamakan ulang.
+        Nonce yang pengisinya gagal terkirim dilepas kembali ke NonceManager agar
+        celahnya diisi transaksi berikutnya dari alamat ini.
+        """
+        gaps = self._nonce_manager.take_gaps()
+        for nonce in gaps:
+            tx = {
+                "from": self._sender_address,
+                "to": self._sender_address,
+                "value": 0,
+                "gas": 21000,
+                "chainId": 93384,
+                "nonce": nonce,
+                **self._gas_oracle.fee_params(),
+            }
+            signed_tx = self._web3.eth.account.sign_transaction(tx, self._private_key)
+            try:
+                tx_hash = send_raw_transaction(self._web3, signed_tx)
+            except Exception:
+                # Transaksi di atas celah akan dilaporkan "tertunda" sampai nonce ini terpakai.
+                self._nonce_manager.release(nonce)
+                continue
+            self._watch(tx, tx_hash)
+        if gaps:
+            self._nonce_manager.resync()
+
+    def _wait_error_result(self, recipient_address: str, tx_hash, error: Exception) -> dict:
+        """Hasil untuk transaksi yang sudah tersiar tetapi receipt-nya belum ada."""
+        return {
+            "recipient_address": recipient_address,
+            "status": "tertunda" if isinstance(error, TimeExhausted) else "gagal",
+            "tx_hash": self._web3.to_hex(tx_hash),
+            "error": str(error)
+        }
+
+    def _watch(self, tx: dict, tx_hash):
+        """Mendaftarkan transaksi terkirim agar diganti dengan fee lebih tinggi jika tertahan."""
+        if self._lifecycle is not None:
+            self._lifecycle.watch(tx, self._private_key, tx_hash, gas_oracle=self._gas_oracle)
+
+    def _receipt_result(self, recipient_address: str, tx_hash, tx_receipt=None) -> dict:
+        if tx_receipt is None:
+            tx_receipt = self._receipt_tracker.wait(tx_hash)
+        
+        return {
+            "recipient_address": recipient_address,
+            "status": "sukses",
+            # Hash dari receipt: transaksi pengganti jika yang asli diganti karena tertahan.
+            "tx_hash": self._web3.to_hex(tx_receipt['transactionHash']),
+            "block_number": tx_receipt['blockNumber'],
+            "gas_used": tx_receipt['gasUsed']
+        }
+
+    def transfer(self, amount: float, pipeline: bool = False, presign: bool = False, workers: int = None) -> list:
         """
         Melakukan transfer token ke daftar penerima.
         
         Args:
             amount (float): Jumlah token yang akan ditransfer (dalam ether).
+            pipeline (bool): Jika True, semua transaksi dikirim lebih dulu dengan nonce
+                lokal berurutan, lalu receipt dikumpulkan di akhir lewat satu
+                ReceiptTracker bersama.
+            presign (bool): Jika True, semua transaksi dibangun lebih dulu, ditandatangani
+                paralel di process pool, lalu dikirim dalam JSON-RPC batch
+                (lihat `PresignPipeline`). Receipt dikumpulkan seperti mode `pipeline`.
+            workers (int): Jumlah proses penanda tangan untuk mode `presign`.
         
         Returns:
             list: List dictionary berisi hasil transfer untuk setiap penerima.
         """
+        if presign:
+            return self._transfer_presigned(amount, workers)
+        
         results = []
+        pending = []
+        sends = []
+        executor = None
+        if pipeline and self._batch_rpc:
+            executor = ThreadPoolExecutor(
+                max_workers=getattr(self._web3.provider, "max_batch_size", 1), thread_name_prefix="transfer"
+            )
         
         for recipient_address in self._recipient_addresses:
             try:
@@ -61,36 +168,115 @@ class TransferToken:
                     raise ValueError("Alamat penerima tidak valid")
                 
                 amount_wei = self._web3.to_wei(amount, "ether")
+                send_fn = lambda nonce, recipient_address=recipient_address: self._send_transfer(recipient_address, amount_wei, nonce)
                 
-                nonce = self._web3.eth.get_transaction_count(self._sender_address)
+                if executor is not None:
+                    results.append(None)
+                    sends.append((len(results) - 1, recipient_address, executor.submit(self._nonce_manager.send, send_fn)))
+                    continue
                 
-                tx = self._contract.functions.transfer(recipient_address, amount_wei).build_transaction({
-                    "chainId": 93384,  # Chain ID Tea Assam Testnet
-                    "gas": 2000000,    # Batas gas
-                    "gasPrice": self._web3.to_wei(str(self._gas_price), "gwei"),  # Harga gas dalam wei
-                    "nonce": nonce,    # Nonce untuk urutan transaksi
-                })
-                
-                signed_tx = self._web3.eth.account.sign_transaction(tx, self._private_key)
-                
-                tx_hash = self._web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-                
-                tx_receipt = self._web3.eth.wait_for_transaction_receipt(tx_hash)
+                _, tx_hash = self._nonce_manager.send(send_fn)
                 
+                if pipeline:
+                    results.append(None)
+                    pending.append((len(results) - 1, recipient_address, tx_hash))
+                else:
+                    results.append(self._receipt_result(recipient_address, tx_hash))
+            except Exception as e:
                 results.append({
                     "recipient_address": recipient_address,
-                    "status": "sukses",
-                    "tx_hash": self._web3.to_hex(tx_hash),
-                    "block_number": tx_receipt['blockNumber'],
-                    "gas_used": tx_receipt['gasUsed']
+                    "status": "gagal",
+                    "error": str(e)
                 })
+        
+        if executor is not None:
+            executor.shutdown()
+        self._fill_nonce_gaps()
+        for index, recipient_address, future in sends:
+            if future.exception() is not None:
+                results[index] = {
+                    "recipient_address": recipient_address,
+                    "status": "gagal",
+                    "error": str(future.exception())
+                }
+            else:
+                pending.append((index, recipient_address, future.result()[1]))
+        
+        receipts = self._receipt_tracker.wait_all([tx_hash for _, _, tx_hash in pending])
+        for (index, recipient_address, tx_hash), tx_receipt in zip(pending, receipts):
+            if isinstance(tx_receipt, Exception):
+                results[index] = self._wait_error_result(recipient_address, tx_hash, tx_receipt)
+            else:
+                results[index] = self._receipt_result(recipient_address, tx_hash, tx_receipt)
+        
+        return results
+
+    def _transfer_presigned(self, amount: float, workers: int = None) -> list:
+        results = []
+        pending = []
+        txs = []
+        
+        amount_wei = self._web3.to_wei(amount, "ether")
+        for recipient_address in self._recipient_addresses:
+            nonce = None
+            try:
+                if not self._web3.is_address(recipient_address):
+                    raise ValueError("Alamat penerima tidak valid")
+                
+                nonce = self._nonce_manager.next()
+                txs.append(self._build_transfer_tx(recipient_address, amount_wei, nonce))
+                results.append(None)
+                pending.append((len(results) - 1, recipient_address, nonce))
             except Exception as e:
+                if nonce is not None:
+                    self._nonce_manager.release(nonce)
                 results.append({
                     "recipient_address": recipient_address,
                     "status": "gagal",
                     "error": str(e)
                 })
         
+        presigner = PresignPipeline(self._web3, self._private_key, workers=workers)
+        try:
+            sent = presigner.run(txs)
+        finally:
+            presigner.close()
+        
+        tracked = []
+        for (index, recipient_address, nonce), tx, outcome in zip(pending, txs, sent):
+            if outcome["error"] is None:
+                self._watch(tx, outcome["tx_hash"])
+                tracked.append((index, recipient_address, outcome["tx_hash"]))
+                continue
+            if self._nonce_manager.is_nonce_too_low(outcome["error"]):
+                self._nonce_manager.resync()
+            else:
+                self._nonce_manager.release(nonce)
+            results[index] = {
+                "recipient_address": recipient_address,
+                "status": "gagal",
+                "error": str(outcome["error"])
+            }
+        # Nonce yang gagal di tengah urutan: isi celahnya agar nonce di atasnya bisa masuk blok.
+        self._fill_nonce_gaps()
+        
+        receipts = self._receipt_tracker.wait_all([tx_hash for _, _, tx_hash in tracked])
+        for (index, recipient_address, tx_hash), tx_receipt in zip(tracked, receipts):
+            if isinstance(tx_receipt, Exception):
+                results[index] = self._wait_error_result(recipient_address, tx_hash, tx_receipt)
+            else:
+                results[index] = self._receipt_result(recipient_address, tx_hash, tx_receipt)
+        
         return results
 
-
+    async def transfer_async(self, amount: float, pipeline: bool = False, presign: bool = False, workers: int = None) -> list:
+        """
+        Versi async dari `transfer`.
+        
+        Flow sinkron yang sama dijalankan di thread pool sehingga nonce, gas, receipt,
+        rate limit, dan penggantian transaksi identik dengan `transfer`.
+        
+        Returns:
+            list: List dictionary berisi hasil transfer untuk setiap penerima.
+        """
+        return await run_in_thread(self.transfer, amount, pipeline=pipeline, presign=presign, workers=workers)